@@ -11,6 +11,10 @@ from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools import Tool
 from app.core.config import settings
+from app.services.parse_cache import parse_cache
+
+# Bump when the JD parsing prompt changes so cached LLM parses are dropped
+JD_PROMPT_VERSION = "1"
 
 
 class CareerAgent:
@@ -97,7 +101,11 @@ class CareerAgent:
         return response.content
     
     def _parse_job_description(self, jd_text: str) -> str:
-        """Parse job description using LLM."""
+        """Parse job description using LLM, at most once per distinct text and model."""
+        version = f"{settings.LLM_MODEL}:{JD_PROMPT_VERSION}"
+        return parse_cache.get_or_parse("llm_jd", version, jd_text, self._llm_parse_job_description)
+    
+    def _llm_parse_job_description(self, jd_text: str) -> str:
         prompt = f"""Parse this job description and extract:
         1. Required skills
         2. Preferred skills
@@ -4,20 +4,24 @@ Implements all tool-calling functions defined in the system prompt.
 """
 from langchain.tools import tool
 from typing import List, Dict, Optional, Any
+import asyncio
 import hashlib
 from datetime import datetime
 from sqlalchemy import func
 
 # Import services
-from app.services.scraper import scraper_service
-from app.services.adzuna import adzuna_service
 from app.services.scam_detector import scam_detector_service
 from app.services.parser import parser_service
-from app.services.matcher import matcher_service
+from app.services.matcher import base_resume_text, matcher_service
+from app.services.embeddings import embedding_service
 from app.services.project_finder import project_finder_service
 from app.services.resume_enhancer import resume_enhancer_service
 from app.services.cover_letter_generator import cover_letter_service
 from app.services.auto_apply import auto_apply_service
+from app.services.scrape_cursor import parse_posted_date
+from app.services.ingestion import job_ingestion_service
+from app.services.dedup import dedup_engine
+from app.sources import source_registry
 
 # Import DB
 from app.database import SessionLocal
@@ -28,65 +32,49 @@ from app.models import Job, Project, Application, ActivityLog
 async def scrape_jobs(role: str, region: str, platforms: List[str], since_timestamp: Optional[str] = None) -> Dict:
     """
     Scrapes job listings from specified platforms (e.g., LinkedIn, Indeed, Adzuna) for a given role and region.
+    Only postings newer than since_timestamp (or, if omitted, than the last scrape of the same query) are returned.
     Returns a summary of jobs found and saved.
     """
-    all_jobs = []
-    
-    # 1. Try Adzuna API first (Fast & Reliable)
-    print(f"Searching Adzuna for {role} in {region}...")
-    adzuna_jobs = await adzuna_service.search_jobs(role, region)
-    if adzuna_jobs:
-        print(f"Found {len(adzuna_jobs)} jobs on Adzuna")
-        all_jobs.extend(adzuna_jobs)
-    
-    # 2. Fallback/Supplement with Playwright Scraper if requested or if Adzuna yielded few results
-    if "indeed" in platforms or "linkedin" in platforms:
-        print(f"Scraping other platforms: {platforms}...")
-        scraped_jobs = await scraper_service.scrape_jobs(role, region, platforms)
-        all_jobs.extend(scraped_jobs)
+    # 1. Adzuna API first (Fast & Reliable), supplemented by the requested platforms.
+    # Each source resumes from its own high-water mark; an explicit since_timestamp overrides them.
+    sources = ["adzuna", *platforms]
+    print(f"Searching {sources} for {role} in {region}...")
+    batch = await source_registry.collect(role, region, sources, since=parse_posted_date(since_timestamp))
+    all_jobs = batch.rows()
 
     if not all_jobs:
         return {"message": "No jobs found.", "jobs_found": 0}
 
     # 3. Process and Save Jobs
+    def prepare(rows: List[Dict]) -> List[Dict]:
+        # Parse Descriptions (if available) as one batch; large scrapes use the parser's process pool
+        # For API jobs, we might have a shorter description, but still useful to parse
+        described = [row for row in rows if row.get("raw_text")]
+        for row, parsed in zip(described, parser_service.parse_many([row["raw_text"] for row in described], db=db)):
+            row["parsed_json"] = parsed
+        
+        # Score the chunk against the user's base resume in one vectorized pass
+        if resume_text:
+            for row, score in zip(rows, matcher_service.score_jobs(resume_text, rows)):
+                row["match_score"] = score
+        return rows
+    
     db: Session = SessionLocal()
     saved_count = 0
     
     try:
-        for job_data in all_jobs:
-            # Deduplicate by URL
-            existing = db.query(Job).filter(Job.url == job_data["url"]).first()
-            if existing:
-                continue
-                
-            # Parse Description (if available)
-            parsed_data = {}
-            if job_data.get("description"):
-                # For API jobs, we might have a shorter description, but still useful to parse
-                parsed_data = parser_service.parse_job_description(job_data["description"])
-            
-            # Calculate Match Score (Basic)
-            match_score = matcher_service.compute_match_score(job_data.get("description", ""), ["python", "react", "fastapi"]) # TODO: Get actual user skills
-            
-            
-            new_job = Job(
-                title=job_data["title"],
-                company=job_data["company"],
-                location=job_data["location"],
-                url=job_data["url"],
-                source=job_data["source"],
-                raw_text=job_data.get("description"),
-                parsed_data=parsed_data,
-                match_score=match_score,
-                is_scam=False # Default to False for now
-            )
-            db.add(new_job)
-            saved_count += 1
-            
-        db.commit()
+        resume_text = base_resume_text(db)
+        # Parsing and DB writes are blocking; keep them off the event loop
+        result = await asyncio.to_thread(job_ingestion_service.ingest, db, all_jobs, prepare=prepare)
+        saved_count = result.inserted
+        if saved_count:
+            # Per-resume scores and embeddings for just the new jobs
+            await asyncio.to_thread(matcher_service.sync_scores)
+            await asyncio.to_thread(embedding_service.embed_pending)
+        # Only advance the cursors once the batch is safely stored
+        batch.save_cursors()
     except Exception as e:
         print(f"Error saving jobs to DB: {e}")
-        db.rollback()
     finally:
         db.close()
 
@@ -109,24 +97,26 @@ async def scrape_jobs(role: str, region: str, platforms: List[str], since_timest
     return {
         "message": f"Successfully found and processed {saved_count} new jobs.",
         "jobs_found": saved_count,
-        "sources": list(set(j["source"] for j in all_jobs))
+        "sources": batch.sources()
     }
 
 @tool
-def deduplicate_job(job_url: str) -> bool:
+def deduplicate_job(job_url: str, company: str = "", title: str = "", content_text: str = "") -> bool:
     """
     Checks if a job has already been processed.
     
     Args:
         job_url: URL of the job
+        company: Company name (enables content matching)
+        title: Job title (enables content matching)
+        content_text: Job description (enables near-duplicate matching)
         
     Returns:
-        True if job exists in DB
+        True if the URL is stored, or the same posting is stored under another URL
     """
     db = SessionLocal()
     try:
-        exists = db.query(Job).filter(Job.url == job_url).first()
-        return bool(exists)
+        return dedup_engine.check(db, job_url, title, company, content_text) is not None
     finally:
         db.close()
 
@@ -170,7 +160,17 @@ def compute_match_score(resume: str, structured_jd: Dict, projects: List[Dict])
     Returns:
         Dict with 'score' (int), 'breakdown' (dict with component scores)
     """
-    return matcher_service.compute_score(resume, structured_jd, projects)
+    jd_skills = matcher_service.job_skills(structured_jd)
+    resume_skills = set(matcher_service.taxonomy.extract(resume))
+    project_skills = {skill for project in projects for skill in (project.get("tech_stack") or [])}
+    return {
+        "score": matcher_service.compute_match_score(resume, structured_jd),
+        "breakdown": {
+            "matched_skills": [skill for skill in jd_skills if skill in resume_skills],
+            "missing_skills": [skill for skill in jd_skills if skill not in resume_skills],
+            "covered_by_projects": [skill for skill in jd_skills if skill not in resume_skills and skill in project_skills]
+        }
+    }
 
 
 @tool
@@ -362,12 +362,15 @@ def dashboard_metrics() -> Dict:
         # Calculate average match score
         avg_score = db.query(func.avg(Job.match_score)).scalar() or 0
         
+        # Running totals kept by ingestion, not a scan
+        duplicates_avoided = sum(dedup_engine.counts(db).values())
+        
         return {
             "total_scraped": total_scraped,
             "total_matched": total_scraped, # Simplified for now
             "total_applied": total_applied,
             "scams_detected": scams_detected,
-            "duplicates_avoided": 0, # Hard to track without a separate log
+            "duplicates_avoided": duplicates_avoided,
             "avg_match_score": int(avg_score)
         }
     except Exception as e:
@@ -1,18 +1,29 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import paginate, set_next_cursor
 from app.database import get_db
 from app.models import Application, Resume, Job
 
 router = APIRouter()
 
 @router.get("/", response_model=List[dict])
-def read_applications(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_applications(
+    response: Response,
+    skip: int = Query(0, description="Deprecated offset paging; use cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve applications.
+    Retrieve applications, most recent first. Pass the X-Next-Cursor
+    response header back as cursor to get the next page.
     """
-    apps = db.query(Application).offset(skip).limit(limit).all()
+    # Ids are assigned in application order, so the primary key alone is a stable sort key
+    apps, next_key = paginate(db.query(Application), [(Application.id, True)], lambda a: [a.id], cursor, limit, offset=skip)
+    set_next_cursor(response, next_key)
     return [
         {
             "id": a.id,
@@ -24,6 +35,27 @@ def read_applications(skip: int = 0, limit: int = 100, db: Session = Depends(get
         for a in apps
     ]
 
+@router.get("/export")
+def export_applications(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    status: Optional[str] = None
+):
+    """
+    Stream every application, with its job's title, company and URL, as NDJSON or CSV.
+    """
+    columns = ["id", "job_id", "resume_id", "status", "applied_at", "title", "company", "url"]
+    
+    def build_query(db: Session):
+        query = db.query(
+            Application.id, Application.job_id, Application.resume_id, Application.status, Application.applied_at,
+            Job.title, Job.company, Job.url
+        ).outerjoin(Job, Job.id == Application.job_id)
+        if status:
+            query = query.filter(Application.status == status)
+        return query.order_by(Application.id)
+    
+    return export_response(build_query, columns, export_format, "applications")
+
 @router.post("/apply/{job_id}")
 def apply_to_job(job_id: int, db: Session = Depends(get_db)):  # Changed to int
     """
@@ -1,12 +1,14 @@
+import asyncio
 from datetime import timedelta
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 import httpx
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User
 from app.auth.jwt import create_access_token, verify_password, get_password_hash
 from app.auth.dependencies import get_current_user
@@ -41,18 +43,18 @@ class TokenData(BaseModel):
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register_user(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (bcrypt is CPU-bound; keep it off the event loop)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -60,20 +62,20 @@ def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login and get access token."""
     # Find user by email (username field in OAuth2PasswordRequestForm)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
     
     if not user:
         raise HTTPException(
@@ -83,7 +85,7 @@ def login(
         )
     
     # Verify password
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await asyncio.to_thread(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -110,14 +112,15 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 async def update_user_me(
     full_name: str = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user information."""
+    # current_user was loaded on this same request-scoped session
     if full_name:
         current_user.full_name = full_name
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
 
 
@@ -126,19 +129,19 @@ async def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password."""
     # Verify current password
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await asyncio.to_thread(verify_password, current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    current_user.hashed_password = await asyncio.to_thread(get_password_hash, new_password)
+    await db.commit()
     
     return {"message": "Password updated successfully"}
 
@@ -162,7 +165,7 @@ async def login_google():
 
 
 @router.get("/callback/google")
-async def callback_google(code: str, db: Session = Depends(get_db)):
+async def callback_google(code: str, db: AsyncSession = Depends(get_async_db)):
     """Handle Google OAuth callback."""
     # Exchange code for token
     async with httpx.AsyncClient() as client:
@@ -192,7 +195,7 @@ async def callback_google(code: str, db: Session = Depends(get_db)):
         email = user_info.get("email")
         name = user_info.get("name")
         
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             # Create new user with random password
             import secrets
@@ -200,11 +203,11 @@ async def callback_google(code: str, db: Session = Depends(get_db)):
             user = User(
                 email=email,
                 full_name=name,
-                hashed_password=get_password_hash(random_password)
+                hashed_password=await asyncio.to_thread(get_password_hash, random_password)
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -226,7 +229,7 @@ async def login_linkedin():
 
 
 @router.get("/callback/linkedin")
-async def callback_linkedin(code: str, db: Session = Depends(get_db)):
+async def callback_linkedin(code: str, db: AsyncSession = Depends(get_async_db)):
     """Handle LinkedIn OAuth callback."""
     # Exchange code for token
     async with httpx.AsyncClient() as client:
@@ -263,18 +266,18 @@ async def callback_linkedin(code: str, db: Session = Depends(get_db)):
         name = f"{user_info.get('localizedFirstName')} {user_info.get('localizedLastName')}"
         
         # Find or create user
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             import secrets
             random_password = secrets.token_urlsafe(16)
             user = User(
                 email=email,
                 full_name=name,
-                hashed_password=get_password_hash(random_password)
+                hashed_password=await asyncio.to_thread(get_password_hash, random_password)
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
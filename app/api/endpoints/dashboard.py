@@ -1,32 +1,35 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import Job, Application, Project
 
 router = APIRouter()
 
 @router.get("/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Get aggregated dashboard statistics.
     """
-    total_scraped = db.query(Job).count()
-    total_applied = db.query(Application).count()
-    scams_detected = db.query(Job).filter(Job.is_scam == True).count()
+    # All three counts in one round trip
+    stats = (await db.execute(select(
+        select(func.count(Job.id)).scalar_subquery().label("jobs_scraped"),
+        select(func.count(Application.id)).scalar_subquery().label("applications_sent"),
+        select(func.count(Job.id)).where(Job.is_scam == True).scalar_subquery().label("scams_blocked")
+    ))).one()
     
     # Mock interviews for now as we don't track them yet
     interviews = 0
     
     return {
-        "jobs_scraped": total_scraped,
-        "applications_sent": total_applied,
+        "jobs_scraped": stats.jobs_scraped,
+        "applications_sent": stats.applications_sent,
         "interviews": interviews,
-        "scams_blocked": scams_detected
+        "scams_blocked": stats.scams_blocked
     }
 
 @router.get("/match-distribution")
-def get_match_distribution(db: Session = Depends(get_db)):
+async def get_match_distribution(db: AsyncSession = Depends(get_async_db)):
     """
     Get distribution of match scores.
     """
@@ -39,18 +42,18 @@ def get_match_distribution(db: Session = Depends(get_db)):
         "81-100": 0
     }
     
-    scores = db.query(Job.match_score).filter(Job.match_score != None).all()
-    
-    for (score,) in scores:
-        if score <= 20:
-            distribution["0-20"] += 1
-        elif score <= 40:
-            distribution["21-40"] += 1
-        elif score <= 60:
-            distribution["41-60"] += 1
-        elif score <= 80:
-            distribution["61-80"] += 1
-        else:
-            distribution["81-100"] += 1
+    # Bucketed in SQL: one row per range instead of one per job
+    bucket = case(
+        (Job.match_score <= 20, "0-20"),
+        (Job.match_score <= 40, "21-40"),
+        (Job.match_score <= 60, "41-60"),
+        (Job.match_score <= 80, "61-80"),
+        else_="81-100"
+    )
+    counts = await db.execute(
+        select(bucket, func.count()).where(Job.match_score != None).group_by(bucket)
+    )
+    for label, count in counts:
+        distribution[label] = count
             
     return distribution
@@ -1,101 +1,323 @@
-from typing import List
+import asyncio
+import logging
+from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Job
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import paginate, paginate_async, set_next_cursor
+from app.database import SessionLocal, get_async_db, get_db
+from app.models import Job, MatchScore, Resume
+from app.services.job_attributes import EmploymentType, Seniority, WorkMode
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+class JobFilters:
+    """Structured filters shared by the job list and search endpoints."""
+    
+    def __init__(
+        self,
+        seniority: Optional[Seniority] = None,
+        work_mode: Optional[WorkMode] = None,
+        employment_type: Optional[EmploymentType] = None,
+        min_salary: Optional[float] = Query(None, description="Minimum of the job's upper salary bound"),
+        currency: Optional[str] = Query(None, min_length=3, max_length=3),
+        max_experience_years: Optional[int] = Query(None, description="Jobs requiring at most this many years"),
+        location: Optional[str] = Query(None, description="Substring of the job's location"),
+        source: Optional[str] = None
+    ):
+        self.seniority = seniority
+        self.work_mode = work_mode
+        self.employment_type = employment_type
+        self.min_salary = min_salary
+        self.currency = currency
+        self.max_experience_years = max_experience_years
+        self.location = location
+        self.source = source
+    
+    def apply(self, query):
+        if self.seniority:
+            query = query.filter(Job.seniority_level == self.seniority.value)
+        if self.work_mode:
+            query = query.filter(Job.work_mode == self.work_mode.value)
+        if self.employment_type:
+            query = query.filter(Job.employment_type == self.employment_type.value)
+        if self.min_salary is not None:
+            query = query.filter(Job.salary_max >= self.min_salary)
+        if self.currency:
+            query = query.filter(Job.salary_currency == self.currency.upper())
+        if self.max_experience_years is not None:
+            query = query.filter(Job.experience_min_years <= self.max_experience_years)
+        if self.location:
+            query = query.filter(Job.location.ilike(f"%{self.location}%"))
+        if self.source:
+            query = query.filter(Job.source == self.source)
+        return query
+
+
+# Columns list endpoints can return, in response order; raw_text is only
+# served by GET /jobs/{job_id}. match_score is resolved per query.
+LIST_FIELDS = (
+    "id", "title", "company", "location", "match_score", "posted_date", "source", "url", "is_scam",
+    "salary_min", "salary_max", "salary_currency", "salary_period",
+    "experience_min_years", "experience_max_years", "seniority_level", "work_mode", "employment_type",
+    "parsed_json"
+)
+
+
+# Exports may also ask for the full text
+EXPORT_FIELDS = LIST_FIELDS + ("raw_text", "status", "scraped_at")
+
+
+def _list_fields(fields: Optional[str], allowed=LIST_FIELDS) -> List[str]:
+    """Requested fields (all LIST_FIELDS by default), always including id."""
+    if not fields:
+        return list(LIST_FIELDS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in allowed if name in requested or name == "id"]
+
+
+def _projection(fields: List[str], match_score) -> list:
+    """Columns to select for the fields; plain rows, no ORM object hydration."""
+    return [
+        match_score.label("match_score") if name == "match_score" else getattr(Job, name)
+        for name in fields
+    ]
+
+
+def _row_dict(row, fields: List[str]) -> dict:
+    values = row._mapping
+    item = {name: values[name] for name in fields}
+    if item.get("posted_date"):
+        item["posted_date"] = item["posted_date"].isoformat()
+    return item
+
+
 @router.get("/", response_model=List[dict])
-def read_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def read_jobs(
+    response: Response,
+    skip: int = Query(0, description="Deprecated offset paging; use cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    filters: JobFilters = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all list fields)"),
+    resume_id: Optional[int] = Query(None, description="Rank by match score against this resume"),
+    user_id: Optional[int] = Query(None, description="Rank by match score against this user's base resume"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve jobs, newest first, optionally filtered on the extracted
+    structured attributes. With resume_id or user_id, only jobs scored for
+    that resume are returned, best match first, with match_score taken from
+    match_scores. Pass the X-Next-Cursor response header back as cursor to
+    get the next page.
+    """
+    if resume_id is None and user_id is not None:
+        resume_id = await db.scalar(
+            select(Resume.id).where(Resume.user_id == user_id, Resume.is_base == True).order_by(
+                Resume.created_at.desc()
+            ).limit(1)
+        )
+        if resume_id is None:
+            raise HTTPException(status_code=404, detail="User has no base resume")
+    
+    fields = _list_fields(fields)
+    score = MatchScore.total_score if resume_id is not None else Job.match_score
+    # Sort-key columns ride along for the cursor even when not requested
+    query = select(
+        *_projection(fields, score), Job.id.label("key_id"), score.label("key_score"), Job.scraped_at.label("key_scraped_at")
+    ).select_from(Job)
+    if resume_id is not None:
+        query = query.join(MatchScore, and_(MatchScore.job_id == Job.id, MatchScore.resume_id == resume_id))
+    query = filters.apply(query)
+    if resume_id is not None:
+        # Walks ix_match_scores_resume_score
+        order = [(MatchScore.total_score, True), (Job.id, False)]
+        key = lambda row: [row.key_score, row.key_id]
+    else:
+        # Walks ix_jobs_scraped_at_id
+        order = [(Job.scraped_at, True), (Job.id, True)]
+        key = lambda row: [row.key_scraped_at, row.key_id]
+    rows, next_key = await paginate_async(db, query, order, key, cursor, limit, offset=skip)
+    set_next_cursor(response, next_key)
+    return [_row_dict(row, fields) for row in rows]
+
+@router.get("/search", response_model=List[dict])
+def search_jobs(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Keywords matched against title, company and description"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    filters: JobFilters = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all list fields)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text job search, best match first, combinable with the structured
+    filters. Pages are keyset-paginated: pass the X-Next-Cursor response
+    header back as cursor to get the next page.
+    """
+    from app.services.search import search_index
+    
+    if not search_index.terms(q):
+        return []
+    fields = _list_fields(fields)
+    matches = search_index.matches(db, q)
+    query = db.query(
+        *_projection(fields, Job.match_score), Job.id.label("key_id"), matches.c.rank
+    ).select_from(Job).join(matches, matches.c.job_id == Job.id)
+    page, next_key = paginate(
+        filters.apply(query), [(matches.c.rank, True), (Job.id, False)], lambda row: [row.rank, row.key_id], cursor, limit
+    )
+    set_next_cursor(response, next_key)
+    return [{**_row_dict(row, fields), "rank": row.rank} for row in page]
+
+@router.get("/similar", response_model=List[dict])
+def similar_jobs(
+    resume_id: Optional[int] = Query(None, description="Defaults to the latest base resume"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve jobs.
+    Jobs semantically closest to a resume, via the embedding index.
     """
-    jobs = db.query(Job).offset(skip).limit(limit).all()
+    from app.services.embeddings import embedding_service
+    from app.services.matcher import base_resume_text
+    
+    if resume_id is not None:
+        resume = db.query(Resume.content).filter(Resume.id == resume_id).first()
+        resume_text = resume.content if resume else None
+    else:
+        resume_text = base_resume_text(db)
+    if resume_text is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    ranked = embedding_service.similar_jobs(db, resume_text, limit)
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]))}
     return [
         {
-            "id": job.id,  # Return as integer
-            "title": job.title,
-            "company": job.company,
-            "location": job.location,
-            "match_score": job.match_score,
-            "posted_date": job.posted_date.isoformat() if job.posted_date else None,
-            "source": job.source,
-            "url": job.url,
-            "is_scam": job.is_scam,
-            "parsed_json": job.parsed_json  # Fixed: use correct attribute name
+            "id": job_id,
+            "title": jobs[job_id].title,
+            "company": jobs[job_id].company,
+            "location": jobs[job_id].location,
+            "url": jobs[job_id].url,
+            "match_score": jobs[job_id].match_score,
+            "similarity": round(similarity, 4)
         }
-        for job in jobs
+        for job_id, similarity in ranked if job_id in jobs
     ]
 
 @router.post("/scrape")
-async def trigger_scrape(region: str, role: str, db: Session = Depends(get_db)):
+async def trigger_scrape(
+    region: str,
+    role: str,
+    sources: List[str] = Query(["adzuna"])
+):
     """
-    Trigger a job scraping task using the unified agent tool (Adzuna + Scraper).
+    Trigger a job scraping task through the job source registry (Adzuna by default).
     """
     # Import services directly
-    from app.services.adzuna import adzuna_service
-    from app.services.scraper import scraper_service
     from app.services.parser import parser_service
-    from app.services.matcher import matcher_service
-    from app.models import Job
-    
-    all_jobs = []
+    from app.services.matcher import base_resume_text, matcher_service
+    from app.services.embeddings import embedding_service
+    from app.services.ingestion import job_ingestion_service
+    from app.sources import source_registry
     
-    # Try Adzuna API first
-    print(f"Searching Adzuna for {role} in {region}...")
-    adzuna_jobs = await adzuna_service.search_jobs(role, region)
-    if adzuna_jobs:
-        print(f"Found {len(adzuna_jobs)} jobs on Adzuna")
-        all_jobs.extend(adzuna_jobs)
+    logger.info("Searching %s for %s in %s", sources, role, region)
+    batch = await source_registry.collect(role, region, sources)
+    all_jobs = batch.rows()
     
     if not all_jobs:
         return {"message": "No jobs found.", "jobs_found": 0}
     
-    # Process and Save Jobs
-    saved_count = 0
-    
-    try:
-        for job_data in all_jobs:
-            # Deduplicate by URL
-            existing = db.query(Job).filter(Job.url == job_data["url"]).first()
-            if existing:
-                continue
-                
-            # Parse Description
-            parsed_data = {}
-            if job_data.get("description"):
-                parsed_data = parser_service.parse_job_description(job_data["description"])
-            
-            # Calculate Match Score
-            match_score = matcher_service.compute_match_score(
-                job_data.get("description", ""), 
-                ["python", "react", "fastapi"]
-            )
+    # Parsing and DB writes are blocking, so they run in a worker thread
+    # with a session of their own (Sessions are not thread-safe)
+    def save() -> int:
+        db = SessionLocal()
+        try:
+            resume_text = base_resume_text(db)
             
-            new_job = Job(
-                title=job_data["title"],
-                company=job_data["company"],
-                location=job_data["location"],
-                url=job_data["url"],
-                source=job_data["source"],
-                raw_text=job_data.get("description"),
-                parsed_json=parsed_data,  # Fixed: use parsed_json
-                match_score=match_score,
-                is_scam=False
-            )
-            db.add(new_job)
-            saved_count += 1
+            def prepare(rows):
+                # Parse Descriptions in one batch (process pool for large scrapes)
+                described = [row for row in rows if row.get("raw_text")]
+                for row, parsed in zip(described, parser_service.parse_many([row["raw_text"] for row in described], db=db)):
+                    row["parsed_json"] = parsed
+                
+                # Score the chunk against the base resume in one vectorized pass
+                if resume_text:
+                    for row, score in zip(rows, matcher_service.score_jobs(resume_text, rows)):
+                        row["match_score"] = score
+                return rows
             
-        db.commit()
-    except Exception as e:
-        print(f"Error saving jobs to DB: {e}")
-        db.rollback()
-        return {"error": str(e), "jobs_found": 0}
+            return job_ingestion_service.ingest(db, all_jobs, prepare=prepare).inserted
+        finally:
+            db.close()
+    
+    try:
+        saved_count = await asyncio.to_thread(save)
+        if saved_count:
+            # Per-resume scores and embeddings for just the new jobs
+            await asyncio.to_thread(matcher_service.sync_scores)
+            await asyncio.to_thread(embedding_service.embed_pending)
+        await asyncio.to_thread(batch.save_cursors)
+    except Exception:
+        logger.exception("Saving %d scraped jobs failed", len(all_jobs))
+        raise HTTPException(status_code=500, detail="Failed to save scraped jobs")
     
     return {
         "message": f"Successfully found and processed {saved_count} new jobs.",
         "jobs_found": saved_count,
-        "sources": list(set(j["source"] for j in all_jobs))
+        "sources": batch.sources()
+    }
+
+@router.get("/export")
+def export_jobs(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    q: Optional[str] = Query(None, description="Optional full-text query, as for /search"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields (list fields, raw_text, status, scraped_at)"),
+    filters: JobFilters = Depends()
+):
+    """
+    Stream every matching job as NDJSON or CSV, with the same filters as
+    search. Rows are in id order, or best match first with q.
+    """
+    from app.services.search import search_index
+    
+    fields = _list_fields(fields, EXPORT_FIELDS)
+    
+    def build_query(db: Session):
+        query = db.query(*_projection(fields, Job.match_score)).select_from(Job)
+        if q and search_index.terms(q):
+            matches = search_index.matches(db, q)
+            query = query.join(matches, matches.c.job_id == Job.id)
+            order = [matches.c.rank.desc(), Job.id]
+        else:
+            order = [Job.id]
+        return filters.apply(query).order_by(*order)
+    
+    return export_response(build_query, fields, export_format, "jobs")
+
+@router.get("/{job_id}", response_model=dict)
+def read_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieve one job with its full description and analysis.
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {
+        **{name: getattr(job, name) for name in LIST_FIELDS},
+        "posted_date": job.posted_date.isoformat() if job.posted_date else None,
+        "raw_text": job.raw_text,
+        "match_breakdown": job.match_breakdown,
+        "scam_reason": job.scam_reason,
+        "status": job.status,
+        "scraped_at": job.scraped_at.isoformat() if job.scraped_at else None
     }
@@ -1,17 +1,32 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, File, Query, Response, UploadFile
 from sqlalchemy.orm import Session
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import paginate, set_next_cursor
 from app.database import get_db
 from app.models import Resume, User
 
 router = APIRouter()
 
 @router.get("/", response_model=List[dict])
-def read_resumes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_resumes(
+    response: Response,
+    skip: int = Query(0, description="Deprecated offset paging; use cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve resumes.
+    Retrieve resumes, newest first. Pass the X-Next-Cursor response header
+    back as cursor to get the next page.
     """
-    resumes = db.query(Resume).offset(skip).limit(limit).all()
+    # Walks ix_resumes_created_at_id
+    resumes, next_key = paginate(
+        db.query(Resume), [(Resume.created_at, True), (Resume.id, True)], lambda r: [r.created_at, r.id],
+        cursor, limit, offset=skip
+    )
+    set_next_cursor(response, next_key)
     return [
         {
             "id": r.id,  # INTEGER
@@ -22,6 +37,37 @@ def read_resumes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db))
         for r in resumes
     ]
 
+@router.get("/{resume_id}/scores/export")
+def export_match_scores(
+    resume_id: int,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a resume's stored match scores, best first, as NDJSON or CSV.
+    """
+    from app.models import Job, MatchScore
+    
+    if not db.query(Resume.id).filter(Resume.id == resume_id).first():
+        raise HTTPException(status_code=404, detail="Resume not found")
+    columns = [
+        "job_id", "title", "company", "url", "total_score",
+        "matched_skills", "missing_skills", "scorer_version", "calculated_at"
+    ]
+    
+    def build_query(db: Session):
+        query = db.query(
+            MatchScore.job_id, Job.title, Job.company, Job.url, MatchScore.total_score,
+            MatchScore.matched_skills, MatchScore.missing_skills, MatchScore.scorer_version, MatchScore.calculated_at
+        ).join(Job, Job.id == MatchScore.job_id).filter(MatchScore.resume_id == resume_id)
+        if min_score is not None:
+            query = query.filter(MatchScore.total_score >= min_score)
+        # Walks ix_match_scores_resume_score
+        return query.order_by(MatchScore.total_score.desc(), MatchScore.job_id)
+    
+    return export_response(build_query, columns, export_format, f"resume-{resume_id}-scores")
+
 @router.post("/upload")
 async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """
@@ -59,6 +105,10 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
         db.commit()
         db.refresh(resume)
         
+        # Score every stored job against the new resume
+        from app.services.matcher import matcher_service
+        await asyncio.to_thread(matcher_service.sync_scores, [resume.id])
+        
         return {
             "id": resume.id,  # Return INTEGER
             "version_name": resume.version_name,
@@ -0,0 +1,118 @@
+"""
+Keyset pagination with opaque cursors.
+
+A page is fetched as "rows after the last one of the previous page" in a
+total order (a sort key ending in a unique column), so each page costs the
+same index range scan however deep it is, and rows inserted meanwhile don't
+shift later pages. The cursor is the last row's sort key, encoded.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, and_, or_, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Sort-key values of the last row on a page, as an opaque token."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Values encoded by encode_cursor; 400 if the token is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def set_next_cursor(response: Response, values: Optional[List[Any]]):
+    """Advertise the next page, if there is one."""
+    if values is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
+
+
+def _after(order: Sequence[Tuple[Any, bool]], values: List[Any]):
+    """Condition selecting rows strictly after the given sort key."""
+    if len({descending for _, descending in order}) == 1:
+        # Uniform direction: a row-value comparison the composite index can range-scan
+        columns = tuple_(*(column for column, _ in order))
+        return columns < tuple_(*values) if order[0][1] else columns > tuple_(*values)
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*(order[j][0] == values[j] for j in range(i)), beyond))
+    return or_(*clauses)
+
+
+def _page_query(query, order: Sequence[Tuple[Any, bool]], cursor: Optional[str], limit: int, offset: int):
+    """The query for one page plus a look-ahead row; works on Query and select() alike."""
+    if cursor:
+        values = decode_cursor(cursor, len(order))
+        try:
+            values = [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+                for (column, _), value in zip(order, values)
+            ]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(_after(order, values))
+    query = query.order_by(*(column.desc() if descending else column.asc() for column, descending in order))
+    if offset and not cursor:
+        query = query.offset(offset)
+    return query.limit(limit + 1)
+
+
+def _split(rows: List[Any], key: Callable[[Any], List[Any]], limit: int) -> Tuple[List[Any], Optional[List[Any]]]:
+    page = rows[:limit]
+    return page, (key(page[-1]) if len(rows) > limit else None)
+
+
+def paginate(
+    query,
+    order: Sequence[Tuple[Any, bool]],
+    key: Callable[[Any], List[Any]],
+    cursor: Optional[str],
+    limit: int,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[List[Any]]]:
+    """
+    One keyset page of a query.
+
+    Args:
+        query: Query to page through (filters already applied)
+        order: (column, descending) pairs; the last column must be unique
+        key: Sort-key values of a result row, in the same order
+        cursor: Token from the previous page, or None for the first page
+        limit: Page size
+        offset: Legacy offset paging (skip=), ignored with a cursor
+
+    Returns:
+        The page's rows and the next page's cursor values (None on the last page)
+    """
+    return _split(_page_query(query, order, cursor, limit, offset).all(), key, limit)
+
+
+async def paginate_async(
+    db,
+    statement,
+    order: Sequence[Tuple[Any, bool]],
+    key: Callable[[Any], List[Any]],
+    cursor: Optional[str],
+    limit: int,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[List[Any]]]:
+    """paginate for a select() statement on an AsyncSession."""
+    rows = (await db.execute(_page_query(statement, order, cursor, limit, offset))).all()
+    return _split(rows, key, limit)
@@ -50,6 +50,8 @@ class Settings(BaseSettings):
     # Job Board APIs
     ADZUNA_API_ID: Optional[str] = None
     ADZUNA_API_KEY: Optional[str] = None
+    ADZUNA_MAX_PAGES: int = 10  # Upper bound on pages walked per query
+    ADZUNA_PAGE_WINDOW: int = 3  # Pages fetched concurrently
 
     # Email
     SENDGRID_API_KEY: Optional[str] = None
@@ -64,6 +66,26 @@ class Settings(BaseSettings):
     SCRAPE_INTERVAL_MINUTES: int = 60
     RESPECT_ROBOTS_TXT: bool = True
     USER_AGENT: str = "CareerAgent/1.0 (Job Application Bot)"
+    BROWSER_POOL_SIZE: int = 4  # Concurrent Playwright tabs
+    BROWSER_CONTEXT_MAX_USES: int = 25  # Recycle a context after this many pages
+    HOST_REQUEST_INTERVAL: float = 1.0  # Seconds between requests to one host
+    HOST_REQUEST_BURST: int = 1  # Requests a host may receive back-to-back
+    ROBOTS_CACHE_TTL_SECONDS: int = 86400
+    HTTP_CACHE_DIR: str = ".cache/http"  # ETag/Last-Modified cache for job feeds
+    ENRICH_INTERVAL_MINUTES: int = 15  # Detail-page fetches for jobs without descriptions
+    ENRICH_CONCURRENCY: int = 4
+    ENRICH_BATCH_SIZE: int = 25  # Descriptions written per DB round-trip
+    ENRICH_MAX_ATTEMPTS: int = 3  # Give up on a job after this many failed fetches
+    URL_FILTER_PATH: str = ".cache/url_bloom.bin"  # Bloom filter of stored job URLs
+    URL_FILTER_CAPACITY: int = 100000  # Minimum URLs the filter is sized for
+    URL_FILTER_ERROR_RATE: float = 0.001  # False positives just cost a DB lookup
+    SKILL_TAXONOMY_PATH: Optional[str] = None  # Skill/alias JSON; defaults to app/data/skills.json
+    PARSE_WORKERS: Optional[int] = None  # Parser processes for large batches; defaults to CPU count
+    PARSE_POOL_MIN_BATCH: int = 64  # Smaller batches are parsed inline
+    PARSE_CACHE_SIZE: int = 10000  # In-process LRU entries in front of the parse_cache table
+    EMBEDDING_MODEL: Optional[str] = None  # Local sentence-transformers model; hashed embeddings if unset
+    EMBEDDING_DIM: int = 256  # Dimension of the hashed fallback embeddings
+    EMBEDDING_NPROBE: int = 32  # IVF buckets scanned per query (recall vs. latency)
     
     # Application Settings
     DEFAULT_PERSONALITY: str = "professional"
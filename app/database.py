@@ -2,8 +2,10 @@
 import socket
 import os
 from urllib.parse import urlparse, urlunparse
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import Pool
@@ -56,13 +58,15 @@ connect_args = {}
 if is_sqlite:
     connect_args = {"check_same_thread": False}
 
+# Connection pool sizing for PostgreSQL; SQLite keeps its default pool
+pool_args = {} if is_sqlite else {"pool_size": 5, "max_overflow": 10}
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=connect_args,
     pool_pre_ping=True,  # Enable connection health checks
     echo=False,  # Set to True for SQL query logging
-    pool_size=5 if not is_sqlite else None,  # Connection pool for PostgreSQL
-    max_overflow=10 if not is_sqlite else None
+    **pool_args
 )
 
 # Add connection pool listeners for better debugging
@@ -80,6 +84,47 @@ def receive_checkout(dbapi_conn, connection_record, connection_proxy):
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+
+def _async_url(url: str):
+    """
+    The same database through its asyncio driver: asyncpg for PostgreSQL,
+    aiosqlite for SQLite. Returns the URL and the driver's connect_args.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite"), {"check_same_thread": False}
+    if url.get_backend_name() == "postgresql":
+        # asyncpg takes libpq's sslmode values through its ssl argument
+        sslmode = url.query.get("sslmode")
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+        # Transaction poolers (pgbouncer, Supabase on port 6543) hand each
+        # transaction a different server connection, where statements prepared
+        # on another one don't exist: turn off asyncpg's and SQLAlchemy's caches
+        if "prepared_statement_cache_size" not in url.query:
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args = {"statement_cache_size": 0}
+        if sslmode:
+            connect_args["ssl"] = sslmode
+        return url, connect_args
+    return url, {}
+
+
+ASYNC_DATABASE_URL, async_connect_args = _async_url(SQLALCHEMY_DATABASE_URL)
+
+# Async engine over the same database, for async request handlers; queries
+# await the driver instead of blocking the event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=async_connect_args,
+    pool_pre_ping=True,
+    echo=False,
+    **pool_args
+)
+
+# Objects stay readable after commit: async sessions can't lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
@@ -97,6 +142,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of get_db, for async def endpoints.
+    
+    Example:
+        @app.get("/items/")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.scalars(select(Item))).all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_db_session() -> Session:
     """
     Get a database session for use outside of FastAPI.
@@ -1,8 +1,9 @@
 """Initialize database tables."""
 from app.database import engine, Base
 from app.models import (
-    User, Job, Resume, Project, 
-    CoverLetter, Application, DailyMetric, JobStatus
+    User, Job, Resume, MatchScore, JobEmbedding, Project, 
+    CoverLetter, Application, DailyMetric, JobStatus, ScrapeCursor, JobLSHBand,
+    DedupDecision, DedupCounter, ParseCacheEntry
 )
 
 
@@ -10,6 +11,10 @@ def init_db():
     """Create all database tables."""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    
+    # Dialect-specific full-text search structures the ORM doesn't model
+    from app.services.search import search_index
+    search_index.ensure(engine)
     print("Tables created successfully!")
     
     # Print created tables
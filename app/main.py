@@ -11,6 +11,19 @@ async def lifespan(app: FastAPI):
     # Startup
     print("[STARTUP] Starting Career Agent API...")
     
+    # Load the stored-URL filter, then refresh it from the database in the background
+    from app.services.url_filter import url_filter
+    url_filter.start()
+    
+    # Full-text search structures (tsvector column / FTS5 table) for this database
+    from app.database import engine
+    from app.services.search import search_index
+    search_index.ensure(engine)
+    
+    # Load job embeddings into the ANN index in the background
+    from app.services.embeddings import embedding_service
+    embedding_service.start()
+    
     # Start background scheduler
     from app.scheduler import start_scheduler
     start_scheduler()
@@ -23,6 +36,21 @@ async def lifespan(app: FastAPI):
     from app.scheduler import stop_scheduler
     stop_scheduler()
     print("[SHUTDOWN] Background scheduler stopped")
+    
+    # Close the async engine's pooled connections on this event loop
+    from app.database import async_engine
+    await async_engine.dispose()
+    
+    # Close the shared Playwright browser
+    from app.services.browser_pool import browser_pool
+    await browser_pool.stop()
+    
+    # Persist the URL filter for a fast next start
+    url_filter.save()
+    
+    # Stop the parser's worker processes
+    from app.services.parser import parser_service
+    parser_service.shutdown()
 
 
 app = FastAPI(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Float, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, Float, DateTime, ForeignKey, JSON, Enum, UniqueConstraint, Index, LargeBinary
 
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -32,6 +32,10 @@ class User(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination of the newest-first job list
+        Index("ix_jobs_scraped_at_id", "scraped_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, unique=True, index=True, nullable=False)
@@ -44,6 +48,22 @@ class Job(Base):
     # Content
     raw_text = Column(Text)
     parsed_json = Column(JSON) # Structured JD: skills, seniority, etc.
+    enrich_attempts = Column(Integer, default=0) # Failed detail-page fetches
+    
+    # Structured attributes (see app.services.job_attributes)
+    salary_min = Column(Float, index=True)
+    salary_max = Column(Float, index=True)
+    salary_currency = Column(String(3), index=True) # ISO 4217
+    salary_period = Column(String(10)) # job_attributes.SalaryPeriod
+    experience_min_years = Column(Integer, index=True)
+    experience_max_years = Column(Integer)
+    seniority_level = Column(String(20), index=True) # job_attributes.Seniority
+    work_mode = Column(String(10), index=True) # job_attributes.WorkMode
+    employment_type = Column(String(20), index=True) # job_attributes.EmploymentType
+    
+    # Deduplication
+    content_hash = Column(String(64), index=True) # SHA256 of normalized title/company/description; None without a description
+    minhash = Column(JSON) # MinHash signature for near-duplicate detection
     
     # Analysis
     is_scam = Column(Boolean, default=False)
@@ -59,6 +79,9 @@ class Job(Base):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -70,6 +93,40 @@ class Resume(Base):
     user = relationship("User", back_populates="resumes")
     applications = relationship("Application", back_populates="resume")
 
+class MatchScore(Base):
+    """Score of a job against one resume; rows are rewritten when the resume or scorer changes."""
+    __tablename__ = "match_scores"
+    __table_args__ = (
+        UniqueConstraint("job_id", "resume_id", name="uq_match_scores_job_resume"),
+        # Serve "jobs ordered by my score" straight from the index
+        Index("ix_match_scores_resume_score", "resume_id", "total_score"),
+        Index("ix_match_scores_user_score", "user_id", "total_score"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    
+    total_score = Column(Float, nullable=False) # 0-100
+    matched_skills = Column(JSON)
+    missing_skills = Column(JSON)
+    match_breakdown = Column(JSON)
+    
+    scorer_version = Column(String(20), nullable=False) # matcher.MATCH_SCORER_VERSION
+    resume_hash = Column(String(64), nullable=False) # SHA256 of the resume content scored
+    calculated_at = Column(DateTime, default=datetime.utcnow)
+
+class JobEmbedding(Base):
+    """Embedding of a job's title and description (see app.services.embeddings)."""
+    __tablename__ = "job_embeddings"
+
+    id = Column(Integer, primary_key=True) # Load order for incremental index refreshes
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, unique=True)
+    model = Column(String(100), nullable=False) # Embedder name; vectors from other models are dropped
+    vector = Column(LargeBinary, nullable=False) # float32 array bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -130,3 +187,58 @@ class DailyMetric(Base):
     jobs_matched = Column(Integer, default=0)
     applications_sent = Column(Integer, default=0)
     scams_detected = Column(Integer, default=0)
+
+class ScrapeCursor(Base):
+    """High-water mark for incremental scraping of one (source, query, region)."""
+    __tablename__ = "scrape_cursors"
+    __table_args__ = (
+        UniqueConstraint("source", "query", "region", name="uq_scrape_cursors_source_query_region"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)
+    query = Column(String, nullable=False)
+    region = Column(String, nullable=False)
+    last_posted_date = Column(DateTime)  # Newest posting seen so far
+    seen_ids = Column(JSON, default=list)  # Recent external ids (or URLs) at/near the mark
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class JobLSHBand(Base):
+    """One LSH band bucket of a job's MinHash signature."""
+    __tablename__ = "job_lsh_bands"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket = Column(String(40), nullable=False, index=True) # "<band>:<hash of band rows>"
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+
+class DedupDecision(Base):
+    """Append-only log of scraped jobs collapsed into an already-known job."""
+    __tablename__ = "dedup_decisions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False) # url, content_hash, fuzzy
+    url = Column(String, nullable=False, index=True) # The duplicate that was not stored
+    source = Column(String)
+    # No foreign key: the log outlives jobs removed by cleanup
+    canonical_job_id = Column(Integer, index=True)
+    canonical_url = Column(String)
+    confidence = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class DedupCounter(Base):
+    """Running total of dedup decisions per kind, so dashboards read a row instead of scanning."""
+    __tablename__ = "dedup_counters"
+
+    kind = Column(String(20), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ParseCacheEntry(Base):
+    """Cached parse of a job description, keyed by hash of parser, version and normalized text."""
+    __tablename__ = "parse_cache"
+
+    key = Column(String(64), primary_key=True)
+    parser = Column(String(50), nullable=False, index=True) # e.g. "job_parser", "llm_jd"
+    version = Column(String(100), nullable=False)
+    result = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,5 @@
 """Background job scheduler for continuous monitoring."""
+import asyncio
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
@@ -6,6 +7,8 @@ from datetime import datetime, timedelta
 import logging
 from typing import Dict, Any
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
@@ -17,6 +20,10 @@ class JobMonitor:
     
     def __init__(self):
         self.enabled = False
+        # Event loop that owns the shared browser pool (the API's), if any
+        self.loop = None
+        # Fallback when there is no API loop; kept across runs so the pool stays warm
+        self._own_loop = None
         self.config = {
             "region": "Remote",
             "role": "Software Engineer",
@@ -41,53 +48,39 @@ class JobMonitor:
         
         try:
             from app.database import get_db_session
-            from app.models import Job
+            from app.services.ingestion import job_ingestion_service
             
             logger.info(f"[SCHEDULER] Running scheduled job scrape at {datetime.now()}")
             
             # Import scraping service
             try:
-                from app.services.adzuna import adzuna_service
-                import asyncio
+                from app.sources import source_registry
+                
+                # Adzuna plus the configured platforms, each resuming from its
+                # last run's high-water mark
+                sources = ["adzuna", *self.config["platforms"]]
                 
-                # Run async function in sync context
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                jobs = loop.run_until_complete(
-                    adzuna_service.search_jobs(
-                        self.config["role"],
-                        self.config["region"]
-                    )
-                )
-                loop.close()
+                batch = self._run(source_registry.collect(self.config["role"], self.config["region"], sources))
                 
-                logger.info(f"[SCHEDULER] Found {len(jobs) if jobs else 0} jobs from Adzuna")
+                jobs = batch.rows()
+                logger.info(f"[SCHEDULER] Found {len(jobs)} jobs from {batch.sources()}")
                 
                 # Save to database
                 if jobs:
                     db = get_db_session()
                     try:
-                        saved_count = 0
-                        for job_data in jobs:
-                            # Check for duplicates
-                            existing = db.query(Job).filter(Job.url == job_data["url"]).first()
-                            if not existing:
-                                job = Job(
-                                    title=job_data["title"],
-                                    company=job_data["company"],
-                                    location=job_data["location"],
-                                    url=job_data["url"],
-                                    source=job_data["source"],
-                                    raw_text=job_data.get("description"),
-                                    match_score=0.0  # TODO: Calculate match score
-                                )
-                                db.add(job)
-                                saved_count += 1
-                        
-                        db.commit()
-                        logger.info(f"[SCHEDULER] Saved {saved_count} new jobs to database")
+                        result = job_ingestion_service.ingest(db, jobs)
+                        logger.info(f"[SCHEDULER] Saved {result.inserted} new jobs to database")
+                        if result.inserted:
+                            # Score and embed only the new jobs
+                            from app.services.embeddings import embedding_service
+                            from app.services.matcher import matcher_service
+                            matcher_service.sync_scores()
+                            embedding_service.embed_pending()
                     finally:
                         db.close()
+                
+                batch.save_cursors()
                         
             except Exception as e:
                 logger.error(f"[SCHEDULER] Scraping service error: {e}")
@@ -95,6 +88,19 @@ class JobMonitor:
         except Exception as e:
             logger.error(f"[SCHEDULER] Scraping task error: {e}")
     
+    def _run(self, coroutine):
+        """
+        Run a coroutine from the scheduler thread. Browser sources use the
+        shared pool, whose Playwright objects belong to one event loop, so
+        the work goes to the API's loop when it is running and otherwise to
+        a loop this monitor keeps for its lifetime.
+        """
+        if self.loop is not None and self.loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+        if self._own_loop is None or self._own_loop.is_closed():
+            self._own_loop = asyncio.new_event_loop()
+        return self._own_loop.run_until_complete(coroutine)
+    
     def start(self):
         """Start continuous monitoring."""
         if self.enabled:
@@ -136,21 +142,60 @@ def cleanup_old_jobs():
     """Clean up jobs older than 30 days."""
     try:
         from app.database import get_db_session
-        from app.models import Job
+        from app.models import Job, JobEmbedding, JobLSHBand, MatchScore
+        from sqlalchemy import select
         
         logger.info("[SCHEDULER] Running cleanup task...")
         db = get_db_session()
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=30)
+            old_jobs = select(Job.id).where(Job.scraped_at < cutoff_date)
+            # Bulk deletes skip ORM cascades (and SQLite ignores ON DELETE by default)
+            db.query(JobLSHBand).filter(JobLSHBand.job_id.in_(old_jobs)).delete(synchronize_session=False)
+            db.query(MatchScore).filter(MatchScore.job_id.in_(old_jobs)).delete(synchronize_session=False)
+            db.query(JobEmbedding).filter(JobEmbedding.job_id.in_(old_jobs)).delete(synchronize_session=False)
             deleted = db.query(Job).filter(Job.scraped_at < cutoff_date).delete()
             db.commit()
             logger.info(f"[SCHEDULER] Deleted {deleted} old jobs")
+            if deleted:
+                # Bloom filters can't remove entries; rebuild without the deleted URLs
+                from app.services.url_filter import url_filter
+                url_filter.rebuild()
+                # Deleted jobs would otherwise linger in the ranking matrix and ANN index
+                from app.services.embeddings import embedding_service
+                from app.services.matcher import matcher_service
+                matcher_service.reset()
+                embedding_service.reset()
+            # Parses cached under older parser versions can never be hit again
+            from app.services.parser import parser_service
+            from app.services.parse_cache import parse_cache
+            pruned = parse_cache.prune(parser_service.cache_name, parser_service.version)
+            if pruned:
+                logger.info(f"[SCHEDULER] Pruned {pruned} stale parse cache entries")
         finally:
             db.close()
     except Exception as e:
         logger.error(f"[SCHEDULER] Cleanup task error: {e}")
 
 
+def enrich_pending_jobs():
+    """Fetch detail-page descriptions for jobs scraped from list views."""
+    try:
+        from app.services.enrichment import enrichment_service
+        
+        counts = enrichment_service.run()
+        if counts["enriched"] or counts["failed"]:
+            logger.info(f"[SCHEDULER] Enrichment: {counts['enriched']} enriched, {counts['failed']} failed")
+        if counts["enriched"]:
+            # Enrichment dropped the re-parsed jobs' scores and embeddings
+            from app.services.embeddings import embedding_service
+            from app.services.matcher import matcher_service
+            matcher_service.sync_scores()
+            embedding_service.embed_pending()
+    except Exception as e:
+        logger.error(f"[SCHEDULER] Enrichment task error: {e}")
+
+
 def daily_analytics_aggregation():
     """Aggregate daily analytics."""
     try:
@@ -197,12 +242,25 @@ def daily_analytics_aggregation():
 job_monitor = JobMonitor()
 
 
-def start_scheduler():
-    """Start the background scheduler with all scheduled tasks."""
+def start_scheduler(loop=None):
+    """
+    Start the background scheduler with all scheduled tasks.
+    
+    Args:
+        loop: The API's event loop, where scheduled scrapes run their
+            browser work; defaults to the running loop, if any
+    """
     if scheduler.running:
         logger.warning("[SCHEDULER] Scheduler already running")
         return
     
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+    job_monitor.loop = loop
+    
     # Add cleanup job (daily at 2 AM)
     scheduler.add_job(
         func=cleanup_old_jobs,
@@ -212,6 +270,15 @@ def start_scheduler():
         replace_existing=True
     )
     
+    # Add description enrichment for list-view scrapes
+    scheduler.add_job(
+        func=enrich_pending_jobs,
+        trigger=IntervalTrigger(minutes=settings.ENRICH_INTERVAL_MINUTES),
+        id="enrich_pending_jobs",
+        name="Job Description Enrichment",
+        replace_existing=True
+    )
+    
     # Add analytics aggregation (daily at 23:59)
     scheduler.add_job(
         func=daily_analytics_aggregation,
@@ -1,135 +1,174 @@
 """Playwright-based scraper for job platforms."""
-import asyncio
 import logging
 from typing import List, Dict, Any, Optional
-from playwright.async_api import async_playwright, Page, Browser
+from urllib.parse import parse_qs, urlparse
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from app.services.browser_pool import BrowserPool, browser_pool
+from app.services.politeness import politeness
+from app.services.scrape_cursor import CursorState
 
 logger = logging.getLogger(__name__)
 
+# Extracts every card's fields in one round-trip instead of one query per field.
+# textContent is used rather than innerText since lean pages load no CSS.
+EXTRACT_CARDS_JS = """
+([cardSelector, fields, limit]) => {
+    const clean = (el) => el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+    return Array.from(document.querySelectorAll(cardSelector)).slice(0, limit).map((card) => {
+        const link = card.querySelector(fields.link);
+        return {
+            title: clean(card.querySelector(fields.title)),
+            company: clean(card.querySelector(fields.company)),
+            location: clean(card.querySelector(fields.location)),
+            url: link ? link.href : null,
+        };
+    });
+}
+"""
+
+# Resolves once enough cards are rendered, scrolling to trigger lazy loading
+CARD_COUNT_JS = """
+([cardSelector, count]) => {
+    window.scrollTo(0, document.body.scrollHeight);
+    return document.querySelectorAll(cardSelector).length >= count;
+}
+"""
+
+LINKEDIN_CARDS = {
+    "card": ".base-card",
+    "fields": {
+        "title": ".base-search-card__title",
+        "company": ".base-search-card__subtitle",
+        "location": ".job-search-card__location",
+        "link": ".base-card__full-link",
+    },
+}
+
+INDEED_CARDS = {
+    "card": ".job_seen_beacon",
+    "fields": {
+        "title": "h2.jobTitle span",
+        "company": "[data-testid='company-name']",
+        "location": "[data-testid='text-location']",
+        "link": "a.jcs-JobTitle",
+    },
+}
+
+
+def indeed_job_key(url: str) -> str:
+    """Indeed's job key (jk) is stable across tracking redirects; fall back to the URL."""
+    keys = parse_qs(urlparse(url).query).get("jk")
+    return keys[0] if keys else url
+
+
 class PlaywrightScraper:
     """Scraper using Playwright for dynamic content."""
     
-    def __init__(self, headless: bool = True):
-        self.headless = headless
-        self.browser: Optional[Browser] = None
-        self.playwright = None
+    def __init__(self, pool: BrowserPool = None, card_timeout_ms: int = 10000):
+        self.pool = pool or browser_pool
+        self.card_timeout_ms = card_timeout_ms
 
     async def start(self):
-        """Start the browser session."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        """Warm up the shared browser."""
+        await self.pool.start()
         logger.info("Playwright browser started")
 
     async def stop(self):
-        """Stop the browser session."""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Stop the shared browser session."""
+        await self.pool.stop()
         logger.info("Playwright browser stopped")
 
-    async def scrape_linkedin(self, search_term: str, location: str) -> List[Dict[str, Any]]:
+    async def _extract_cards(self, page: Page, cards: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Wait until `limit` cards are rendered (or the timeout passes) and
+        pull all card fields out with a single evaluate call.
+        """
+        try:
+            await page.wait_for_function(
+                CARD_COUNT_JS,
+                arg=[cards["card"], limit],
+                timeout=self.card_timeout_ms,
+                polling=250
+            )
+        except PlaywrightTimeoutError:
+            # Fewer cards than requested; take what rendered
+            logger.info(f"Timed out waiting for {limit} '{cards['card']}' cards")
+        return await page.evaluate(EXTRACT_CARDS_JS, [cards["card"], cards["fields"], limit])
+
+    async def scrape_linkedin(self, search_term: str, location: str, limit: int = 10, cursor: Optional[CursorState] = None) -> List[Dict[str, Any]]:
         """Scrape LinkedIn jobs (public view)."""
-        if not self.browser:
-            await self.start()
-            
-        page = await self.browser.new_page()
         jobs = []
         
-        try:
-            # Construct URL
-            url = f"https://www.linkedin.com/jobs/search?keywords={search_term}&location={location}"
-            logger.info(f"Navigating to: {url}")
-            
-            await page.goto(url, wait_until="networkidle")
-            
-            # Scroll to load more jobs
-            for _ in range(3):
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(1)
-            
-            # Extract job cards
-            job_cards = await page.query_selector_all(".base-card")
-            
-            for card in job_cards[:10]:  # Limit to 10 for demo
-                try:
-                    title_el = await card.query_selector(".base-search-card__title")
-                    company_el = await card.query_selector(".base-search-card__subtitle")
-                    location_el = await card.query_selector(".job-search-card__location")
-                    link_el = await card.query_selector(".base-card__full-link")
-                    
-                    if title_el and company_el and link_el:
-                        title = await title_el.inner_text()
-                        company = await company_el.inner_text()
-                        loc = await location_el.inner_text() if location_el else location
-                        link = await link_el.get_attribute("href")
-                        
+        # Construct URL
+        url = f"https://www.linkedin.com/jobs/search?keywords={search_term}&location={location}"
+        if cursor and cursor.since:
+            # f_TPR restricts results to postings from the last N seconds
+            url += f"&f_TPR=r{cursor.days_back() * 86400}"
+        
+        await politeness.acquire(url)
+        async with self.pool.page(lean=True) as page:
+            try:
+                logger.info(f"Navigating to: {url}")
+                
+                await page.goto(url, wait_until="domcontentloaded")
+                
+                for card in await self._extract_cards(page, LINKEDIN_CARDS, limit):
+                    if card["title"] and card["company"] and card["url"]:
                         jobs.append({
-                            "title": title.strip(),
-                            "company": company.strip(),
-                            "location": loc.strip(),
-                            "url": link,
-                            "source": "linkedin",
-                            "description": "Description not fetched in list view" 
+                            "title": card["title"],
+                            "company": card["company"],
+                            "location": card["location"] or location,
+                            "url": card["url"],
+                            # Card links carry per-visit tracking params
+                            "external_id": card["url"].split("?")[0],
+                            "source": "linkedin"
                         })
-                except Exception as e:
-                    logger.warning(f"Error extracting job card: {e}")
                     
-        except Exception as e:
-            logger.error(f"Error scraping LinkedIn: {e}")
-        finally:
-            await page.close()
+            except Exception as e:
+                logger.error(f"Error scraping LinkedIn: {e}")
             
-        return jobs
+        return self._apply_cursor(jobs, cursor)
 
-    async def scrape_indeed(self, search_term: str, location: str) -> List[Dict[str, Any]]:
+    async def scrape_indeed(self, search_term: str, location: str, limit: int = 10, cursor: Optional[CursorState] = None) -> List[Dict[str, Any]]:
         """Scrape Indeed jobs."""
-        if not self.browser:
-            await self.start()
-            
-        page = await self.browser.new_page()
         jobs = []
         
-        try:
-            url = f"https://www.indeed.com/jobs?q={search_term}&l={location}"
-            logger.info(f"Navigating to: {url}")
-            
-            await page.goto(url, wait_until="domcontentloaded")
-            
-            # Handle potential popups or captchas here (simplified)
-            
-            job_cards = await page.query_selector_all(".job_seen_beacon")
-            
-            for card in job_cards[:10]:
-                try:
-                    title_el = await card.query_selector("h2.jobTitle span")
-                    company_el = await card.query_selector("[data-testid='company-name']")
-                    location_el = await card.query_selector("[data-testid='text-location']")
-                    link_el = await card.query_selector("a.jcs-JobTitle")
-                    
-                    if title_el and link_el:
-                        title = await title_el.inner_text()
-                        company = await company_el.inner_text() if company_el else "Unknown"
-                        loc = await location_el.inner_text() if location_el else location
-                        link_suffix = await link_el.get_attribute("href")
-                        link = f"https://www.indeed.com{link_suffix}"
-                        
+        url = f"https://www.indeed.com/jobs?q={search_term}&l={location}"
+        if cursor and cursor.since:
+            url += f"&fromage={cursor.days_back()}"
+        
+        await politeness.acquire(url)
+        async with self.pool.page(lean=True) as page:
+            try:
+                logger.info(f"Navigating to: {url}")
+                
+                await page.goto(url, wait_until="domcontentloaded")
+                
+                # Handle potential popups or captchas here (simplified)
+                
+                for card in await self._extract_cards(page, INDEED_CARDS, limit):
+                    if card["title"] and card["url"]:
                         jobs.append({
-                            "title": title.strip(),
-                            "company": company.strip(),
-                            "location": loc.strip(),
-                            "url": link,
-                            "source": "indeed",
-                            "description": "Description not fetched in list view"
+                            "title": card["title"],
+                            "company": card["company"] or "Unknown",
+                            "location": card["location"] or location,
+                            "url": card["url"],
+                            "external_id": indeed_job_key(card["url"]),
+                            "source": "indeed"
                         })
-                except Exception as e:
-                    logger.warning(f"Error extracting Indeed card: {e}")
                     
-        except Exception as e:
-            logger.error(f"Error scraping Indeed: {e}")
-        finally:
-            await page.close()
+            except Exception as e:
+                logger.error(f"Error scraping Indeed: {e}")
             
+        return self._apply_cursor(jobs, cursor)
+
+    @staticmethod
+    def _apply_cursor(jobs: List[Dict[str, Any]], cursor: Optional[CursorState]) -> List[Dict[str, Any]]:
+        """List views carry no posting dates, so cursors filter on seen ids only."""
+        if not cursor:
+            return jobs
+        jobs = cursor.filter_new(jobs)
+        cursor.observe(jobs)
         return jobs
 
 # Global instance
@@ -1,18 +1,24 @@
+import asyncio
+import math
 import httpx
 import logging
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Dict, Optional, Set, Union
 from app.core.config import settings
+from app.services.politeness import politeness
+from app.services.scrape_cursor import CursorState, days_since, parse_posted_date
 
 logger = logging.getLogger(__name__)
 
 class AdzunaService:
     BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+    MAX_RESULTS_PER_PAGE = 50  # Adzuna caps results_per_page at 50
 
     def __init__(self):
         self.app_id = settings.ADZUNA_API_ID
         self.app_key = settings.ADZUNA_API_KEY
 
-    async def search_jobs(self, role: str, location: str, country: str = "us", results_per_page: int = 20) -> List[Dict]:
+    async def search_jobs(self, role: str, location: str, country: str = "us", results_per_page: int = 20, page: int = 1) -> List[Dict]:
         """
         Search for jobs using the Adzuna API.
         """
@@ -20,33 +26,189 @@ class AdzunaService:
             logger.warning("Adzuna API credentials not found. Skipping Adzuna search.")
             return []
 
-        url = f"{self.BASE_URL}/{country}/search/1"
-        
+        async with httpx.AsyncClient() as client:
+            try:
+                data = await self._fetch_page(client, role, location, country, results_per_page, page)
+                results = data.get("results", [])
+                return self._normalize_results(results, country)
+            except Exception as e:
+                logger.error(f"Error searching Adzuna: {e}")
+                return []
+
+    async def iter_jobs(
+        self,
+        role: str,
+        location: str,
+        country: str = "us",
+        results_per_page: int = MAX_RESULTS_PER_PAGE,
+        max_pages: Optional[int] = None,
+        window: Optional[int] = None,
+        since_timestamp: Optional[Union[str, datetime]] = None,
+        known_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+        cursor: Optional[CursorState] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Walk Adzuna result pages concurrently, yielding new jobs as each page arrives.
+
+        Up to `window` pages are in flight at once. Paging stops at the first
+        page whose jobs are all already stored (by URL) or older than
+        `since_timestamp`, so quota is only spent while pages still carry
+        something new. Jobs already stored or older than the cutoff are not
+        yielded.
+
+        Args:
+            role: Search keywords
+            location: City or region name
+            country: Two-letter country code
+            results_per_page: Page size (max 50)
+            max_pages: Upper bound on pages to request
+            window: Number of pages fetched concurrently
+            since_timestamp: Ignore postings created before this (ISO string or datetime)
+            known_urls: Returns the subset of the given URLs that are already
+                stored; defaults to a lookup against the jobs table
+            cursor: Incremental scrape cursor; supplies the cutoff when
+                since_timestamp is omitted, filters seen ids and records
+                what was yielded
+            limit: Stop after yielding this many jobs
+        """
+        if not self.app_id or not self.app_key:
+            logger.warning("Adzuna API credentials not found. Skipping Adzuna search.")
+            return
+
+        results_per_page = min(results_per_page, self.MAX_RESULTS_PER_PAGE)
+        last_page = max_pages or settings.ADZUNA_MAX_PAGES
+        window = max(1, window or settings.ADZUNA_PAGE_WINDOW)
+        since = parse_posted_date(since_timestamp) or (cursor.since if cursor else None)
+        known_urls = known_urls or _stored_urls
+        max_days_old = days_since(since)
+
+        in_flight: Dict[asyncio.Task, int] = {}
+        next_page = 1
+        yielded = 0
+
+        async with httpx.AsyncClient() as client:
+            try:
+                while in_flight or next_page <= last_page:
+                    while next_page <= last_page and len(in_flight) < window:
+                        task = asyncio.create_task(
+                            self._fetch_page(client, role, location, country, results_per_page, next_page, max_days_old)
+                        )
+                        in_flight[task] = next_page
+                        next_page += 1
+
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        page = in_flight.pop(task)
+                        if page > last_page:
+                            # Finished alongside the page that stopped the walk
+                            continue
+                        try:
+                            data = task.result()
+                        except Exception as e:
+                            logger.error(f"Error fetching Adzuna page {page}: {e}")
+                            if cursor:
+                                # The unread pages may hold new jobs older than those yielded
+                                cursor.hold()
+                            last_page = min(last_page, page - 1)
+                            continue
+
+                        results = data.get("results", [])
+                        if page == 1 and data.get("count") is not None:
+                            last_page = min(last_page, math.ceil(data["count"] / results_per_page))
+
+                        jobs = self._normalize_results(results, country)
+                        if cursor:
+                            jobs = cursor.filter_new(jobs)
+                        fresh = await self._fresh_jobs(jobs, since, known_urls)
+                        exhausted = not fresh or len(results) < results_per_page
+                        if limit is not None and yielded + len(fresh) >= limit:
+                            # Cut before observing, so dropped jobs stay new.
+                            # Unread pages up to the natural end may hold some too.
+                            end = page if exhausted else last_page
+                            left_over = (
+                                yielded + len(fresh) > limit
+                                or next_page <= end
+                                or any(pending <= end for pending in in_flight.values())
+                            )
+                            fresh = fresh[:limit - yielded]
+                            if cursor and left_over:
+                                cursor.hold()
+                            last_page = 0
+                        if cursor:
+                            cursor.observe(fresh)
+                        for job in fresh:
+                            yield job
+                        yielded += len(fresh)
+
+                        if exhausted or last_page == 0:
+                            logger.info(f"Adzuna: stopping after page {page} ({len(fresh)} new of {len(results)})")
+                            last_page = min(last_page, page)
+
+                    # Drop requests for pages past the stopping point
+                    for task, page in list(in_flight.items()):
+                        if page > last_page:
+                            task.cancel()
+                            del in_flight[task]
+            finally:
+                for task in in_flight:
+                    task.cancel()
+
+    async def search_all_pages(self, role: str, location: str, country: str = "us", **kwargs) -> List[Dict]:
+        """
+        Collect every new job from iter_jobs into a list.
+
+        Errors other than a failed page are raised, so callers don't persist
+        a cursor that already observed jobs they never received.
+        """
+        return [job async for job in self.iter_jobs(role, location, country, **kwargs)]
+
+    async def _fetch_page(self, client: httpx.AsyncClient, role: str, location: str, country: str, results_per_page: int, page: int, max_days_old: Optional[int] = None) -> Dict:
+        """
+        Fetch a single raw result page.
+        """
+        url = f"{self.BASE_URL}/{country}/search/{page}"
+
         params = {
             "app_id": self.app_id,
             "app_key": self.app_key,
             "results_per_page": results_per_page,
             "what": role,
             "where": location,
+            "sort_by": "date",
             "content-type": "application/json"
         }
+        if max_days_old:
+            # Let Adzuna drop old postings server-side
+            params["max_days_old"] = max_days_old
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = data.get("results", [])
-                return self._normalize_results(results)
-            except Exception as e:
-                logger.error(f"Error searching Adzuna: {e}")
-                return []
+        await politeness.acquire(url)
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
 
-    def _normalize_results(self, results: List[Dict]) -> List[Dict]:
+    async def _fresh_jobs(self, jobs: List[Dict], since: Optional[datetime], known_urls: Callable[[List[str]], Set[str]]) -> List[Dict]:
+        """
+        Drop jobs that are already stored or older than the cutoff.
+        """
+        if since:
+            # Jobs without a parseable date are kept rather than silently dropped
+            jobs = [
+                job for job in jobs
+                if (parse_posted_date(job.get("posted_date")) or since) >= since
+            ]
+        urls = [job["url"] for job in jobs if job.get("url")]
+        if not urls:
+            return []
+        known = await asyncio.to_thread(known_urls, urls)
+        return [job for job in jobs if job.get("url") and job["url"] not in known]
+
+    def _normalize_results(self, results: List[Dict], country: str = "us") -> List[Dict]:
         """
         Convert Adzuna results to our internal Job format.
         """
+        from app.services.job_attributes import COUNTRY_CURRENCIES
+
         normalized = []
         for item in results:
             try:
@@ -56,11 +218,15 @@ class AdzunaService:
                     "location": item.get("location", {}).get("display_name"),
                     "description": item.get("description"),
                     "url": item.get("redirect_url"),
+                    "external_id": item.get("id"),
                     "source": "Adzuna",
                     "posted_date": item.get("created"),
                     "salary_min": item.get("salary_min"),
                     "salary_max": item.get("salary_max"),
-                    "contract_type": item.get("contract_type")
+                    "salary_currency": COUNTRY_CURRENCIES.get(country.lower()),
+                    "salary_period": "year",  # Adzuna quotes annual salaries
+                    "contract_type": item.get("contract_type"),
+                    "contract_time": item.get("contract_time")
                 }
                 normalized.append(job)
             except Exception as e:
@@ -68,4 +234,23 @@ class AdzunaService:
                 continue
         return normalized
 
+
+def _stored_urls(urls: List[str]) -> Set[str]:
+    """
+    Return the subset of URLs already present in the jobs table.
+    """
+    from app.database import SessionLocal
+    from app.models import Job
+    from app.services.url_filter import url_filter
+
+    # Only possible hits need confirming; a filter miss is definitely new
+    urls = list(url_filter.possible_hits(urls))
+    if not urls:
+        return set()
+    db = SessionLocal()
+    try:
+        return {url for (url,) in db.query(Job.url).filter(Job.url.in_(urls)).all()}
+    finally:
+        db.close()
+
 adzuna_service = AdzunaService()
@@ -2,13 +2,14 @@
 Auto-Apply Service using Playwright
 Handles form filling and submission automation
 """
-from playwright.async_api import async_playwright
 from typing import Dict, List
 import asyncio
+from app.services.browser_pool import browser_pool
+from app.services.politeness import politeness
 
 class AutoApplyService:
     def __init__(self):
-        self.headless = True
+        self.pool = browser_pool
     
     async def submit_application(self, job_url: str, form_data: Dict, files: Dict = None) -> Dict:
         """
@@ -29,11 +30,13 @@ class AutoApplyService:
             "error": None
         }
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
-            
+        # Isolated context: applications must not share cookies with scrapes
+        async with self.pool.page(isolated=True) as page:
             try:
+                # User-initiated visit rather than a crawl: rate limited, but
+                # not subject to robots.txt
+                await politeness.limiter.acquire(job_url)
+                
                 # Navigate to job posting
                 await page.goto(job_url, timeout=30000)
                 
@@ -114,8 +117,6 @@ class AutoApplyService:
             except Exception as e:
                 result["status"] = "failed"
                 result["error"] = str(e)
-            finally:
-                await browser.close()
         
         return result
 
@@ -0,0 +1,243 @@
+"""Shared Playwright browser and context pool."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lean pages only need DOM text and links
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOST_FRAGMENTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "scorecardresearch.com",
+    "nr-data.net",
+    "bat.bing.com",
+    "clarity.ms",
+    "ads.linkedin.com",
+    "snap.licdn.com",
+    "analytics.tiktok.com",
+    "quantserve.com",
+    "demdex.net",
+    "omtrdc.net",
+)
+
+
+async def _block_heavy_requests(route):
+    """Abort requests a lean page doesn't need; let everything else through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        fragment in request.url for fragment in BLOCKED_HOST_FRAGMENTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PooledContext:
+    """A warm browser context with one reusable tab."""
+
+    def __init__(self, context: BrowserContext, page: Page, lean: bool = False):
+        self.context = context
+        self.page = page
+        self.lean = lean
+        self.uses = 0
+
+    def is_healthy(self) -> bool:
+        return not self.page.is_closed()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+
+class BrowserPool:
+    """
+    Keeps one Chromium process warm and hands out tabs from a bounded set
+    of reusable contexts.
+
+    - At most `max_contexts` tabs are in use at once; extra callers wait.
+    - A context is recycled after `max_uses` checkouts so cookies, caches
+      and leaked memory don't accumulate.
+    - If Chromium crashes or disconnects, idle contexts are dropped and the
+      browser is relaunched on the next checkout.
+    - Lean contexts abort images, media, fonts, stylesheets and analytics
+      requests, for list pages where only DOM text and links matter.
+
+    Usage:
+        async with browser_pool.page(lean=True) as page:
+            await page.goto(url)
+    """
+
+    def __init__(self, max_contexts: int = 4, max_uses: int = 25, headless: bool = True):
+        self.max_contexts = max_contexts
+        self.max_uses = max_uses
+        self.headless = headless
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[_PooledContext] = []
+        self._in_use = 0
+        self._launches = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        """
+        Playwright objects belong to the event loop that created them. If we
+        are called from a new loop, shut the old loop's browser down on that
+        loop and start over. Pools shared across long-lived loops should not
+        get here: give each loop its own pool.
+
+        Raises:
+            RuntimeError: Tabs are still checked out on the other loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        old_loop = self._loop
+        if old_loop is not None:
+            if self._in_use and not old_loop.is_closed():
+                raise RuntimeError("Browser pool is in use on another event loop")
+            logger.warning("Browser pool used from a new event loop; relaunching browser")
+            if self._browser is not None or self._playwright is not None:
+                closing = self._close(self._idle, self._browser, self._playwright)
+                if old_loop.is_running():
+                    asyncio.run_coroutine_threadsafe(closing, old_loop)
+                else:
+                    closing.close()
+                    logger.error("Browser pool's old event loop is not running; its Chromium process could not be closed")
+        self._loop = loop
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+        self._in_use = 0
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._lock = asyncio.Lock()
+
+    def _browser_alive(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        """Launch the browser if it isn't running (or has crashed)."""
+        self._bind_loop()
+        async with self._lock:
+            if self._browser_alive():
+                return
+            if self._browser is not None:
+                logger.warning("Browser disconnected; discarding idle contexts and relaunching")
+                self._idle = []
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._launches += 1
+            logger.info("Browser pool: Chromium launched")
+
+    async def stop(self):
+        """Close all contexts and shut the browser down."""
+        if self._loop is None or self._loop is not asyncio.get_running_loop():
+            return
+        idle, browser, playwright = self._idle, self._browser, self._playwright
+        self._idle = []
+        self._browser = None
+        self._playwright = None
+        await self._close(idle, browser, playwright)
+        logger.info("Browser pool stopped")
+
+    @staticmethod
+    async def _close(idle: List[_PooledContext], browser: Optional[Browser], playwright):
+        for pooled in idle:
+            await pooled.close()
+        if browser:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+        if playwright:
+            await playwright.stop()
+
+    async def _new_context(self, lean: bool = False, **context_options: Any) -> _PooledContext:
+        options = {"user_agent": settings.USER_AGENT, **context_options}
+        context = await self._browser.new_context(**options)
+        if lean:
+            await context.route("**/*", _block_heavy_requests)
+        page = await context.new_page()
+        return _PooledContext(context, page, lean=lean)
+
+    async def _checkout(self, lean: bool) -> _PooledContext:
+        await self.start()
+        for pooled in [p for p in self._idle if p.lean == lean]:
+            self._idle.remove(pooled)
+            if pooled.is_healthy():
+                return pooled
+            await pooled.close()
+        return await self._new_context(lean=lean)
+
+    async def _checkin(self, pooled: _PooledContext):
+        pooled.uses += 1
+        if not self._browser_alive() or not pooled.is_healthy() or pooled.uses >= self.max_uses:
+            await pooled.close()
+            return
+        self._idle.append(pooled)
+        # Keep at most max_contexts warm contexts across lean and full flavours
+        while len(self._idle) > self.max_contexts:
+            await self._idle.pop(0).close()
+
+    @asynccontextmanager
+    async def page(self, lean: bool = False, isolated: bool = False, **context_options: Any) -> AsyncIterator[Page]:
+        """
+        Check out a tab.
+
+        Args:
+            lean: Block heavy and third-party tracking requests
+            isolated: Use a throwaway context (fresh cookies/storage) that is
+                closed afterwards, e.g. for form submissions. The browser
+                itself is still shared.
+            **context_options: Passed to browser.new_context for isolated contexts
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            self._in_use += 1
+            pooled = None
+            try:
+                if isolated:
+                    await self.start()
+                    pooled = await self._new_context(lean=lean, **context_options)
+                else:
+                    pooled = await self._checkout(lean)
+                yield pooled.page
+            finally:
+                self._in_use -= 1
+                if pooled is not None:
+                    if isolated:
+                        await pooled.close()
+                    else:
+                        await self._checkin(pooled)
+
+    def health(self) -> Dict[str, Any]:
+        """Snapshot of pool state for status endpoints."""
+        return {
+            "browser_connected": self._browser_alive(),
+            "idle_contexts": len(self._idle),
+            "in_use": self._in_use,
+            "max_contexts": self.max_contexts,
+            "launches": self._launches
+        }
+
+
+browser_pool = BrowserPool(
+    max_contexts=settings.BROWSER_POOL_SIZE,
+    max_uses=settings.BROWSER_CONTEXT_MAX_USES
+)
@@ -0,0 +1,291 @@
+"""
+Job deduplication beyond exact URLs.
+
+The same posting syndicated through several boards gets a different URL on
+each. Two signals catch it:
+
+- content_hash: SHA256 of the normalized title, company and description,
+  for exact copies. Jobs without a description (list-view scrapes) get no
+  hash: title and company alone would collapse distinct openings.
+- MinHash over word shingles of the same text, for near copies (tracking
+  footers, truncated snippets, reformatting). Signatures are split into LSH
+  bands stored in job_lsh_bands, so candidates come from an indexed bucket
+  lookup instead of a table scan; only candidates are compared.
+
+Every job collapsed into a known one (by URL, content hash or MinHash) is
+appended to dedup_decisions, and per-kind totals are kept in dedup_counters
+so dashboards read a few rows instead of scanning the jobs table.
+"""
+import hashlib
+import logging
+import random
+import re
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS  # 4 rows: ~50% similar pairs start to collide
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8  # Below this MinHash is too noisy to trust
+SIMILARITY_THRESHOLD = 0.8
+
+_MASK = (1 << 64) - 1
+# Fixed seed: signatures are persisted and must be comparable across runs
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lower-case, strip markup and punctuation, collapse whitespace."""
+    if not text:
+        return ""
+    text = _TAG_RE.sub(" ", text.lower())
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def content_hash(title: Optional[str], company: Optional[str], description: Optional[str]) -> Optional[str]:
+    body = normalize_text(description)
+    if not body:
+        return None
+    key = "|".join([normalize_text(title), normalize_text(company), body])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _shingle_hashes(text: str) -> Set[int]:
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        return set()
+    return {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8"), digest_size=8).digest(),
+            "big"
+        )
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(title: Optional[str], company: Optional[str], description: Optional[str]) -> Optional[List[int]]:
+    """MinHash signature of the posting, or None if the text is too short."""
+    hashes = _shingle_hashes(" ".join(
+        part for part in (normalize_text(title), normalize_text(company), normalize_text(description)) if part
+    ))
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    # Stored in JSON, so keep values within a signed 64-bit range
+    return [min(((a * h + b) & _MASK) >> 1 for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature: List[int]) -> List[str]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=16).hexdigest()
+        buckets.append(f"{band}:{digest}")
+    return buckets
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+@dataclass
+class DuplicateMatch:
+    """Why a job was considered a duplicate, and of what."""
+    kind: str  # "url", "content_hash" or "fuzzy"
+    confidence: float
+    job_id: Optional[int] = None  # Canonical stored job
+    url: Optional[str] = None  # Canonical job's URL (set for in-batch matches)
+
+
+class DedupEngine:
+    def fingerprint(self, row: Dict) -> Dict:
+        """Set content_hash and minhash on a job row."""
+        row["content_hash"] = content_hash(row.get("title"), row.get("company"), row.get("raw_text"))
+        row["minhash"] = minhash(row.get("title"), row.get("company"), row.get("raw_text"))
+        return row
+
+    def find_duplicates(self, db: Session, rows: List[Dict]) -> Dict[str, DuplicateMatch]:
+        """
+        Match fingerprinted rows against stored jobs and against earlier rows
+        of the same batch.
+
+        Returns:
+            Duplicate rows' URLs mapped to their match; unlisted rows are new
+        """
+        from app.models import Job, JobLSHBand
+
+        hashes = {row["content_hash"] for row in rows if row.get("content_hash")}
+        stored_hashes: Dict[str, int] = {}
+        if hashes:
+            for job_id, job_hash in db.query(Job.id, Job.content_hash).filter(Job.content_hash.in_(hashes)):
+                stored_hashes.setdefault(job_hash, job_id)
+
+        row_buckets = {row["url"]: band_buckets(row["minhash"]) for row in rows if row.get("minhash")}
+        candidates: Dict[str, Set[int]] = {}
+        all_buckets = {bucket for buckets in row_buckets.values() for bucket in buckets}
+        if all_buckets:
+            for bucket, job_id in db.query(JobLSHBand.bucket, JobLSHBand.job_id).filter(JobLSHBand.bucket.in_(all_buckets)):
+                candidates.setdefault(bucket, set()).add(job_id)
+        signatures: Dict[int, List[int]] = {}
+        candidate_ids = {job_id for ids in candidates.values() for job_id in ids}
+        if candidate_ids:
+            signatures = dict(db.query(Job.id, Job.minhash).filter(Job.id.in_(candidate_ids)))
+
+        matches: Dict[str, DuplicateMatch] = {}
+        batch_hashes: Dict[str, str] = {}
+        batch_buckets: Dict[str, List[str]] = {}
+        batch_signatures: Dict[str, List[int]] = {}
+        for row in rows:
+            url = row["url"]
+            match = self._match(
+                row, row_buckets.get(url, []), stored_hashes, candidates, signatures,
+                batch_hashes, batch_buckets, batch_signatures
+            )
+            if match:
+                matches[url] = match
+                continue
+            # Unique so far: later rows in the batch are compared against it
+            if row.get("content_hash"):
+                batch_hashes.setdefault(row["content_hash"], url)
+            if row.get("minhash"):
+                batch_signatures[url] = row["minhash"]
+                for bucket in row_buckets[url]:
+                    batch_buckets.setdefault(bucket, []).append(url)
+        return matches
+
+    @staticmethod
+    def _match(
+        row: Dict,
+        buckets: List[str],
+        stored_hashes: Dict[str, int],
+        candidates: Dict[str, Set[int]],
+        signatures: Dict[int, List[int]],
+        batch_hashes: Dict[str, str],
+        batch_buckets: Dict[str, List[str]],
+        batch_signatures: Dict[str, List[int]]
+    ) -> Optional[DuplicateMatch]:
+        row_hash = row.get("content_hash")
+        if row_hash in stored_hashes:
+            return DuplicateMatch("content_hash", 1.0, job_id=stored_hashes[row_hash])
+        if row_hash in batch_hashes:
+            return DuplicateMatch("content_hash", 1.0, url=batch_hashes[row_hash])
+
+        signature = row.get("minhash")
+        if not signature:
+            return None
+        best: Tuple[float, Optional[int], Optional[str]] = (0.0, None, None)
+        for job_id in {job_id for bucket in buckets for job_id in candidates.get(bucket, ())}:
+            if signatures.get(job_id):
+                score = similarity(signature, signatures[job_id])
+                if score > best[0]:
+                    best = (score, job_id, None)
+        for url in {url for bucket in buckets for url in batch_buckets.get(bucket, ())}:
+            score = similarity(signature, batch_signatures[url])
+            if score > best[0]:
+                best = (score, None, url)
+        if best[0] >= SIMILARITY_THRESHOLD:
+            return DuplicateMatch("fuzzy", best[0], job_id=best[1], url=best[2])
+        return None
+
+    def index(self, db: Session, signatures: Iterable[Tuple[int, Optional[List[int]]]]):
+        """Add stored jobs' signatures to the LSH band table (replacing any old bands)."""
+        from sqlalchemy import insert
+        from app.models import JobLSHBand
+
+        signatures = [(job_id, signature) for job_id, signature in signatures]
+        if not signatures:
+            return
+        db.query(JobLSHBand).filter(
+            JobLSHBand.job_id.in_([job_id for job_id, _ in signatures])
+        ).delete(synchronize_session=False)
+        rows = [
+            {"job_id": job_id, "bucket": bucket}
+            for job_id, signature in signatures if signature
+            for bucket in band_buckets(signature)
+        ]
+        if rows:
+            db.execute(insert(JobLSHBand), rows)
+
+    def record(self, db: Session, decisions: List[Dict]):
+        """
+        Log dedup decisions and bump the per-kind counters, one statement
+        each per batch. Runs in the caller's transaction.
+
+        Only the first decision per (url, kind) counts: re-scraping the same
+        syndicated posting every run is not another duplicate avoided.
+
+        Args:
+            decisions: Dicts with kind, url and optionally source,
+                canonical_job_id, canonical_url and confidence
+        """
+        from sqlalchemy import insert, update
+        from app.models import DedupCounter, DedupDecision
+
+        first: Dict[Tuple[str, str], Dict] = {}
+        for decision in decisions:
+            first.setdefault((decision["url"], decision["kind"]), decision)
+        if first:
+            logged = db.query(DedupDecision.url, DedupDecision.kind).filter(
+                DedupDecision.url.in_({url for url, _ in first})
+            )
+            for pair in logged:
+                first.pop(tuple(pair), None)
+        decisions = list(first.values())
+        if not decisions:
+            return
+        db.execute(insert(DedupDecision), decisions)
+
+        counts: Dict[str, int] = {}
+        for decision in decisions:
+            counts[decision["kind"]] = counts.get(decision["kind"], 0) + 1
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(DedupCounter).values([
+                {"kind": kind, "count": count, "updated_at": datetime.utcnow()} for kind, count in counts.items()
+            ])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[DedupCounter.kind],
+                set_={"count": DedupCounter.count + stmt.excluded.count, "updated_at": stmt.excluded.updated_at}
+            ))
+            return
+        for kind, count in counts.items():
+            updated = db.execute(
+                update(DedupCounter).where(DedupCounter.kind == kind).values(count=DedupCounter.count + count)
+            ).rowcount
+            if not updated:
+                db.add(DedupCounter(kind=kind, count=count))
+
+    def counts(self, db: Session) -> Dict[str, int]:
+        """Duplicates avoided so far, by kind."""
+        from app.models import DedupCounter
+
+        return {kind: count for kind, count in db.query(DedupCounter.kind, DedupCounter.count)}
+
+    def check(self, db: Session, url: str, title: str = "", company: str = "", description: str = "") -> Optional[DuplicateMatch]:
+        """Is this posting already stored, by URL, content hash or near-duplicate text?"""
+        from app.models import Job
+
+        existing = db.query(Job.id).filter(Job.url == url).first()
+        if existing:
+            return DuplicateMatch("url", 1.0, job_id=existing.id)
+        if not title and not description:
+            return None
+        row = self.fingerprint({"url": url, "title": title, "company": company, "raw_text": description})
+        return self.find_duplicates(db, [row]).get(url)
+
+
+dedup_engine = DedupEngine()
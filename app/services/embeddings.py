@@ -0,0 +1,354 @@
+"""
+Job and resume embeddings for semantic matching.
+
+Texts are embedded with a local sentence-transformers model when one is
+configured (settings.EMBEDDING_MODEL) and installed, and otherwise with a
+hashed bag-of-words embedder that needs no model files or network. Job
+vectors are stored as float32 blobs in job_embeddings and served from an
+in-process IVF index: vectors are bucketed under k-means centroids and a
+query only scans the buckets of its nearest centroids.
+"""
+import logging
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to we will with you your
+""".split())
+
+
+class HashedEmbedder:
+    """
+    Signed feature hashing of unigrams and bigrams with sublinear term
+    frequency, L2-normalized. Equivalent to a random projection of the
+    bag-of-words vector, so cosine similarity is approximately preserved.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashed-{dim}-v1"
+
+    def _features(self, text: str) -> Counter:
+        tokens = [token for token in _TOKEN.findall((text or "").lower()) if token not in _STOPWORDS]
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += (1.0 if h >> 31 else -1.0) * (1.0 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class ModelEmbedder:
+    """A local sentence-transformers model, run on CPU."""
+
+    def __init__(self, model_name: str):
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return self.model.encode(
+            list(texts), batch_size=64, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids, trained on a sample of the vectors."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(len(vectors), k * 64), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index over L2-normalized vectors (inner product = cosine).
+
+    Vectors are stored sorted by centroid so a bucket is one contiguous slice.
+    Vectors added after the last build go to a brute-force tail until it
+    grows past a tenth of the index, which triggers a rebuild.
+    """
+
+    def __init__(self, dim: int, nprobe: int = 32, min_train: int = 2000):
+        self.dim = dim
+        self.nprobe = nprobe
+        # Below this a brute-force scan is as fast as probing
+        self.min_train = min_train
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._ids = np.empty(0, dtype=np.int64)
+        self._vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._tail_ids = np.empty(0, dtype=np.int64)
+        self._tail_vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return int(self._alive.sum()) + len(self._tail_ids)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray):
+        with self._lock:
+            self._build(ids, vectors)
+
+    def _build(self, ids: np.ndarray, vectors: np.ndarray):
+        self._clear()
+        if len(ids) >= self.min_train:
+            nlist = int(math.sqrt(len(ids)))
+            self._centroids = _kmeans(vectors, nlist)
+            assignment = np.concatenate([
+                np.argmax(vectors[start:start + 20000] @ self._centroids.T, axis=1)
+                for start in range(0, len(vectors), 20000)
+            ])
+            order = np.argsort(assignment, kind="stable")
+            ids, vectors = ids[order], vectors[order]
+            self._offsets = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self._ids, self._vectors = ids, np.ascontiguousarray(vectors)
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._positions = {job_id: position for position, job_id in enumerate(ids.tolist())}
+
+    def upsert(self, ids: np.ndarray, vectors: np.ndarray):
+        """Add vectors, replacing any already indexed under the same ids."""
+        with self._lock:
+            replaced = np.isin(self._tail_ids, ids)
+            self._tail_ids = np.concatenate([self._tail_ids[~replaced], ids])
+            self._tail_vectors = np.vstack([self._tail_vectors[~replaced], vectors])
+            for job_id in ids.tolist():
+                position = self._positions.pop(job_id, None)
+                if position is not None:
+                    self._alive[position] = False
+            if len(self._tail_ids) > max(self.min_train, len(self._ids) // 10):
+                alive = self._alive
+                self._build(
+                    np.concatenate([self._ids[alive], self._tail_ids]),
+                    np.vstack([self._vectors[alive], self._tail_vectors])
+                )
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and cosine similarities of the (approximately) k nearest vectors, best first."""
+        with self._lock:
+            ids, vectors, alive = self._ids, self._vectors, self._alive
+            centroids, offsets = self._centroids, self._offsets
+            tail_ids, tail_vectors = self._tail_ids, self._tail_vectors
+        if centroids is not None:
+            nprobe = min(self.nprobe, len(centroids))
+            probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+            candidates = np.concatenate([np.arange(offsets[c], offsets[c + 1]) for c in probe])
+        else:
+            candidates = np.arange(len(ids))
+        candidates = candidates[alive[candidates]]
+        found_ids = np.concatenate([ids[candidates], tail_ids])
+        scores = np.concatenate([vectors[candidates] @ query, tail_vectors @ query])
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return found_ids[top], scores[top]
+
+
+class EmbeddingService:
+    def __init__(self, model_name: Optional[str] = None, dim: int = 256, nprobe: int = 32):
+        self.model_name = model_name
+        self.dim = dim
+        self.nprobe = nprobe
+        self._embedder = None
+        self._index: Optional[IVFIndex] = None
+        self._last_row_id = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        with self._lock:
+            if self._embedder is None:
+                if self.model_name and SentenceTransformer is not None:
+                    try:
+                        self._embedder = ModelEmbedder(self.model_name)
+                    except Exception as e:
+                        logger.warning(f"Could not load embedding model {self.model_name} ({e}); using hashed embeddings")
+                elif self.model_name:
+                    logger.warning("sentence-transformers is not installed; using hashed embeddings")
+                if self._embedder is None:
+                    self._embedder = HashedEmbedder(self.dim)
+                self._index = IVFIndex(self._embedder.dim, nprobe=self.nprobe)
+            return self._embedder
+
+    @property
+    def index(self) -> IVFIndex:
+        self.embedder
+        return self._index
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embedder.encode(texts)
+
+    @staticmethod
+    def job_text(title: Optional[str], raw_text: Optional[str]) -> str:
+        # Long descriptions are mostly boilerplate past the first few KB
+        return f"{title or ''}\n{(raw_text or '')[:4000]}"
+
+    @staticmethod
+    def resume_sections(text: str, min_chars: int = 200, max_sections: int = 20) -> List[str]:
+        """Split a resume on blank lines, merging short paragraphs, so each section is embedded on its own."""
+        sections: List[str] = []
+        for paragraph in re.split(r"\n\s*\n", text or ""):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if sections and len(sections[-1]) < min_chars:
+                sections[-1] += "\n" + paragraph
+            else:
+                sections.append(paragraph)
+        return sections[:max_sections] or [text or ""]
+
+    def embed_pending(self, batch_size: int = 256) -> int:
+        """
+        Embed jobs that have no embedding from the current model, in batches.
+        Embeddings from another model are dropped first.
+
+        Returns:
+            Number of jobs embedded
+        """
+        from sqlalchemy import insert
+        from app.database import SessionLocal
+        from app.models import Job, JobEmbedding
+
+        model = self.embedder.name
+        db = SessionLocal()
+        embedded = 0
+        try:
+            stale = db.query(JobEmbedding).filter(JobEmbedding.model != model).delete(synchronize_session=False)
+            if stale:
+                db.commit()
+                self.reset()
+            last_id = 0
+            while True:
+                rows = db.query(Job.id, Job.title, Job.raw_text).outerjoin(
+                    JobEmbedding, JobEmbedding.job_id == Job.id
+                ).filter(
+                    JobEmbedding.id.is_(None), Job.id > last_id
+                ).order_by(Job.id).limit(batch_size).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                vectors = self.embed([self.job_text(row.title, row.raw_text) for row in rows])
+                db.execute(insert(JobEmbedding), [
+                    {"job_id": row.id, "model": model, "vector": vector.tobytes()}
+                    for row, vector in zip(rows, vectors)
+                ])
+                db.commit()
+                embedded += len(rows)
+            if embedded:
+                logger.info(f"Embedded {embedded} jobs with {model}")
+            return embedded
+        except Exception as e:
+            logger.error(f"Error embedding jobs: {e}")
+            db.rollback()
+            return embedded
+        finally:
+            db.close()
+
+    def forget_jobs(self, db, job_ids: Iterable[int]):
+        """Drop stored embeddings of jobs whose text changed; embed_pending redoes them."""
+        from app.models import JobEmbedding
+
+        db.query(JobEmbedding).filter(JobEmbedding.job_id.in_(list(job_ids))).delete(synchronize_session=False)
+
+    def refresh(self, db) -> int:
+        """Load embeddings stored since the last refresh into the index. Returns the number loaded."""
+        from app.models import JobEmbedding
+
+        index = self.index
+        with self._refresh_lock:
+            return self._refresh(db, index)
+
+    def _refresh(self, db, index: IVFIndex) -> int:
+        from app.models import JobEmbedding
+
+        rows = db.query(JobEmbedding.id, JobEmbedding.job_id, JobEmbedding.vector).filter(
+            JobEmbedding.id > self._last_row_id, JobEmbedding.model == self.embedder.name
+        ).order_by(JobEmbedding.id).all()
+        if not rows:
+            return 0
+        ids = np.fromiter((row.job_id for row in rows), dtype=np.int64, count=len(rows))
+        vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32).reshape(len(rows), index.dim)
+        if self._last_row_id == 0:
+            index.build(ids, vectors)
+        else:
+            index.upsert(ids, vectors)
+        self._last_row_id = rows[-1].id
+        return len(rows)
+
+    def start(self):
+        """Build the index in the background so the first query doesn't pay for it."""
+        def warm():
+            from app.database import SessionLocal
+
+            db = SessionLocal()
+            try:
+                logger.info(f"Embedding index ready with {self.refresh(db)} jobs")
+            except Exception as e:
+                logger.error(f"Error loading embedding index: {e}")
+            finally:
+                db.close()
+
+        threading.Thread(target=warm, name="embedding-index-load", daemon=True).start()
+
+    def reset(self):
+        """Drop the in-memory index (jobs were deleted); the next refresh reloads it."""
+        with self._refresh_lock:
+            self.index.clear()
+            self._last_row_id = 0
+
+    def similar_jobs(self, db, resume_text: str, limit: int = 50) -> List[Tuple[int, float]]:
+        """
+        Jobs closest to any section of the resume.
+
+        Returns:
+            (job id, cosine similarity) pairs, best first
+        """
+        self.refresh(db)
+        best = {}
+        for query in self.embed(self.resume_sections(resume_text)):
+            ids, scores = self.index.search(query, limit)
+            for job_id, score in zip(ids.tolist(), scores.tolist()):
+                if score > best.get(job_id, -1.0):
+                    best[job_id] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+embedding_service = EmbeddingService(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM, settings.EMBEDDING_NPROBE)
@@ -0,0 +1,249 @@
+"""
+Background enrichment of jobs scraped without a description.
+
+List-view scrapers (LinkedIn, Indeed) only see titles and links. This stage
+picks up stored jobs whose raw_text is missing, fetches their detail pages
+through a small worker pool (bounded concurrency, robots.txt and per-host
+rate limits via the politeness gate), writes the descriptions back in
+batches and re-runs parsing, scam detection and scoring for just those rows.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from bs4 import BeautifulSoup
+from sqlalchemy import func, or_, update
+
+from app.core.config import settings
+from app.services.browser_pool import BrowserPool
+from app.services.dedup import dedup_engine
+from app.services.job_attributes import ATTRIBUTE_COLUMNS, refresh_job_attributes
+from app.services.politeness import PolitenessGate, politeness
+
+logger = logging.getLogger(__name__)
+
+# Older list scrapes stored this instead of leaving raw_text empty
+PLACEHOLDER_DESCRIPTIONS = ("Description not fetched in list view",)
+
+# Detail-page description containers, by host; the first match wins
+DESCRIPTION_SELECTORS = {
+    "www.linkedin.com": [".show-more-less-html__markup", ".description__text"],
+    "www.indeed.com": ["#jobDescriptionText"],
+}
+DEFAULT_SELECTORS = ["[class*='job-description']", "[class*='jobDescription']", "article", "main"]
+
+# Hosts whose detail pages need JavaScript (or block plain HTTP clients)
+BROWSER_HOSTS = {"www.indeed.com"}
+
+# Shorter than this is treated as "nothing useful found"
+MIN_DESCRIPTION_LENGTH = 80
+
+
+def extract_description(html: str, host: str) -> Optional[str]:
+    """Pull the job description text out of a detail page."""
+    soup = BeautifulSoup(html, "html.parser")
+    for selector in DESCRIPTION_SELECTORS.get(host, []) + DEFAULT_SELECTORS:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text(separator="\n", strip=True)
+            if len(text) >= MIN_DESCRIPTION_LENGTH:
+                return text
+    return None
+
+
+class JobEnrichmentService:
+    def __init__(
+        self,
+        concurrency: int = 4,
+        batch_size: int = 25,
+        max_attempts: int = 3,
+        gate: PolitenessGate = None
+    ):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.gate = gate or politeness
+        # Own pool so a run on the scheduler thread doesn't rebind the
+        # scraper's shared pool to another event loop
+        self.pool = BrowserPool(max_contexts=concurrency)
+
+    def pending(self, limit: int) -> List[Tuple[int, str]]:
+        """(id, url) of stored jobs still waiting for a description, newest first."""
+        from app.database import SessionLocal
+        from app.models import Job
+
+        db = SessionLocal()
+        try:
+            return db.query(Job.id, Job.url).filter(
+                or_(Job.raw_text.is_(None), Job.raw_text == "", Job.raw_text.in_(PLACEHOLDER_DESCRIPTIONS)),
+                or_(Job.enrich_attempts.is_(None), Job.enrich_attempts < self.max_attempts)
+            ).order_by(Job.scraped_at.desc()).limit(limit).all()
+        finally:
+            db.close()
+
+    async def enrich_pending(self, limit: int = 100) -> Dict[str, int]:
+        """
+        Fetch descriptions for up to `limit` pending jobs.
+
+        Returns:
+            Counts of enriched and failed jobs
+        """
+        pending = await asyncio.to_thread(self.pending, limit)
+        if not pending:
+            return {"enriched": 0, "failed": 0}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        results: Dict[int, Optional[str]] = {}
+        counts = {"enriched": 0, "failed": 0}
+        flush_lock = asyncio.Lock()
+
+        async def flush(force: bool = False):
+            async with flush_lock:
+                if results and (force or len(results) >= self.batch_size):
+                    batch = dict(results)
+                    results.clear()
+                    enriched = await asyncio.to_thread(self._write_batch, batch)
+                    counts["enriched"] += enriched
+                    counts["failed"] += len(batch) - enriched
+
+        async with httpx.AsyncClient(
+            timeout=20.0,
+            follow_redirects=True,
+            headers={"User-Agent": settings.USER_AGENT}
+        ) as client:
+
+            async def worker():
+                while True:
+                    try:
+                        job_id, url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    results[job_id] = await self._fetch_description(client, url)
+                    await flush()
+
+            try:
+                await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+            finally:
+                await flush(force=True)
+                await self.pool.stop()
+
+        logger.info(f"Enrichment: {counts['enriched']} enriched, {counts['failed']} failed")
+        return counts
+
+    async def _fetch_description(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        host = self.gate.host_for(url)
+        try:
+            await self.gate.acquire(url)
+            if host in BROWSER_HOSTS:
+                async with self.pool.page(lean=True) as page:
+                    await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                    html = await page.content()
+            else:
+                response = await client.get(url)
+                response.raise_for_status()
+                html = response.text
+            return extract_description(html, host)
+        except Exception as e:
+            logger.warning(f"Enrichment fetch failed for {url}: {e}")
+            return None
+
+    def _write_batch(self, descriptions: Dict[int, Optional[str]]) -> int:
+        """
+        Store fetched descriptions and re-analyze only those rows; count a
+        failed attempt for the rest. Returns the number of enriched jobs.
+        """
+        from app.database import SessionLocal
+        from app.models import Job, MatchScore
+        from app.services.embeddings import embedding_service
+        from app.services.matcher import base_resume_text, matcher_service
+        from app.services.parser import parser_service
+
+        enriched = {job_id: text for job_id, text in descriptions.items() if text}
+        failed = [job_id for job_id, text in descriptions.items() if not text]
+
+        db = SessionLocal()
+        try:
+            if enriched:
+                jobs = db.query(
+                    Job.id, Job.title, Job.company, Job.location,
+                    *(getattr(Job, name) for name in ATTRIBUTE_COLUMNS)
+                ).filter(
+                    Job.id.in_(list(enriched))
+                ).all()
+                resume_text = base_resume_text(db)
+                # One parse call for the batch: a single cache round-trip, and
+                # the parser's process pool when the batch is large
+                parsed = parser_service.parse_many([enriched[job.id] for job in jobs], db=db)
+                values = [
+                    self._analyze(job, enriched[job.id], job_parsed, resume_text)
+                    for job, job_parsed in zip(jobs, parsed)
+                ]
+                db.execute(update(Job), values)
+                # The real description changes the job's dedup fingerprint
+                dedup_engine.index(db, [(row["id"], row["minhash"]) for row in values])
+                # ...and its skills; matcher_service.sync_scores rescores these
+                db.query(MatchScore).filter(MatchScore.job_id.in_(list(enriched))).delete(synchronize_session=False)
+                embedding_service.forget_jobs(db, enriched)
+            if failed:
+                db.execute(
+                    update(Job)
+                    .where(Job.id.in_(failed))
+                    .values(enrich_attempts=func.coalesce(Job.enrich_attempts, 0) + 1)
+                )
+            db.commit()
+            if enriched:
+                # Keep the in-memory ranking matrix in step with the re-parsed skills
+                matcher_service.update_jobs({row["id"]: matcher_service.job_skills(row["parsed_json"]) for row in values})
+            return len(enriched)
+        except Exception as e:
+            logger.error(f"Error writing enrichment batch: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    @staticmethod
+    def _analyze(job, text: str, parsed: Dict, resume_text: Optional[str]) -> Dict:
+        """Re-screen, re-fingerprint, re-extract and re-score a job from its real description and its new parse."""
+        from app.services.matcher import matcher_service
+        from app.services.scam_detector import scam_detector_service
+
+        scam = scam_detector_service.detect_scam({"company": job.company or "", "raw_text": text})
+        fingerprint = dedup_engine.fingerprint({
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "raw_text": text
+        })
+        values = {
+            "id": job.id,
+            "raw_text": text,
+            "parsed_json": parsed,
+            "is_scam": scam["is_scam"],
+            "scam_reason": "; ".join(scam["flags"]) or None,
+            "content_hash": fingerprint["content_hash"],
+            "minhash": fingerprint["minhash"],
+            **refresh_job_attributes(job, text)
+        }
+        if resume_text:
+            values["match_score"] = matcher_service.compute_match_score(resume_text, parsed)
+        return values
+
+    def run(self, limit: int = 100):
+        """Blocking entry point for the scheduler thread."""
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.enrich_pending(limit))
+        finally:
+            loop.close()
+
+
+enrichment_service = JobEnrichmentService(
+    concurrency=settings.ENRICH_CONCURRENCY,
+    batch_size=settings.ENRICH_BATCH_SIZE,
+    max_attempts=settings.ENRICH_MAX_ATTEMPTS
+)
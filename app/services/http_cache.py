@@ -0,0 +1,154 @@
+"""
+Disk-backed conditional HTTP cache for job feed requests.
+
+Stores each response body with its ETag/Last-Modified validators and sends
+If-None-Match/If-Modified-Since on the next request. A 304 tells the caller
+the feed is unchanged, so it can skip parsing entirely.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Result of a conditional fetch."""
+    key: str
+    status_code: int
+    not_modified: bool
+    digest: str  # sha256 of the body, stable across 304s
+    cache: "HTTPResponseCache"
+    _content: Optional[bytes] = None
+
+    @property
+    def content(self) -> bytes:
+        """Response body; read from disk on a 304."""
+        if self._content is None:
+            self._content = self.cache._read_body(self.key)
+        return self._content
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class HTTPResponseCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key_for(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key covering the URL and (sorted) query parameters."""
+        canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A validator without its body is useless; treat as a miss
+        return meta if os.path.exists(self._body_path(key)) else None
+
+    def _read_body(self, key: str) -> bytes:
+        with open(self._body_path(key), "rb") as f:
+            return f.read()
+
+    def _store(self, key: str, url: str, headers: Any, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # Nothing to revalidate against; don't keep the body around
+            return digest
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Body first, then metadata, so a crash never leaves a validator
+            # pointing at a missing or stale body
+            with open(self._body_path(key), "wb") as f:
+                f.write(content)
+            with open(self._meta_path(key), "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "digest": digest,
+                    "stored_at": time.time()
+                }, f)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {url}: {e}")
+        return digest
+
+    @staticmethod
+    def _conditional_headers(meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> CachedResponse:
+        """Conditional GET with an httpx client. Raises on HTTP errors."""
+        key = self.key_for(url, params)
+        meta = await asyncio.to_thread(self._load_meta, key)
+        request_headers = {**(headers or {}), **self._conditional_headers(meta)}
+
+        response = await client.get(url, params=params, headers=request_headers)
+        if response.status_code == 304 and meta:
+            logger.info(f"HTTP cache: {url} not modified")
+            return CachedResponse(key, 304, True, meta["digest"], self)
+        response.raise_for_status()
+
+        digest = await asyncio.to_thread(self._store, key, url, response.headers, response.content)
+        return CachedResponse(key, response.status_code, False, digest, self, response.content)
+
+    def fetch_sync(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10
+    ) -> CachedResponse:
+        """Conditional GET with requests. Raises on HTTP errors."""
+        key = self.key_for(url, params)
+        meta = self._load_meta(key)
+        request_headers = {**(headers or {}), **self._conditional_headers(meta)}
+
+        response = requests.get(url, params=params, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and meta:
+            logger.info(f"HTTP cache: {url} not modified")
+            return CachedResponse(key, 304, True, meta["digest"], self)
+        response.raise_for_status()
+
+        digest = self._store(key, url, response.headers, response.content)
+        return CachedResponse(key, response.status_code, False, digest, self, response.content)
+
+
+http_response_cache = HTTPResponseCache(settings.HTTP_CACHE_DIR)
@@ -0,0 +1,305 @@
+"""
+Batch ingestion of scraped jobs.
+
+Every scrape path funnels its jobs through JobIngestionService.ingest, which
+resolves already-stored URLs with one IN query per chunk and writes the chunk
+with a single INSERT ... ON CONFLICT (url) statement, instead of a SELECT and
+an INSERT per job. New URLs are also checked for content and near-duplicate
+copies of stored jobs (see app.services.dedup) before they are inserted, and
+every job collapsed into a known one is logged as a dedup decision.
+When inserts go through ON CONFLICT, only URLs the in-memory URL filter
+reports as possibly stored are looked up at all (see app.services.url_filter).
+"""
+import logging
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models import Job
+from app.services.dedup import dedup_engine
+from app.services.job_attributes import ATTRIBUTE_COLUMNS, extract_job_attributes
+from app.services.scrape_cursor import parse_posted_date
+from app.services.url_filter import url_filter
+
+logger = logging.getLogger(__name__)
+
+# Adapters disagree on the description key; all of them end up in raw_text
+DESCRIPTION_KEYS = ("raw_text", "description", "raw_description")
+
+# Columns refreshed from a re-scraped posting when updating
+REFRESH_COLUMNS = ("title", "company", "location", "posted_date", "raw_text", "source", *ATTRIBUTE_COLUMNS)
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0  # Includes duplicates
+    duplicates: int = 0  # New URLs matching a stored or earlier posting's content
+    inserted_ids: List[int] = field(default_factory=list)
+    inserted_urls: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "duplicates": self.duplicates
+        }
+
+
+def _decision(
+    kind: str,
+    row: Dict[str, Any],
+    job_id: Optional[int] = None,
+    canonical_url: Optional[str] = None,
+    confidence: float = 1.0
+) -> Dict[str, Any]:
+    """A dedup_decisions row for a scraped job collapsed into a known one."""
+    return {
+        "kind": kind,
+        "url": row["url"],
+        "source": row.get("source"),
+        "canonical_job_id": job_id,
+        "canonical_url": canonical_url,
+        "confidence": confidence,
+        "created_at": datetime.utcnow()
+    }
+
+
+def _column_default(column) -> Any:
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg if default.is_scalar else None
+
+
+class JobIngestionService:
+    CHUNK_SIZE = 500
+
+    def __init__(self):
+        self._columns = [c for c in Job.__table__.columns if not c.primary_key]
+        self._column_names = {c.name for c in self._columns}
+
+    def to_row(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Map a scraped job dict onto jobs table columns.
+
+        Description aliases become raw_text, unknown keys (tags, external_id,
+        contract_type, ...) are dropped, posted_date is parsed into a datetime
+        and missing columns get their default,
+        so every row in a chunk has the same keys. Also fingerprints the row
+        for deduplication and fills the structured salary, experience,
+        seniority, work mode and employment type columns (source-provided
+        values win over ones extracted from the text). Returns None if the
+        job lacks a URL, title or company.
+        """
+        row = {name: value for name, value in job.items() if name in self._column_names}
+        # Adapters pass the feed's ISO string or epoch; the column takes datetimes
+        row["posted_date"] = parse_posted_date(row.get("posted_date"))
+        if not row.get("raw_text"):
+            row["raw_text"] = next((job[key] for key in DESCRIPTION_KEYS if job.get(key)), None)
+        if not row.get("url") or not row.get("title") or not row.get("company"):
+            return None
+        dedup_engine.fingerprint(row)
+        attributes = extract_job_attributes(row.get("raw_text"), row.get("title"), row.get("location"), structured=job)
+        for name, value in attributes.items():
+            if row.get(name) is None:
+                row[name] = value
+        for column in self._columns:
+            if row.get(column.name) is None:
+                row[column.name] = _column_default(column)
+        return row
+
+    def ingest(
+        self,
+        db: Session,
+        jobs: Iterable[Dict[str, Any]],
+        update_existing: bool = False,
+        prepare: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+        chunk_size: Optional[int] = None,
+        commit: bool = True
+    ) -> IngestResult:
+        """
+        Store a batch of scraped jobs, deduplicated by URL.
+
+        Args:
+            db: Database session
+            jobs: Job dicts from any scraper/API adapter
+            update_existing: Refresh title, company, location, posted date,
+                description and source of already-stored jobs (ON CONFLICT
+                DO UPDATE) instead of leaving them alone (DO NOTHING)
+            prepare: Called with each chunk's new rows before insert, e.g. to
+                fill in parsed_json or match_score for the whole chunk at
+                once; not called for existing jobs
+            chunk_size: Rows per statement
+            commit: Commit when done (rolls back and re-raises on error)
+
+        Returns:
+            IngestResult with inserted/updated/skipped counts
+        """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        result = IngestResult()
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        repeats: List[Dict[str, Any]] = []
+        for job in jobs:
+            row = self.to_row(job)
+            if row is None or row["url"] in rows:
+                if row is not None:
+                    repeats.append(_decision("url", row, canonical_url=row["url"]))
+                result.skipped += 1
+                continue
+            rows[row["url"]] = row
+
+        batch = list(rows.values())
+        try:
+            for start in range(0, len(batch), chunk_size):
+                self._ingest_chunk(db, batch[start:start + chunk_size], update_existing, prepare, result)
+            dedup_engine.record(db, repeats)
+            if commit:
+                db.commit()
+        except Exception:
+            if commit:
+                db.rollback()
+            raise
+        # Uncommitted URLs only cost a wasted lookup if the caller rolls back
+        url_filter.add_many(result.inserted_urls)
+
+        logger.info(
+            f"Ingested jobs: {result.inserted} inserted, {result.updated} updated, {result.skipped} skipped"
+        )
+        return result
+
+    def _ingest_chunk(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        update_existing: bool,
+        prepare: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]],
+        result: IngestResult
+    ):
+        urls = [row["url"] for row in rows]
+        if not update_existing and self._supports_upsert(db):
+            # A filter miss is definitely new; ON CONFLICT covers URLs another
+            # process inserted since the filter was built
+            urls = list(url_filter.possible_hits(urls))
+        existing: Dict[str, int] = {}
+        if urls:
+            existing = {url: job_id for job_id, url in db.query(Job.id, Job.url).filter(Job.url.in_(urls)).all()}
+
+        # Same posting under another URL (syndicated through another board)
+        duplicates = dedup_engine.find_duplicates(db, [row for row in rows if row["url"] not in existing])
+        looked_up = set(urls)
+        unchecked = [url for url in duplicates if url not in looked_up]
+        if unchecked:
+            # A filter miss whose content matches may be stored under this very
+            # URL (inserted since the filter was built): that's a URL repeat
+            for job_id, url in db.query(Job.id, Job.url).filter(Job.url.in_(unchecked)):
+                existing[url] = job_id
+                del duplicates[url]
+        decisions = [
+            _decision("url", row, job_id=existing[row["url"]], canonical_url=row["url"])
+            for row in rows if row["url"] in existing
+        ]
+
+        new_rows = [row for row in rows if row["url"] not in existing]
+        duplicate_rows = [row for row in new_rows if row["url"] in duplicates]
+        if duplicates:
+            new_rows = [row for row in new_rows if row["url"] not in duplicates]
+            result.duplicates += len(duplicates)
+            result.skipped += len(duplicates)
+        if prepare and new_rows:
+            new_rows = prepare(new_rows)
+
+        if update_existing:
+            # New rows and refreshed existing rows go out in one upsert
+            write_rows = new_rows + [row for row in rows if row["url"] in existing]
+            result.updated += len(existing)
+        else:
+            write_rows = new_rows
+            result.skipped += len(existing)
+        inserted = self._write(db, rows, new_rows, write_rows, existing, update_existing)
+        inserted_ids = {url: job_id for job_id, url in inserted}
+        if inserted:
+            signatures = {row["url"]: row.get("minhash") for row in new_rows}
+            dedup_engine.index(db, [(job_id, signatures[url]) for job_id, url in inserted])
+            result.inserted_ids.extend(job_id for job_id, _ in inserted)
+            result.inserted_urls.extend(url for _, url in inserted)
+            result.inserted += len(inserted)
+        # Rows that lost an insert race with a concurrent scrape
+        lost = [row for row in new_rows if row["url"] not in inserted_ids]
+        result.skipped += len(lost)
+
+        decisions.extend(_decision("url", row, canonical_url=row["url"]) for row in lost)
+        for row in duplicate_rows:
+            match = duplicates[row["url"]]
+            # In-batch matches point at a row that was only just inserted
+            job_id = match.job_id or inserted_ids.get(match.url)
+            decisions.append(_decision(match.kind, row, job_id=job_id, canonical_url=match.url, confidence=match.confidence))
+        dedup_engine.record(db, decisions)
+
+    def _write(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        new_rows: List[Dict[str, Any]],
+        write_rows: List[Dict[str, Any]],
+        existing: Dict[str, int],
+        update_existing: bool
+    ) -> List[Tuple[int, str]]:
+        """Insert (and refresh) a chunk; returns (id, url) of the newly inserted jobs."""
+        if not write_rows:
+            return []
+        stmt = self._upsert(db, write_rows, update_existing)
+        if stmt is None:
+            # Dialect without ON CONFLICT: the IN query above already filtered
+            if update_existing:
+                self._update_fallback(db, [row for row in rows if row["url"] in existing])
+            if not new_rows:
+                return []
+            stmt = insert(Job).values(new_rows).returning(Job.id, Job.url)
+
+        new_urls = {row["url"] for row in new_rows}
+        return [(job_id, url) for job_id, url in db.execute(stmt).all() if url in new_urls]
+
+    @staticmethod
+    def _supports_upsert(db: Session) -> bool:
+        return db.get_bind().dialect.name in ("postgresql", "sqlite")
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]], update_existing: bool):
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+
+        stmt = dialect_insert(Job).values(rows)
+        if update_existing:
+            # Keep stored values where the re-scrape has nothing
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.url],
+                set_={
+                    name: func.coalesce(getattr(stmt.excluded, name), getattr(Job, name))
+                    for name in REFRESH_COLUMNS
+                }
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Job.url])
+        return stmt.returning(Job.id, Job.url)
+
+    def _update_fallback(self, db: Session, rows: List[Dict[str, Any]]):
+        for row in rows:
+            values = {name: row[name] for name in REFRESH_COLUMNS if row.get(name) is not None}
+            if values:
+                db.query(Job).filter(Job.url == row["url"]).update(values, synchronize_session=False)
+
+
+job_ingestion_service = JobIngestionService()
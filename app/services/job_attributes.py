@@ -0,0 +1,400 @@
+"""
+Deterministic extraction of typed job attributes.
+
+Pulls salary (range, currency, period), years of experience, seniority,
+work mode and employment type out of a posting with word-bounded regexes,
+preferring values a source already provides in structured form (Adzuna's
+salary_min/salary_max/contract_time, ...). The results are stored in indexed
+jobs columns so filtering and ranking can happen in SQL.
+"""
+import enum
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Seniority(str, enum.Enum):
+    INTERN = "intern"
+    JUNIOR = "junior"
+    MID = "mid"
+    SENIOR = "senior"
+    LEAD = "lead"
+    PRINCIPAL = "principal"
+    EXECUTIVE = "executive"
+
+
+class WorkMode(str, enum.Enum):
+    REMOTE = "remote"
+    HYBRID = "hybrid"
+    ONSITE = "onsite"
+
+
+class EmploymentType(str, enum.Enum):
+    FULL_TIME = "full_time"
+    PART_TIME = "part_time"
+    CONTRACT = "contract"
+    TEMPORARY = "temporary"
+    INTERNSHIP = "internship"
+    FREELANCE = "freelance"
+
+
+class SalaryPeriod(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+# Job columns filled by extract_job_attributes
+ATTRIBUTE_COLUMNS = (
+    "salary_min", "salary_max", "salary_currency", "salary_period",
+    "experience_min_years", "experience_max_years",
+    "seniority_level", "work_mode", "employment_type",
+)
+
+# Adzuna country endpoints and the currency their salaries are quoted in
+COUNTRY_CURRENCIES = {
+    "gb": "GBP", "uk": "GBP", "us": "USD", "ca": "CAD", "au": "AUD", "nz": "NZD", "in": "INR",
+    "sg": "SGD", "za": "ZAR", "br": "BRL", "mx": "MXN", "pl": "PLN", "ch": "CHF",
+    "at": "EUR", "be": "EUR", "de": "EUR", "es": "EUR", "fr": "EUR", "it": "EUR", "nl": "EUR",
+}
+
+_SYMBOLS = {
+    "$": "USD", "us$": "USD", "ca$": "CAD", "c$": "CAD", "a$": "AUD", "au$": "AUD", "nz$": "NZD", "s$": "SGD",
+    "£": "GBP", "€": "EUR", "₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR",
+}
+_CODES = ("USD", "GBP", "EUR", "INR", "CAD", "AUD", "NZD", "SGD", "CHF", "ZAR", "BRL", "MXN", "PLN")
+
+_CURRENCY = r"(?:US\$|CA\$|AU\$|NZ\$|[CAS]\$|\$|£|€|₹|Rs\.?|" + "|".join(_CODES) + r")"
+# Thousands separators, including Indian lakh grouping (12,00,000)
+_GROUPED = r"\d{1,3}(?:,\d{2})*(?:[,.]\d{3})+"
+_AMOUNT = _GROUPED + r"|\d+(?:\.\d+)?"
+_RANGE_SEP = r"\s*(?:-|–|—|to)\s*"
+_PERIOD = (
+    r"(?:\s*(?:/|per|an?|each)\s*(?P<per>hour|hr|year|yr|annum|month|mo|week|wk|day)\b"
+    r"|\s*(?P<adverb>hourly|annually|yearly|monthly|weekly|daily|p\.?\s?a\.?|pa)\b)?"
+)
+_SALARY_RE = re.compile(
+    rf"(?<![\w$£€₹])(?P<cur>{_CURRENCY})\s?(?P<low>{_AMOUNT})\s*(?P<low_mult>[kKmM])?\b(?!\s*(?:million|billion|mn|bn)\b)"
+    rf"(?:{_RANGE_SEP}(?:{_CURRENCY})?\s?(?P<high>{_AMOUNT})\s*(?P<high_mult>[kKmM])?\b)?"
+    rf"(?:\s*(?P<code>{'|'.join(_CODES)})\b)?"
+    + _PERIOD,
+    re.IGNORECASE
+)
+# "25 USD hourly", "90,000 EUR": code after the amount
+_SALARY_CODE_AFTER_RE = re.compile(
+    rf"\b(?P<low>{_AMOUNT})\s*(?P<low_mult>[kKmM])?\b"
+    rf"(?:{_RANGE_SEP}(?P<high>{_AMOUNT})\s*(?P<high_mult>[kKmM])?\b)?"
+    rf"\s*(?P<code>{'|'.join(_CODES)})\b"
+    + _PERIOD,
+    re.IGNORECASE
+)
+# Figures about the company rather than the role ("raised $20M", "$5,000,000 in revenue")
+_COMPANY_FIGURE = (
+    r"rais(?:ed|e|ing)|funding|funded|series [a-f]|seed round|revenue|valuation|valued|arr|"
+    r"investors?|investments?|backed|turnover|assets|aum|grants?|budget|sales of"
+)
+_COMPANY_BEFORE_RE = re.compile(rf"\b(?:{_COMPANY_FIGURE})\b[^.;\n]{{0,40}}$", re.IGNORECASE)
+_COMPANY_AFTER_RE = re.compile(rf"^[^.;\n]{{0,25}}\b(?:{_COMPANY_FIGURE})\b", re.IGNORECASE)
+# Words that mark an amount as the pay for the role
+_PAY_CUE_RE = re.compile(
+    r"\b(?:salary|salaries|pay|paying|compensation|comp|base|ote|wages?|rate|range|earn(?:ing)?s?|stipend|ctc)\b"
+    r"[^.;\n]{0,40}$",
+    re.IGNORECASE
+)
+_CONTEXT = 60
+# Indian postings quote CTC in lakhs per annum: "12-18 LPA", "10 lakhs"
+_LAKH_RE = re.compile(
+    rf"\b(?P<low>\d+(?:\.\d+)?)(?:{_RANGE_SEP}(?P<high>\d+(?:\.\d+)?))?\s*(?:LPA|lakhs?|lacs?)\b",
+    re.IGNORECASE
+)
+_PERIODS = {
+    "hour": SalaryPeriod.HOUR, "hr": SalaryPeriod.HOUR, "hourly": SalaryPeriod.HOUR,
+    "day": SalaryPeriod.DAY, "daily": SalaryPeriod.DAY,
+    "week": SalaryPeriod.WEEK, "wk": SalaryPeriod.WEEK, "weekly": SalaryPeriod.WEEK,
+    "month": SalaryPeriod.MONTH, "mo": SalaryPeriod.MONTH, "monthly": SalaryPeriod.MONTH,
+    "year": SalaryPeriod.YEAR, "yr": SalaryPeriod.YEAR, "annum": SalaryPeriod.YEAR,
+    "annually": SalaryPeriod.YEAR, "yearly": SalaryPeriod.YEAR, "pa": SalaryPeriod.YEAR,
+}
+
+_WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "twelve": 12, "fifteen": 15,
+}
+_YEARS_NUMBER = r"(?:\d{1,2}|" + "|".join(_WORD_NUMBERS) + ")"
+_YEARS = r"\s*(?:years?|yrs?)\b"
+# Only count year figures that are about experience
+_EXPERIENCE_CONTEXT = r"(?=[^.;\n]{0,60}\b(?:experience|exp)\b)"
+_YEARS_RANGE_RE = re.compile(
+    rf"\b(?P<low>{_YEARS_NUMBER}){_RANGE_SEP}(?P<high>{_YEARS_NUMBER})\s*\+?{_YEARS}", re.IGNORECASE
+)
+_YEARS_PLUS_RE = re.compile(rf"\b(?P<low>{_YEARS_NUMBER})\s*\+{_YEARS}", re.IGNORECASE)
+_YEARS_MIN_RE = re.compile(
+    rf"\b(?:at least|minimum(?: of)?|min\.?|over|more than)\s+(?P<low>{_YEARS_NUMBER}){_YEARS}", re.IGNORECASE
+)
+_YEARS_PLAIN_RE = re.compile(rf"\b(?P<low>{_YEARS_NUMBER}){_YEARS}{_EXPERIENCE_CONTEXT}", re.IGNORECASE)
+MAX_EXPERIENCE_YEARS = 30
+
+
+def _compile(rules: List[Tuple[Any, str]]) -> List[Tuple[Any, re.Pattern]]:
+    """Word-bounded, case-insensitive patterns ("mid" must not match "midnight" or "amid")."""
+    return [(value, re.compile(rf"\b(?:{pattern})(?![\w-])", re.IGNORECASE)) for value, pattern in rules]
+
+
+# Checked against the title first, then the description; first hit wins
+_TITLE_SENIORITY = _compile([
+    (Seniority.INTERN, r"intern(?:ship)?|trainee"),
+    (Seniority.EXECUTIVE, r"chief|cto|ceo|vp|vice president|head of|director"),
+    (Seniority.PRINCIPAL, r"principal|staff|distinguished|architect"),
+    # People managers only: a product or account manager is not a lead
+    (Seniority.LEAD, r"lead|(?:engineering|software|development|delivery|team|people) manager|manager of engineering"),
+    (Seniority.SENIOR, r"senior|sr\.?|snr"),
+    (Seniority.JUNIOR, r"junior|jr\.?|graduate|entry[- ]level"),
+    (Seniority.MID, r"mid[- ]?level|intermediate"),
+])
+_TEXT_SENIORITY = _compile([
+    (Seniority.INTERN, r"internship"),
+    (Seniority.SENIOR, r"senior[- ]level|senior (?:engineer|developer|role|position)"),
+    (Seniority.JUNIOR, r"entry[- ]level|junior (?:engineer|developer|role|position)|new grad(?:uate)?s?"),
+    (Seniority.MID, r"mid[- ]level|intermediate[- ]level"),
+])
+
+_ONSITE = r"on[- ]?site|in[- ]office|office[- ]based"
+# Negated remote and firm on-site requirements are checked before "remote",
+# so "No remote work. Must be on-site." is onsite; the plain on-site cue comes
+# last so "Remote, with occasional on-site visits" stays remote
+_WORK_MODES = _compile([
+    (WorkMode.HYBRID, r"hybrid"),
+    (WorkMode.ONSITE, (
+        r"(?:no|not|non)[- ](?:an? )?remote|remote (?:work(?:ing)? )?(?:is )?not (?:possible|available|offered|an option)|"
+        rf"(?:must|required to|need to|expected to) (?:be|work) (?:fully )?(?:{_ONSITE}|in the office)|"
+        rf"(?:100%|fully|entirely) (?:{_ONSITE})|(?:{_ONSITE})(?: role| position)? only|no (?:wfh|work from home)"
+    )),
+    (WorkMode.REMOTE, (
+        r"remote(?! (?:sensing|monitoring|control|patient|access|desktop|procedures?|operated))|"
+        r"work from home|wfh|fully distributed|work from anywhere"
+    )),
+    (WorkMode.ONSITE, _ONSITE),
+])
+
+_EMPLOYMENT_TYPES = _compile([
+    (EmploymentType.INTERNSHIP, r"internship|intern"),
+    (EmploymentType.PART_TIME, r"part[- ]time"),
+    (EmploymentType.CONTRACT, r"contract(?:or)?|fixed[- ]term|c2h|contract[- ]to[- ]hire"),
+    (EmploymentType.TEMPORARY, r"temporary|temp"),
+    (EmploymentType.FREELANCE, r"freelance"),
+    (EmploymentType.FULL_TIME, r"full[- ]time|permanent"),
+])
+# Adzuna's contract_time / contract_type values
+_SOURCE_EMPLOYMENT_TYPES = {
+    "full_time": EmploymentType.FULL_TIME, "part_time": EmploymentType.PART_TIME,
+    "contract": EmploymentType.CONTRACT, "permanent": EmploymentType.FULL_TIME,
+}
+
+
+def _first(rules: List[Tuple[Any, re.Pattern]], *texts: Optional[str]) -> Optional[str]:
+    for text in texts:
+        if text:
+            for value, pattern in rules:
+                if pattern.search(text):
+                    return value.value
+    return None
+
+
+def _amount(number: str, multiplier: Optional[str]) -> float:
+    if re.fullmatch(_GROUPED, number):
+        value = float(re.sub(r"[,.]", "", number))
+    else:
+        value = float(number)
+    if multiplier:
+        value *= 1_000_000 if multiplier.lower() == "m" else 1_000
+    return value
+
+
+def _currency(marker: str) -> str:
+    marker = marker.lower().replace(" ", "")
+    return _SYMBOLS.get(marker, marker.upper())
+
+
+def _salary(match: re.Match) -> Dict[str, Any]:
+    high_mult = match.group("high_mult")
+    low = _amount(match.group("low"), match.group("low_mult"))
+    if match.group("high") and not match.group("low_mult") and high_mult and low < 1000:
+        # "$80-100k": the multiplier applies to both ends
+        low = _amount(match.group("low"), high_mult)
+    high = _amount(match.group("high"), high_mult) if match.group("high") else low
+    period_word = (match.group("per") or match.group("adverb") or "").lower().replace(".", "").replace(" ", "")
+    period = _PERIODS.get(period_word)
+    if period is None:
+        # No stated period: small figures are hourly rates
+        period = SalaryPeriod.HOUR if high < 500 else SalaryPeriod.YEAR
+    if low < 1:
+        return {}
+    return {
+        "salary_min": min(low, high),
+        "salary_max": max(low, high),
+        "salary_currency": _currency(match.group("code") or match.groupdict().get("cur")),
+        "salary_period": period.value,
+    }
+
+
+def _is_company_figure(text: str, match: re.Match) -> bool:
+    """Millions, or an amount next to funding/revenue words: not a salary."""
+    if any((match.group(name) or "").lower() == "m" for name in ("low_mult", "high_mult")):
+        return True
+    before = text[max(0, match.start() - _CONTEXT):match.start()]
+    return bool(_COMPANY_BEFORE_RE.search(before) or _COMPANY_AFTER_RE.search(text[match.end():match.end() + _CONTEXT]))
+
+
+def extract_salary(text: Optional[str]) -> Dict[str, Any]:
+    """
+    Salary in the text: salary_min/max, currency (ISO code) and period.
+    Funding and revenue figures are skipped; an amount introduced by a pay
+    word ("Salary: ...", "Pay $30/hour") wins over the first one mentioned.
+    """
+    if not text:
+        return {}
+    candidates = [
+        match
+        for pattern in (_SALARY_RE, _SALARY_CODE_AFTER_RE)
+        for match in pattern.finditer(text)
+        if not _is_company_figure(text, match)
+    ]
+    cued = sorted(
+        (match for match in candidates if _PAY_CUE_RE.search(text[max(0, match.start() - _CONTEXT):match.start()])),
+        key=lambda match: match.start()
+    )
+    for match in cued + candidates:
+        salary = _salary(match)
+        if salary:
+            return salary
+    match = _LAKH_RE.search(text)
+    if match:
+        low = float(match.group("low")) * 100_000
+        high = float(match.group("high")) * 100_000 if match.group("high") else low
+        return {
+            "salary_min": min(low, high),
+            "salary_max": max(low, high),
+            "salary_currency": "INR",
+            "salary_period": SalaryPeriod.YEAR.value,
+        }
+    return {}
+
+
+def _years(value: str) -> int:
+    return int(value) if value.isdigit() else _WORD_NUMBERS[value.lower()]
+
+
+def extract_experience(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Required years of experience as (min, max). With several requirements
+    ("3+ years of Python, 5+ years overall") the largest minimum wins.
+    """
+    if not text:
+        return None, None
+    lows: List[int] = []
+    highs: List[int] = []
+    ranges: List[Tuple[int, int]] = []
+    for match in _YEARS_RANGE_RE.finditer(text):
+        low, high = _years(match.group("low")), _years(match.group("high"))
+        if low <= high <= MAX_EXPERIENCE_YEARS:
+            lows.append(low)
+            highs.append(high)
+            ranges.append(match.span())
+    for pattern in (_YEARS_PLUS_RE, _YEARS_MIN_RE, _YEARS_PLAIN_RE):
+        for match in pattern.finditer(text):
+            # The upper end of "2-4 years" is not a separate minimum
+            if any(start <= match.start("low") < end for start, end in ranges):
+                continue
+            years = _years(match.group("low"))
+            if years <= MAX_EXPERIENCE_YEARS:
+                lows.append(years)
+    if not lows:
+        return None, None
+    low = max(lows)
+    high = max(highs) if highs and max(highs) >= low else None
+    return low, high
+
+
+def _seniority_from_years(years: Optional[int]) -> Optional[str]:
+    if years is None:
+        return None
+    if years < 2:
+        return Seniority.JUNIOR.value
+    if years < 5:
+        return Seniority.MID.value
+    if years < 8:
+        return Seniority.SENIOR.value
+    return Seniority.LEAD.value
+
+
+def extract_job_attributes(
+    text: Optional[str],
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    structured: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Typed attributes of a posting, keyed by jobs column (ATTRIBUTE_COLUMNS).
+
+    Args:
+        text: Description
+        title: Job title (seniority is read from it first)
+        location: Location string ("Remote", "London (Hybrid)")
+        structured: Values the source already provided (salary_min,
+            salary_max, salary_currency, salary_period, contract_type,
+            contract_time); these win over text extraction
+
+    Returns:
+        Dict with every ATTRIBUTE_COLUMNS key; None where nothing was found
+    """
+    structured = structured or {}
+    attributes: Dict[str, Any] = dict.fromkeys(ATTRIBUTE_COLUMNS)
+
+    if structured.get("salary_min") or structured.get("salary_max"):
+        low = structured.get("salary_min") or structured.get("salary_max")
+        high = structured.get("salary_max") or low
+        attributes.update(
+            salary_min=float(low),
+            salary_max=float(high),
+            salary_currency=structured.get("salary_currency"),
+            salary_period=structured.get("salary_period") or SalaryPeriod.YEAR.value,
+        )
+    else:
+        attributes.update(extract_salary(text))
+
+    low, high = extract_experience(text)
+    attributes["experience_min_years"] = low
+    attributes["experience_max_years"] = high
+
+    attributes["seniority_level"] = (
+        _first(_TITLE_SENIORITY, title)
+        or _first(_TEXT_SENIORITY, text)
+        or _seniority_from_years(low)
+    )
+    attributes["work_mode"] = _first(_WORK_MODES, location, title, text)
+
+    # A contract is more specific than full/part time, which beats "permanent"
+    contract_type, contract_time = structured.get("contract_type"), structured.get("contract_time")
+    source_type = next(
+        (_SOURCE_EMPLOYMENT_TYPES[value] for value in (
+            contract_type if contract_type == "contract" else None, contract_time, contract_type
+        ) if value in _SOURCE_EMPLOYMENT_TYPES),
+        None
+    )
+    attributes["employment_type"] = source_type.value if source_type else _first(_EMPLOYMENT_TYPES, title, text)
+    return attributes
+
+
+def refresh_job_attributes(job: Any, text: Optional[str]) -> Dict[str, Any]:
+    """
+    Attribute columns for a stored job whose description changed: values
+    already on the row (typically source-provided) are kept, the rest are
+    extracted from the new text.
+
+    Args:
+        job: Row or object with title, location and the ATTRIBUTE_COLUMNS
+    """
+    stored = {name: getattr(job, name, None) for name in ATTRIBUTE_COLUMNS}
+    extracted = extract_job_attributes(text, getattr(job, "title", None), getattr(job, "location", None), structured=stored)
+    return {name: stored[name] if stored[name] is not None else extracted[name] for name in ATTRIBUTE_COLUMNS}
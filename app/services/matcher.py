@@ -1,24 +1,356 @@
-from typing import Dict, List
+"""
+Resume/job match scoring over the skill taxonomy.
+
+Resumes and jobs are encoded over one column per taxonomy skill. A score is
+the weighted share of a job's skills that the resume covers. All jobs are
+kept in one in-process sparse matrix (a job lists a handful of the taxonomy's
+skills), so re-ranking the whole jobs table for a new resume is a single
+sparse matrix-vector product.
+
+Live ranking (rank) weighs rarer skills more, by IDF over the indexed jobs.
+Those weights move with every scrape, so scores that are stored (match_scores
+and jobs.match_score) count every skill the same: a stored score only depends
+on the job and the resume, and rows written at different times compare.
+match_scores rows are only computed for jobs a resume has not been scored
+against yet, or for all jobs when the resume or the scorer changed.
+"""
+import hashlib
+import itertools
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.skills import SkillTaxonomy, skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Score for a job with no recognizable skills
+NEUTRAL_SCORE = 50.0
+
+# Bump when scoring changes; stored match_scores from older versions get recomputed
+MATCH_SCORER_VERSION = "2"
+
+
+class SkillMatrix:
+    """
+    Sparse job x skill matrix in CSR form: the sorted skill columns of row i
+    are indices[indptr[i]:indptr[i + 1]]. Instances are not modified in
+    place; appends and updates return a new matrix.
+    """
+
+    def __init__(self, width: int, indptr: Optional[np.ndarray] = None, indices: Optional[np.ndarray] = None):
+        self.width = width
+        self.indptr = np.zeros(1, dtype=np.int64) if indptr is None else indptr
+        self.indices = np.empty(0, dtype=np.int32) if indices is None else indices
+
+    @classmethod
+    def from_rows(cls, width: int, rows: Sequence[Sequence[int]]) -> "SkillMatrix":
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        indptr = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths)])
+        indices = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int32, count=int(indptr[-1]))
+        return cls(width, indptr, indices)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def _entry_rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.indptr))
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix-vector product, touching only the stored entries."""
+        return np.bincount(self._entry_rows(), weights=vector[self.indices], minlength=len(self))
+
+    def column_counts(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.width)
+
+    def vstack(self, other: "SkillMatrix") -> "SkillMatrix":
+        return SkillMatrix(
+            self.width,
+            np.concatenate([self.indptr, other.indptr[1:] + self.indptr[-1]]),
+            np.concatenate([self.indices, other.indices])
+        )
+
+    def take(self, rows: Sequence[int]) -> "SkillMatrix":
+        """The given rows, in order, as a new matrix."""
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = np.diff(self.indptr)[rows]
+        indptr = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths)])
+        positions = np.repeat(self.indptr[rows] - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return SkillMatrix(self.width, indptr, self.indices[positions])
+
+    def with_rows(self, updates: Dict[int, Sequence[int]]) -> "SkillMatrix":
+        """A copy with the given rows' columns replaced."""
+        updated = np.fromiter(updates, dtype=np.int64, count=len(updates))
+        entry_rows = self._entry_rows()
+        keep = ~np.isin(entry_rows, updated)
+        replacement = SkillMatrix.from_rows(self.width, list(updates.values()))
+        entry_rows = np.concatenate([entry_rows[keep], np.repeat(updated, np.diff(replacement.indptr))])
+        indices = np.concatenate([self.indices[keep], replacement.indices])
+        # Stable: each row's columns stay sorted
+        order = np.argsort(entry_rows, kind="stable")
+        indptr = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(np.bincount(entry_rows, minlength=len(self)))])
+        return SkillMatrix(self.width, indptr, indices[order])
+
 
 class Matcher:
+    def __init__(self, taxonomy: SkillTaxonomy = skill_taxonomy):
+        self.taxonomy = taxonomy
+        self._names = sorted(taxonomy.categories)
+        self._columns = {name: column for column, name in enumerate(self._names)}
+        self._weights = np.ones(len(self._columns), dtype=np.float32)
+
+        # Skill matrix of every job seen so far, row i belonging to _ids[i]
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = SkillMatrix(len(self._columns))
+        self._rows: Dict[int, int] = {}
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean vector of the taxonomy skills in the list (others are ignored)."""
+        vector = np.zeros(len(self._columns), dtype=bool)
+        columns = [self._columns[skill] for skill in skills if skill in self._columns]
+        vector[columns] = True
+        return vector
+
+    def columns(self, skills: Iterable[str]) -> List[int]:
+        """Sorted taxonomy columns of the skills in the list (others are ignored)."""
+        return sorted({self._columns[skill] for skill in skills if skill in self._columns})
+
+    def encode_many(self, skill_lists: Sequence[Iterable[str]]) -> SkillMatrix:
+        return SkillMatrix.from_rows(len(self._columns), [self.columns(skills) for skills in skill_lists])
+
+    def job_skills(self, job_data: Dict) -> List[str]:
+        """
+        Skills of a job: its parsed skills if it has been parsed, otherwise
+        whatever the taxonomy finds in its title and description.
+        """
+        parsed = job_data.get("parsed_json") if "parsed_json" in job_data else job_data
+        if isinstance(parsed, dict) and parsed.get("skills"):
+            return [skill for skill in parsed["skills"] if skill != "General"]
+        return self.taxonomy.extract(f"{job_data.get('title') or ''}\n{job_data.get('raw_text') or ''}")
+
+    def score_matrix(
+        self,
+        resume_skills: Iterable[str],
+        job_matrix: SkillMatrix,
+        weights: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Scores (0-100) of every row of a job skill matrix against the resume.
+        Every skill counts the same unless per-column weights are given.
+        """
+        resume = self.encode(resume_skills)
+        if weights is None:
+            weights = np.ones(len(self._columns), dtype=np.float32)
+        required = job_matrix.dot(weights)
+        covered = job_matrix.dot(weights * resume)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(required > 0, 100.0 * covered / required, NEUTRAL_SCORE)
+        return np.round(scores.astype(np.float64), 1)
+
+    def score_jobs(self, resume_text: str, jobs: Sequence[Dict]) -> List[float]:
+        """Scores for a batch of job dicts (rows or parsed descriptions), in order."""
+        if not jobs:
+            return []
+        matrix = self.encode_many([self.job_skills(job) for job in jobs])
+        return self.score_matrix(self.taxonomy.extract(resume_text), matrix).tolist()
+
     def compute_match_score(self, resume_text: str, job_data: Dict) -> int:
         """
         Compute a match score (0-100) between resume and job.
         """
-        # Simple keyword matching for now
-        score = 0
-        max_score = 100
-        
-        skills = job_data.get("skills", [])
-        if not skills:
-            return 50 # Default if no skills parsed
-            
-        matched_skills = [skill for skill in skills if skill.lower() in resume_text.lower()]
-        
-        if len(skills) > 0:
-            score = int((len(matched_skills) / len(skills)) * 100)
-        
-        # Cap at 100
-        return min(score, 100)
+        return int(self.score_jobs(resume_text, [job_data])[0])
+
+    def refresh(self, db) -> int:
+        """
+        Add jobs stored since the last refresh to the in-process skill matrix
+        and recompute skill weights. Returns the number of jobs added.
+        """
+        from app.models import Job
+
+        rows = db.query(Job.id, Job.title, Job.raw_text, Job.parsed_json).filter(
+            Job.id > self._last_id
+        ).order_by(Job.id).all()
+        if not rows:
+            return 0
+        matrix = self.encode_many([self.job_skills(row._asdict()) for row in rows])
+        with self._lock:
+            start = len(self._ids)
+            self._ids = np.concatenate([self._ids, np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))])
+            self._matrix = self._matrix.vstack(matrix)
+            self._rows.update((row.id, start + offset) for offset, row in enumerate(rows))
+            self._last_id = rows[-1].id
+            self._reweight()
+        return len(rows)
+
+    def update_jobs(self, skills_by_id: Dict[int, Iterable[str]]):
+        """Re-encode jobs whose skills changed (e.g. after enrichment re-parsed them)."""
+        with self._lock:
+            updates = {
+                self._rows[job_id]: self.columns(skills)
+                for job_id, skills in skills_by_id.items() if job_id in self._rows
+            }
+            if updates:
+                self._matrix = self._matrix.with_rows(updates)
+
+    def reset(self):
+        """Drop the skill matrix (jobs were deleted); the next refresh rebuilds it."""
+        with self._lock:
+            self._ids = np.empty(0, dtype=np.int64)
+            self._matrix = SkillMatrix(len(self._columns))
+            self._rows = {}
+            self._last_id = 0
+            self._weights = np.ones(len(self._columns), dtype=np.float32)
+
+    def _reweight(self):
+        # Smoothed IDF: a skill every job asks for says little about fit
+        document_frequency = self._matrix.column_counts()
+        self._weights = (np.log((1 + len(self._matrix)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def rank(self, db, resume_text: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Score every stored job against the resume, rarer skills weighing more.
+
+        Returns:
+            (job id, score) pairs, best first
+        """
+        self.refresh(db)
+        with self._lock:
+            ids, matrix, weights = self._ids, self._matrix, self._weights
+        scores = self.score_matrix(self.taxonomy.extract(resume_text), matrix, weights)
+        if limit is not None and limit < len(scores):
+            top = np.argpartition(-scores, limit)[:limit]
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        return list(zip(ids[order].tolist(), scores[order].tolist()))
+
+    def sync_scores(self, resume_ids: Optional[Sequence[int]] = None, batch_size: int = 5000) -> int:
+        """
+        Bring match_scores up to date for resumes (every base resume by
+        default). Only jobs without a score for a resume are scored, unless
+        the resume's content or MATCH_SCORER_VERSION changed since its rows
+        were written, in which case all its rows are recomputed.
+
+        Returns:
+            Number of scores written
+        """
+        from app.database import SessionLocal
+        from app.models import Resume
+
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+            query = db.query(Resume.id, Resume.user_id, Resume.content)
+            if resume_ids is not None:
+                query = query.filter(Resume.id.in_(list(resume_ids)))
+            else:
+                query = query.filter(Resume.is_base == True)
+            written = 0
+            for resume in query.all():
+                written += self._sync_resume(db, resume, batch_size)
+            db.commit()
+            if written:
+                logger.info(f"Wrote {written} match scores")
+            return written
+        except Exception as e:
+            logger.error(f"Error syncing match scores: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def _sync_resume(self, db, resume, batch_size: int) -> int:
+        from sqlalchemy import and_, or_
+        from app.models import Job, MatchScore
+
+        resume_hash = hashlib.sha256((resume.content or "").encode("utf-8")).hexdigest()
+        stale = db.query(MatchScore.id).filter(
+            MatchScore.resume_id == resume.id,
+            or_(MatchScore.resume_hash != resume_hash, MatchScore.scorer_version != MATCH_SCORER_VERSION)
+        ).first()
+        if stale is not None:
+            query = db.query(Job.id)
+        else:
+            # Anti-join: jobs stored (or re-parsed) since this resume was last scored
+            query = db.query(Job.id).outerjoin(
+                MatchScore, and_(MatchScore.job_id == Job.id, MatchScore.resume_id == resume.id)
+            ).filter(MatchScore.id.is_(None))
+        job_ids = [job_id for (job_id,) in query]
+        with self._lock:
+            rows = [self._rows[job_id] for job_id in job_ids if job_id in self._rows]
+            ids, matrix = self._ids[rows], self._matrix.take(rows)
+        if not rows:
+            return 0
+
+        resume_skills = self.taxonomy.extract(resume.content)
+        resume_vector = self.encode(resume_skills)
+        scores = self.score_matrix(resume_skills, matrix)
+        now = datetime.utcnow()
+        values = []
+        for row, (job_id, score) in enumerate(zip(ids.tolist(), scores.tolist())):
+            columns = matrix.row(row)
+            matched = [self._names[column] for column in columns[resume_vector[columns]]]
+            missing = [self._names[column] for column in columns[~resume_vector[columns]]]
+            values.append({
+                "job_id": job_id,
+                "resume_id": resume.id,
+                "user_id": resume.user_id,
+                "total_score": score,
+                "matched_skills": matched,
+                "missing_skills": missing,
+                "match_breakdown": {"skills": score, "matched": len(matched), "required": len(matched) + len(missing)},
+                "scorer_version": MATCH_SCORER_VERSION,
+                "resume_hash": resume_hash,
+                "calculated_at": now
+            })
+        for start in range(0, len(values), batch_size):
+            self._upsert_scores(db, values[start:start + batch_size])
+        return len(values)
+
+    @staticmethod
+    def _upsert_scores(db, values: List[Dict]):
+        from app.models import MatchScore
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            statement = dialect_insert(MatchScore)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[MatchScore.job_id, MatchScore.resume_id],
+                set_={
+                    name: statement.excluded[name] for name in (
+                        "user_id", "total_score", "matched_skills", "missing_skills",
+                        "match_breakdown", "scorer_version", "resume_hash", "calculated_at"
+                    )
+                }
+            ), values)
+        else:
+            from sqlalchemy import insert, tuple_
+            db.query(MatchScore).filter(
+                tuple_(MatchScore.job_id, MatchScore.resume_id).in_([(row["job_id"], row["resume_id"]) for row in values])
+            ).delete(synchronize_session=False)
+            db.execute(insert(MatchScore), values)
+
+
+def base_resume_text(db) -> Optional[str]:
+    """Content of the most recent base resume, if any."""
+    from app.models import Resume
+
+    resume = db.query(Resume.content).filter(Resume.is_base == True).order_by(
+        Resume.created_at.desc()
+    ).first()
+    return resume.content if resume else None
+
 
 matcher_service = Matcher()
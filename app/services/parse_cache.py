@@ -0,0 +1,187 @@
+"""
+Content-addressed cache of job description parses.
+
+Keys are SHA256 of (parser name, parser version, whitespace-normalized text),
+so the same posting seen by a scrape, the parse_jd tool and the agent's LLM
+parser is only parsed once per parser, and bumping a parser's version
+invalidates its old entries without touching anything else. Lookups go to an
+in-process LRU first, then the parse_cache table.
+"""
+import copy
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse spaces within lines and drop blank lines; line breaks are kept (parsers use them)."""
+    lines = (" ".join(line.split()) for line in (text or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(parser: str, version: str, text: str) -> str:
+        payload = f"{parser}\0{version}\0{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, result: Any):
+        with self._lock:
+            self._lru[key] = result
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return self._lru[key]
+        return None
+
+    def get_many(self, parser: str, version: str, texts: Iterable[str], db=None) -> Dict[str, Any]:
+        """
+        Cached results for the texts that have one.
+
+        Args:
+            db: Session to read on (see put_many); by default a short-lived one
+
+        Returns:
+            Text mapped to its cached result; misses are absent
+        """
+        from app.database import SessionLocal
+        from app.models import ParseCacheEntry
+
+        keys = {text: self.key_for(parser, version, text) for text in texts}
+        found: Dict[str, Any] = {}
+        missing: Dict[str, List[str]] = {}
+        for text, key in keys.items():
+            result = self._recall(key)
+            if result is not None:
+                found[text] = copy.deepcopy(result)
+            else:
+                missing.setdefault(key, []).append(text)
+        if not missing:
+            return found
+
+        session = db or SessionLocal()
+        try:
+            with session.begin_nested() if db is not None else nullcontext():
+                rows = session.query(ParseCacheEntry.key, ParseCacheEntry.result).filter(
+                    ParseCacheEntry.key.in_(list(missing))
+                ).all()
+        except Exception as e:
+            logger.warning(f"Parse cache lookup failed: {e}")
+            rows = []
+        finally:
+            if db is None:
+                session.close()
+        for key, result in rows:
+            self._remember(key, result)
+            for text in missing[key]:
+                found[text] = copy.deepcopy(result)
+        return found
+
+    def put_many(self, parser: str, version: str, results: Dict[str, Any], db=None):
+        """
+        Store parse results (text -> result) in the LRU and the table.
+
+        Args:
+            db: Session to write on, inside the caller's transaction (which
+                the caller commits); a failed write only rolls back its own
+                savepoint. Pass it while that session holds uncommitted
+                writes: SQLite has a single writer, so a second session
+                would wait on the first until the busy timeout. By default
+                a session of our own is opened and committed.
+        """
+        from app.database import SessionLocal
+
+        rows = {}
+        for text, result in results.items():
+            key = self.key_for(parser, version, text)
+            # Callers may mutate what they got back; keep our own copy
+            self._remember(key, copy.deepcopy(result))
+            rows[key] = {"key": key, "parser": parser, "version": version, "result": result, "created_at": datetime.utcnow()}
+        if not rows:
+            return
+
+        if db is not None:
+            try:
+                with db.begin_nested():
+                    self._insert(db, rows)
+            except Exception as e:
+                logger.warning(f"Parse cache write failed: {e}")
+            return
+
+        db = SessionLocal()
+        try:
+            self._insert(db, rows)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Parse cache write failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _insert(db, rows: Dict[str, Dict[str, Any]]):
+        from sqlalchemy import insert
+        from app.models import ParseCacheEntry
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            # Another worker may have cached the same text meanwhile
+            db.execute(dialect_insert(ParseCacheEntry).on_conflict_do_nothing(index_elements=[ParseCacheEntry.key]), list(rows.values()))
+        else:
+            existing = {key for (key,) in db.query(ParseCacheEntry.key).filter(ParseCacheEntry.key.in_(list(rows)))}
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            if new_rows:
+                db.execute(insert(ParseCacheEntry), new_rows)
+
+    def get_or_parse(self, parser: str, version: str, text: str, parse: Callable[[str], Any]) -> Any:
+        """Cached result for the text, parsing (and caching) it on a miss."""
+        found = self.get_many(parser, version, [text])
+        if text in found:
+            return found[text]
+        result = parse(text)
+        self.put_many(parser, version, {text: result})
+        return result
+
+    def prune(self, parser: str, version: str) -> int:
+        """Delete a parser's entries from other versions. Returns rows deleted."""
+        from app.database import SessionLocal
+        from app.models import ParseCacheEntry
+
+        db = SessionLocal()
+        try:
+            deleted = db.query(ParseCacheEntry).filter(
+                ParseCacheEntry.parser == parser, ParseCacheEntry.version != version
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"Error pruning parse cache: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+
+parse_cache = ParseCache(settings.PARSE_CACHE_SIZE)
@@ -1,40 +1,199 @@
 from app.core.config import settings
+from app.services.job_attributes import ATTRIBUTE_COLUMNS, extract_job_attributes, refresh_job_attributes
+from app.services.parse_cache import parse_cache
+from app.services.skills import skill_taxonomy
+import asyncio
 import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever parse_job_description's output changes for the same text;
+# cached parses from older versions are then ignored
+PARSER_VERSION = "3"
+
+
+# Rough experience implied by a seniority level when no years are stated
+_SENIORITY_EXPERIENCE = {
+    "intern": "0-1 years",
+    "junior": "0-2 years",
+    "mid": "2-5 years",
+    "senior": "5+ years",
+    "lead": "8+ years",
+    "principal": "10+ years",
+    "executive": "10+ years",
+}
+
+
+def _experience_label(attributes: dict) -> str:
+    low, high = attributes["experience_min_years"], attributes["experience_max_years"]
+    if low is not None:
+        return f"{low}-{high} years" if high else f"{low}+ years"
+    return _SENIORITY_EXPERIENCE.get(attributes["seniority_level"], "Not specified")
+
+
+def _salary_label(attributes: dict) -> str:
+    if attributes["salary_min"] is None:
+        return "Not specified"
+    low, high = attributes["salary_min"], attributes["salary_max"]
+    amount = f"{low:,.0f}" if low == high else f"{low:,.0f}-{high:,.0f}"
+    currency = f"{attributes['salary_currency']} " if attributes["salary_currency"] else ""
+    return f"{currency}{amount} per {attributes['salary_period']}"
+
+
+def _parse_one(raw_text: str) -> dict:
+    """Process-pool entry point (must be importable at module level). Bypasses the cache."""
+    return parser_service._parse_uncached(raw_text or "")
+
 
 class JobParser:
     """Simple job description parser that works without LLM API keys"""
     
+    cache_name = "job_parser"
+    
+    def __init__(self, workers: Optional[int] = None, min_pool_batch: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        # Below this, pickling to worker processes costs more than it saves
+        self.min_pool_batch = min_pool_batch
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        # The taxonomy changes what gets extracted as much as the code does
+        return f"{PARSER_VERSION}+skills.{skill_taxonomy.version}"
+
     def parse_job_description(self, raw_text: str) -> dict:
+        """
+        Parse raw job description text into structured data, reusing a
+        cached parse of the same text when there is one.
+        """
+        return parse_cache.get_or_parse(self.cache_name, self.version, raw_text or "", self._parse_uncached)
+
+    def _parse_uncached(self, raw_text: str) -> dict:
         """
         Parse raw job description text into structured data.
-        Uses simple keyword extraction for now.
+        Skills come from the shared taxonomy, typed attributes from
+        app.services.job_attributes.
         """
-        # Simple keyword-based extraction
-        keywords = raw_text.lower()
+        # One pass over the text against the whole skill taxonomy
+        tech_skills = skill_taxonomy.extract(raw_text)
         
-        # Common tech skills to look for
-        tech_skills = []
-        skill_keywords = ['python', 'javascript', 'react', 'fastapi', 'node', 'sql', 'mongodb', 
-                         'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'java', 'c++', 'golang']
-        
-        for skill in skill_keywords:
-            if skill in keywords:
-                tech_skills.append(skill.title())
-        
-        # Extract experience (simple pattern matching)
-        experience = "Not specified"
-        if "senior" in keywords:
-            experience = "5+ years"
-        elif "junior" in keywords or "entry" in keywords:
-            experience = "0-2 years"
-        elif "mid" in keywords or "intermediate" in keywords:
-            experience = "2-5 years"
+        # Typed salary / experience / seniority / work mode / employment type
+        attributes = extract_job_attributes(raw_text)
         
         return {
             "skills": tech_skills if tech_skills else ["General"],
-            "experience": experience,
-            "salary": "Not specified",
-            "summary": raw_text[:200] + "..." if len(raw_text) > 200 else raw_text
+            "experience": _experience_label(attributes),
+            "salary": _salary_label(attributes),
+            "summary": raw_text[:200] + "..." if len(raw_text) > 200 else raw_text,
+            **attributes
         }
 
-parser_service = JobParser()
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned (not forked) workers: the API process runs threads
+                # (scheduler, event loop) that fork would copy mid-flight
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def parse_many(self, raw_texts: List[str], db=None) -> List[dict]:
+        """
+        Parse a batch of descriptions, in order. Cached parses are reused;
+        of the rest, large batches are spread over a process pool and small
+        ones are parsed inline.
+
+        Args:
+            db: Session the parse cache reads and writes on; pass the
+                ingesting session when called mid-ingest (an ingest
+                prepare hook), see ParseCache.put_many
+        """
+        raw_texts = [text or "" for text in raw_texts]
+        results = parse_cache.get_many(self.cache_name, self.version, raw_texts, db=db)
+        misses = [text for text in dict.fromkeys(raw_texts) if text not in results]
+        if misses:
+            parsed = dict(zip(misses, self._parse_batch(misses)))
+            parse_cache.put_many(self.cache_name, self.version, parsed, db=db)
+            results.update(parsed)
+        return [results[text] for text in raw_texts]
+
+    def _parse_batch(self, raw_texts: List[str]) -> List[dict]:
+        if len(raw_texts) < self.min_pool_batch or self.workers < 2:
+            return [_parse_one(text) for text in raw_texts]
+        chunksize = max(1, len(raw_texts) // (self.workers * 4))
+        try:
+            return list(self._executor().map(_parse_one, raw_texts, chunksize=chunksize))
+        except Exception as e:
+            logger.warning(f"Parse pool failed ({e}); parsing inline")
+            return [_parse_one(text) for text in raw_texts]
+
+    async def parse_many_async(self, raw_texts: List[str]) -> List[dict]:
+        """parse_many without blocking the event loop."""
+        return await asyncio.to_thread(self.parse_many, raw_texts)
+
+    def backfill(self, only_missing: bool = True, batch_size: int = 2000) -> int:
+        """
+        Re-parse stored jobs' raw_text in batches across the process pool,
+        filling the structured attribute columns along the way.
+
+        Args:
+            only_missing: Skip jobs that already have parsed_json
+            batch_size: Jobs read, parsed and written per round-trip
+
+        Returns:
+            Number of jobs parsed
+        """
+        from sqlalchemy import String, cast, or_, update
+        from app.database import SessionLocal
+        from app.models import Job
+
+        db = SessionLocal()
+        parsed_count = 0
+        last_id = 0
+        try:
+            while True:
+                query = db.query(
+                    Job.id, Job.raw_text, Job.title, Job.location,
+                    *(getattr(Job, name) for name in ATTRIBUTE_COLUMNS)
+                ).filter(
+                    Job.id > last_id, Job.raw_text.isnot(None), Job.raw_text != ""
+                )
+                if only_missing:
+                    # JSON columns store a Python None as the JSON literal null
+                    query = query.filter(or_(Job.parsed_json.is_(None), cast(Job.parsed_json, String) == "null"))
+                rows = query.order_by(Job.id).limit(batch_size).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                parsed = self.parse_many([row.raw_text for row in rows])
+                db.execute(update(Job), [
+                    {"id": row.id, "parsed_json": result, **refresh_job_attributes(row, row.raw_text)}
+                    for row, result in zip(rows, parsed)
+                ])
+                db.commit()
+                parsed_count += len(rows)
+                logger.info(f"Backfilled parsed_json for {parsed_count} jobs")
+            return parsed_count
+        except Exception as e:
+            logger.error(f"Error backfilling parsed jobs: {e}")
+            db.rollback()
+            return parsed_count
+        finally:
+            db.close()
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+parser_service = JobParser(workers=settings.PARSE_WORKERS, min_pool_batch=settings.PARSE_POOL_MIN_BATCH)
@@ -0,0 +1,168 @@
+"""
+Crawl politeness: robots.txt rules plus per-host rate limiting.
+
+Every outbound scrape request (httpx, requests or a Playwright navigation)
+calls `politeness.acquire(url)` first. It checks the host's robots.txt
+(cached with a TTL) when settings.RESPECT_ROBOTS_TXT is on, applies the
+site's Crawl-delay, and waits for the host's token bucket.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import requests
+
+from app.core.config import settings
+from app.services.rate_limiter import HostRateLimiter, host_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Documented public APIs we are explicitly allowed to call; robots.txt
+# governs crawling the sites, not these endpoints
+ROBOTS_EXEMPT_PREFIXES = (
+    "https://api.adzuna.com/",
+    "https://remoteok.com/api",
+)
+
+
+class RobotsDisallowedError(Exception):
+    """Raised when robots.txt forbids fetching a URL."""
+
+
+def _rules_from_response(status: Optional[int], text: str = "") -> RobotFileParser:
+    """
+    Build rules per RFC 9309: 4xx means no restrictions, 5xx or an
+    unreachable host means assume everything is disallowed for now.
+    """
+    rules = RobotFileParser()
+    if status is None or status >= 500:
+        rules.disallow_all = True
+    elif status >= 400:
+        rules.allow_all = True
+    else:
+        rules.parse(text.splitlines())
+    return rules
+
+
+class RobotsCache:
+    def __init__(self, user_agent: str, ttl: float = 86400, error_ttl: float = 300):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def origin_for(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    def _cached(self, origin: str) -> Optional[RobotFileParser]:
+        entry = self._entries.get(origin)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def _store(self, origin: str, status: Optional[int], text: str = "") -> RobotFileParser:
+        rules = _rules_from_response(status, text)
+        ttl = self.error_ttl if status is None or status >= 500 else self.ttl
+        self._entries[origin] = (rules, time.monotonic() + ttl)
+        return rules
+
+    async def get(self, url: str) -> RobotFileParser:
+        """Rules for the URL's origin, fetched at most once per TTL."""
+        origin = self.origin_for(url)
+        rules = self._cached(origin)
+        if rules:
+            return rules
+
+        # Concurrent callers on the same loop share one fetch
+        task = self._inflight.get(origin)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch(origin))
+            self._inflight[origin] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._inflight.get(origin) is task:
+                del self._inflight[origin]
+
+    async def _fetch(self, origin: str) -> RobotFileParser:
+        try:
+            async with httpx.AsyncClient(
+                timeout=10.0,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent}
+            ) as client:
+                response = await client.get(f"{origin}/robots.txt")
+            return self._store(origin, response.status_code, response.text)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            return self._store(origin, None)
+
+    def get_sync(self, url: str) -> RobotFileParser:
+        """Blocking variant of get for sync callers."""
+        origin = self.origin_for(url)
+        rules = self._cached(origin)
+        if rules:
+            return rules
+        try:
+            response = requests.get(f"{origin}/robots.txt", headers={"User-Agent": self.user_agent}, timeout=10)
+            return self._store(origin, response.status_code, response.text)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            return self._store(origin, None)
+
+
+class PolitenessGate:
+    def __init__(
+        self,
+        limiter: HostRateLimiter,
+        robots: RobotsCache,
+        respect_robots: bool = True,
+        user_agent: str = "*"
+    ):
+        self.limiter = limiter
+        self.robots = robots
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+
+    def host_for(self, url: str) -> str:
+        return self.limiter.host_for(url)
+
+    def _checks_robots(self, url: str) -> bool:
+        return self.respect_robots and not url.startswith(ROBOTS_EXEMPT_PREFIXES)
+
+    def _apply_rules(self, url: str, rules: RobotFileParser):
+        if not rules.can_fetch(self.user_agent, url):
+            raise RobotsDisallowedError(f"robots.txt disallows {url}")
+        self.limiter.set_crawl_delay(self.host_for(url), rules.crawl_delay(self.user_agent))
+
+    async def acquire(self, url: str):
+        """
+        Wait until the URL may be fetched.
+
+        Raises:
+            RobotsDisallowedError: robots.txt forbids the URL
+        """
+        if self._checks_robots(url):
+            self._apply_rules(url, await self.robots.get(url))
+        await self.limiter.acquire(url)
+
+    def acquire_sync(self, url: str):
+        """Blocking variant of acquire for sync callers."""
+        if self._checks_robots(url):
+            self._apply_rules(url, self.robots.get_sync(url))
+        self.limiter.acquire_sync(url)
+
+
+politeness = PolitenessGate(
+    host_rate_limiter,
+    RobotsCache(settings.USER_AGENT, ttl=settings.ROBOTS_CACHE_TTL_SECONDS),
+    respect_robots=settings.RESPECT_ROBOTS_TXT,
+    user_agent=settings.USER_AGENT
+)
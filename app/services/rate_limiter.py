@@ -0,0 +1,94 @@
+"""Per-host rate limiting for outbound HTTP requests."""
+import asyncio
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket: each host refills one token every `interval`
+    seconds and holds at most `burst` tokens. Different hosts proceed
+    concurrently, so overall concurrency can grow with the number of hosts
+    while any single host stays at its safe rate.
+
+    Implemented as a virtual schedule (GCRA) rather than a counter: callers
+    reserve the next conforming send time and sleep until it arrives, so N
+    concurrent callers against one host are spread `interval` apart (after
+    the initial burst) instead of being serialized behind a global sleep.
+    """
+
+    def __init__(self, default_interval: float = 1.0, intervals: Optional[Dict[str, float]] = None, burst: int = 1):
+        self.default_interval = default_interval
+        self.intervals = dict(intervals or {})
+        self.burst = max(1, burst)
+        # Crawl-delay from robots.txt; never go faster than this
+        self.crawl_delays: Dict[str, float] = {}
+        self._tat: Dict[str, float] = {}  # theoretical arrival time per host
+        # Slots are reserved from both the API event loop and the scheduler's
+        # worker thread, so the bookkeeping needs a (non-async) lock.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Return the lower-cased host of a URL."""
+        return (urlparse(url).hostname or url).lower()
+
+    def set_interval(self, host: str, interval: float):
+        """Override the minimum spacing between requests for a host."""
+        self.intervals[host.lower()] = interval
+
+    def set_crawl_delay(self, host: str, delay: Optional[float]):
+        """Apply (or clear) a host's robots.txt Crawl-delay."""
+        if delay:
+            self.crawl_delays[host.lower()] = float(delay)
+        else:
+            self.crawl_delays.pop(host.lower(), None)
+
+    def interval_for(self, host: str) -> float:
+        return max(self.intervals.get(host, self.default_interval), self.crawl_delays.get(host, 0.0))
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for the URL's host.
+
+        Returns:
+            Seconds the caller has to wait before sending the request
+        """
+        host = self.host_for(url)
+        interval = self.interval_for(host)
+        # A site that asks for a crawl delay gets no bursts
+        burst = 1 if host in self.crawl_delays else self.burst
+        with self._lock:
+            now = time.monotonic()
+            tat = max(now, self._tat.get(host, now))
+            send_at = max(now, tat - (burst - 1) * interval)
+            self._tat[host] = tat + interval
+        return send_at - now
+
+    async def acquire(self, url: str):
+        """Wait until a request to the URL's host is allowed."""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.debug(f"Rate limiting {self.host_for(url)}: waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, url: str):
+        """Blocking variant of acquire for sync callers."""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.debug(f"Rate limiting {self.host_for(url)}: waiting {delay:.2f}s")
+            time.sleep(delay)
+
+
+# Shared limiter so separate aggregators/services don't double up on a host
+host_rate_limiter = HostRateLimiter(
+    default_interval=settings.HOST_REQUEST_INTERVAL,
+    burst=settings.HOST_REQUEST_BURST
+)
@@ -0,0 +1,171 @@
+"""
+Per-(source, query, region) high-water marks for incremental scraping.
+
+Adapters receive a CursorState, use `since` to ask the source for recent
+postings only (where the source supports it), drop anything the cursor has
+already seen with `filter_new`, and record what they return with `observe`.
+The caller persists the cursor once the batch has been ingested.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+def parse_posted_date(value: Optional[Union[str, int, float, datetime]]) -> Optional[datetime]:
+    """
+    Parse a posting timestamp (ISO string, epoch seconds or datetime) into a
+    naive UTC datetime. Returns None if it can't be parsed.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = datetime.fromtimestamp(value, tz=timezone.utc)
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def days_since(since: Optional[datetime], now: Optional[datetime] = None) -> Optional[int]:
+    """Whole days covering `since`, for sources that filter by age in days."""
+    if not since:
+        return None
+    now = now or datetime.utcnow()
+    return max(1, (now - since).days + 1)
+
+
+def job_external_id(job: Dict[str, Any]) -> Optional[str]:
+    """Stable identifier for a scraped job: the source's id, else its URL."""
+    external_id = job.get("external_id") or job.get("url")
+    return str(external_id) if external_id else None
+
+
+@dataclass
+class CursorState:
+    """In-memory view of one scrape cursor."""
+    source: str
+    query: str
+    region: str
+    since: Optional[datetime] = None
+    seen_ids: Set[str] = field(default_factory=set)
+    newest: Optional[datetime] = None
+    # seen_ids in the order they were observed, so trimming keeps the newest
+    seen_order: List[str] = field(default_factory=list)
+    # Set when a run returned only part of what was new (see hold)
+    held: bool = False
+
+    def is_new(self, job: Dict[str, Any]) -> bool:
+        """True unless the job was already seen or predates the high-water mark."""
+        external_id = job_external_id(job)
+        if external_id and external_id in self.seen_ids:
+            return False
+        posted = parse_posted_date(job.get("posted_date"))
+        # Inclusive comparison: postings sharing the mark's timestamp are
+        # told apart by seen_ids above.
+        if self.since and posted and posted < self.since:
+            return False
+        return True
+
+    def filter_new(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [job for job in jobs if self.is_new(job)]
+
+    def observe(self, jobs: Iterable[Dict[str, Any]]):
+        """Record jobs returned by the adapter so the next run can skip them."""
+        for job in jobs:
+            external_id = job_external_id(job)
+            if external_id and external_id not in self.seen_ids:
+                self.seen_ids.add(external_id)
+                self.seen_order.append(external_id)
+            posted = parse_posted_date(job.get("posted_date"))
+            if posted and not self.held and (self.newest is None or posted > self.newest):
+                self.newest = posted
+
+    def hold(self):
+        """
+        Keep the stored high-water mark: the adapter stopped short (a limit)
+        with new jobs left over, which would otherwise fall behind the mark.
+        Next run starts from the old mark and seen_ids skips what was returned.
+        """
+        self.held = True
+        self.newest = self.since
+
+    def days_back(self) -> Optional[int]:
+        return days_since(self.since)
+
+
+class ScrapeCursorService:
+    # Ids kept per cursor; only needs to cover postings near the mark
+    MAX_SEEN_IDS = 500
+
+    @staticmethod
+    def _key(source: str, query: str, region: str):
+        return source.strip().lower(), query.strip().lower(), region.strip().lower()
+
+    def load(self, source: str, query: str, region: str) -> CursorState:
+        """Load the cursor for a source/query/region (empty if never scraped)."""
+        from app.database import SessionLocal
+        from app.models import ScrapeCursor
+
+        source, query, region = self._key(source, query, region)
+        db = SessionLocal()
+        try:
+            row = db.query(ScrapeCursor).filter(
+                ScrapeCursor.source == source,
+                ScrapeCursor.query == query,
+                ScrapeCursor.region == region
+            ).first()
+            if not row:
+                return CursorState(source, query, region)
+            seen_order = list(row.seen_ids or [])
+            return CursorState(
+                source, query, region,
+                since=row.last_posted_date,
+                seen_ids=set(seen_order),
+                newest=row.last_posted_date,
+                seen_order=seen_order
+            )
+        except Exception as e:
+            logger.error(f"Error loading scrape cursor for {source}: {e}")
+            return CursorState(source, query, region)
+        finally:
+            db.close()
+
+    def load_many(self, sources: Iterable[str], query: str, region: str) -> Dict[str, CursorState]:
+        return {source: self.load(source, query, region) for source in sources}
+
+    def save(self, cursors: Iterable[CursorState]):
+        """Persist observed high-water marks and seen ids."""
+        from app.database import SessionLocal
+        from app.models import ScrapeCursor
+
+        db = SessionLocal()
+        try:
+            for state in cursors:
+                row = db.query(ScrapeCursor).filter(
+                    ScrapeCursor.source == state.source,
+                    ScrapeCursor.query == state.query,
+                    ScrapeCursor.region == state.region
+                ).first()
+                if not row:
+                    row = ScrapeCursor(source=state.source, query=state.query, region=state.region)
+                    db.add(row)
+                row.last_posted_date = state.newest
+                row.seen_ids = state.seen_order[-self.MAX_SEEN_IDS:]
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving scrape cursors: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+scrape_cursor_service = ScrapeCursorService()
@@ -1,27 +1,35 @@
 import asyncio
-from typing import List, Dict
-from playwright.async_api import async_playwright
+from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+from app.services.browser_pool import browser_pool
+from app.services.politeness import politeness
+from app.services.scrape_cursor import CursorState
+from app.scrapers.playwright_scraper import indeed_job_key, scraper as playwright_scraper
 
 class JobScraper:
     def __init__(self):
-        self.headless = True
+        self.pool = browser_pool
 
-    async def scrape_indeed(self, role: str, region: str) -> List[Dict]:
+    async def scrape_indeed(self, role: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[Dict]:
         """
         Scrape jobs from Indeed (simulated/simplified for now).
         """
         jobs = []
         url = f"https://www.indeed.com/jobs?q={role}&l={region}"
+        if cursor and cursor.since:
+            url += f"&fromage={cursor.days_back()}"
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
-            
+        # Raises if robots.txt disallows the search page
+        await politeness.acquire(url)
+        async with self.pool.page(lean=True) as page:
             try:
                 # Note: Indeed has heavy anti-bot. This is a basic attempt.
                 # In a real production system, you'd use a scraping API or more advanced evasion.
-                await page.goto(url, timeout=30000)
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_selector('div.job_seen_beacon', timeout=10000)
+                except Exception:
+                    pass  # No cards yet; parse whatever rendered
                 content = await page.content()
                 soup = BeautifulSoup(content, 'html.parser')
                 
@@ -46,6 +54,7 @@ class JobScraper:
                                 "company": company,
                                 "location": location,
                                 "url": link,
+                                "external_id": indeed_job_key(link),
                                 "source": "indeed"
                             })
                     except Exception as e:
@@ -73,18 +82,38 @@ class JobScraper:
                             "source": "mock"
                         }
                     ]
-            finally:
-                await browser.close()
-                
+        
+        if cursor:
+            jobs = cursor.filter_new(jobs)
+        if limit is not None and len(jobs) > limit:
+            # Cut before observing, so dropped jobs stay new
+            jobs = jobs[:limit]
+            if cursor:
+                cursor.hold()
+        if cursor:
+            cursor.observe(jobs)
         return jobs
 
-    async def scrape_jobs(self, role: str, region: str, platforms: List[str]) -> List[Dict]:
-        all_jobs = []
+    async def scrape_jobs(self, role: str, region: str, platforms: List[str], cursors: Optional[Dict[str, CursorState]] = None) -> List[Dict]:
+        """
+        Scrape the requested platforms concurrently, each in its own pooled tab.
+        
+        cursors maps platform name ("indeed", "linkedin") to its incremental cursor.
+        """
+        platforms = [p.lower() for p in platforms]
+        cursors = cursors or {}
+        tasks = []
         if "indeed" in platforms:
-            jobs = await self.scrape_indeed(role, region)
-            all_jobs.extend(jobs)
+            tasks.append(self.scrape_indeed(role, region, cursors.get("indeed")))
+        if "linkedin" in platforms:
+            tasks.append(playwright_scraper.scrape_linkedin(role, region, cursor=cursors.get("linkedin")))
         
-        # Add other platforms here
+        all_jobs = []
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"Error scraping platform: {result}")
+                continue
+            all_jobs.extend(result)
         
         return all_jobs
 
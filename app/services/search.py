@@ -0,0 +1,102 @@
+"""
+Full-text job search over title, company and raw_text.
+
+One query API over two backends:
+- PostgreSQL: a generated, weighted tsvector column with a GIN index,
+  ranked with ts_rank_cd
+- SQLite: an external-content FTS5 table kept in sync by triggers, ranked
+  with BM25
+Other dialects fall back to unranked LIKE matching. Either way the matches
+come back as a (job_id, rank) subquery, higher rank = better, so callers can
+join it to jobs, add structured filters and paginate on (rank, id).
+"""
+import logging
+import re
+from typing import List
+
+from sqlalchemy import Float, Integer, inspect, literal, or_, select, text
+
+logger = logging.getLogger(__name__)
+
+# Column weights: a hit in the title matters more than one in the description
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(raw_text, '')), 'C')"
+)
+_FTS5_WEIGHTS = "10.0, 5.0, 1.0"
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, raw_text, content='jobs', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, raw_text) VALUES (new.id, new.title, new.company, new.raw_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, raw_text) VALUES ('delete', old.id, old.title, old.company, old.raw_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, raw_text ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, raw_text) VALUES ('delete', old.id, old.title, old.company, old.raw_text);
+        INSERT INTO jobs_fts(rowid, title, company, raw_text) VALUES (new.id, new.title, new.company, new.raw_text);
+    END""",
+]
+
+_TERM = re.compile(r"\w[\w+#.-]*")
+
+
+class JobSearchIndex:
+    def ensure(self, engine):
+        """Create the dialect's search structures if they are missing (idempotent)."""
+        dialect = engine.dialect.name
+        try:
+            with engine.begin() as conn:
+                if dialect == "postgresql":
+                    conn.execute(text(
+                        f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                        f"GENERATED ALWAYS AS ({_PG_DOCUMENT}) STORED"
+                    ))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector)"))
+                elif dialect == "sqlite":
+                    existed = inspect(conn).has_table("jobs_fts")
+                    for statement in _SQLITE_DDL:
+                        conn.execute(text(statement))
+                    if not existed:
+                        # Index the rows that predate the triggers
+                        conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+        except Exception as e:
+            logger.error(f"Error creating job search index: {e}")
+
+    @staticmethod
+    def terms(query: str) -> List[str]:
+        return _TERM.findall(query or "")
+
+    def matches(self, db, query: str):
+        """
+        Subquery of (job_id, rank) for jobs matching every term of the query.
+        """
+        from app.models import Job
+
+        terms = self.terms(query)
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = text(
+                "SELECT id AS job_id, ts_rank_cd(search_vector, plainto_tsquery('english', :q)) AS rank "
+                "FROM jobs WHERE search_vector @@ plainto_tsquery('english', :q)"
+            ).bindparams(q=" ".join(terms))
+        elif dialect == "sqlite":
+            # Quoted terms: user input never reaches FTS5 query syntax
+            fts_query = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            statement = text(
+                f"SELECT rowid AS job_id, -bm25(jobs_fts, {_FTS5_WEIGHTS}) AS rank "
+                "FROM jobs_fts WHERE jobs_fts MATCH :q"
+            ).bindparams(q=fts_query)
+        else:
+            return select(Job.id.label("job_id"), literal(0.0).label("rank")).where(*(
+                or_(Job.title.ilike(f"%{term}%"), Job.company.ilike(f"%{term}%"), Job.raw_text.ilike(f"%{term}%"))
+                for term in terms
+            )).subquery("matches")
+        return statement.columns(job_id=Integer, rank=Float).subquery("matches")
+
+
+search_index = JobSearchIndex()
@@ -0,0 +1,159 @@
+"""
+Skill extraction against a shared taxonomy.
+
+The taxonomy (app/data/skills.json, or settings.SKILL_TAXONOMY_PATH) maps
+canonical skill names to aliases. All terms are compiled once into a single
+regex whose alternation is factored into a character trie, so a description
+is scanned in one pass and the cost per position depends on the longest
+term, not on how many terms there are. Matches need word boundaries on both
+sides, so "java" does not fire inside "javascript" nor "node" inside "nodes".
+
+Single-letter names ("C", "R") are list-only: on their own they fire only
+inside a list of skills ("Python, C, Go", "C/C++"), never in "Series C" or
+"C-suite"; elsewhere they need an alias such as "ANSI C".
+"""
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills.json")
+
+# "+" and "#" count as word characters so "c" does not match in "c++" or "c#"
+_BEFORE = r"(?<![\w+#])"
+_AFTER = r"(?![\w+#])"
+
+# Context a list-only name needs: a list separator before and after it, or a slash right
+# after. A colon only opens a list when a comma follows ("Languages: C, Go", not "Grade: C")
+_LIST_BEFORE = re.compile(r"(?:[,/(]|\b(?:and|or))\s*$")
+_LIST_OPENER = re.compile(r":\s*$")
+_LIST_AFTER = re.compile(r"^\s*(?:[,/);]|(?:and|or)\b|\.?\s*$)")
+_LIST_CONTEXT = 8
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex matching any of the terms, with shared prefixes factored out."""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict) -> str:
+    terminal = "" in node
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _node_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    # Greedy "?" prefers the longest term; backtracks if the boundary fails
+    return "(?:" + "|".join(branches) + ")" + ("?" if terminal else "")
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.split())
+
+
+class SkillTaxonomy:
+    def __init__(
+        self,
+        skills: Dict[str, Dict[str, List[str]]],
+        case_sensitive: Iterable[str] = (),
+        alias_only: Iterable[str] = (),
+        list_only: Iterable[str] = (),
+        version: str = ""
+    ):
+        """
+        Args:
+            skills: Category -> canonical name -> aliases
+            case_sensitive: Terms that are also common words, matched only
+                exactly as written ("Go", "Rust", "REST")
+            alias_only: Canonical names never matched on their own ("R")
+            list_only: Canonical names also matched, exactly as written,
+                when they sit in a list of skills ("C" in "Python, C, Go")
+            version: Taxonomy revision; part of the parse cache key
+        """
+        self.version = str(version)
+        case_sensitive = {_normalize(term) for term in case_sensitive}
+        alias_only = set(alias_only)
+        self.categories: Dict[str, str] = {}
+        self._exact: Dict[str, str] = {}
+        self._folded: Dict[str, str] = {}
+        for category, entries in skills.items():
+            for name, aliases in entries.items():
+                self.categories[name] = category
+                terms = list(aliases) if name in alias_only else [name, *aliases]
+                for term in map(_normalize, terms):
+                    if term in case_sensitive:
+                        self._exact.setdefault(term, name)
+                    else:
+                        self._folded.setdefault(term.lower(), name)
+
+        alternatives = []
+        if self._exact:
+            alternatives.append(f"(?P<exact>(?-i:{_trie_pattern(self._exact)}))")
+        if self._folded:
+            alternatives.append(f"(?P<folded>{_trie_pattern(self._folded)})")
+        self._pattern = re.compile(_BEFORE + "(?:" + "|".join(alternatives) + ")" + _AFTER, re.IGNORECASE) if alternatives else None
+
+        self._listed = {_normalize(name): name for name in list_only if name in self.categories}
+        self._list_pattern = re.compile(_BEFORE + "(?:" + _trie_pattern(self._listed) + ")" + _AFTER) if self._listed else None
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["skills"],
+            data.get("case_sensitive", ()),
+            data.get("alias_only", ()),
+            data.get("list_only", ()),
+            data.get("version", "")
+        )
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def extract(self, text: Optional[str]) -> List[str]:
+        """Canonical names of the skills mentioned in the text, in order of first mention."""
+        if not text or self._pattern is None:
+            return []
+        mentions = []
+        for match in self._pattern.finditer(text):
+            exact = match.group("exact") if self._exact else None
+            if exact:
+                mentions.append((match.start(), self._exact[_normalize(exact)]))
+            else:
+                mentions.append((match.start(), self._folded[_normalize(match.group("folded")).lower()]))
+        if self._list_pattern is not None:
+            for match in self._list_pattern.finditer(text):
+                if self._in_list(text, match.start(), match.end()):
+                    mentions.append((match.start(), self._listed[_normalize(match.group())]))
+            mentions.sort(key=lambda mention: mention[0])
+        return list(dict.fromkeys(name for _, name in mentions))
+
+    @staticmethod
+    def _in_list(text: str, start: int, end: int) -> bool:
+        before, after = text[max(0, start - _LIST_CONTEXT):start], text[end:end + _LIST_CONTEXT]
+        if after.startswith("/"):
+            return True
+        if _LIST_OPENER.search(before):
+            return after.lstrip().startswith(",")
+        return bool(_LIST_BEFORE.search(before) and _LIST_AFTER.match(after))
+
+    def category(self, name: str) -> Optional[str]:
+        return self.categories.get(name)
+
+
+skill_taxonomy = SkillTaxonomy.from_file(settings.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH)
@@ -0,0 +1,176 @@
+"""
+In-memory Bloom filter over stored job URLs.
+
+Ingestion asks the filter first and only sends the possible hits to the
+database; a "no" from a Bloom filter is always right, so most of a batch of
+fresh URLs never costs a query. The filter is persisted to disk for a fast
+start, rebuilt from the jobs table in the background on startup and after
+cleanup deletes rows, and updated as jobs are inserted.
+
+Other processes' inserts are not seen until the next rebuild. That only
+produces false "no"s, which the ON CONFLICT (url) insert still catches.
+"""
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+from typing import Iterable, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"JBLM1"
+_HEADER = struct.Struct(">5sQIQ")  # magic, bit count, hash count, item count
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def save(self, path: str):
+        """Write atomically, so a crash never leaves a truncated filter behind."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.size, self.hash_count, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as f:
+            magic, size, hash_count, count = _HEADER.unpack(f.read(_HEADER.size))
+            bits = f.read()
+        if magic != _MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError(f"Not a job URL filter: {path}")
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hash_count, bloom.count = size, hash_count, count
+        bloom.capacity = max(1, int(size * (math.log(2) ** 2) / -math.log(0.001)))
+        bloom.bits = bytearray(bits)
+        return bloom
+
+
+class URLFilterService:
+    def __init__(self, path: str, min_capacity: int = 100000, error_rate: float = 0.001):
+        self.path = path
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        # Inserts that land while a rebuild is streaming the table
+        self._pending: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def possible_hits(self, urls: Iterable[str]) -> Set[str]:
+        """
+        URLs that may already be stored. Everything else is definitely new.
+        Until the filter is loaded every URL is a possible hit.
+        """
+        bloom = self._bloom
+        if bloom is None:
+            return set(urls)
+        return {url for url in urls if url in bloom}
+
+    def add_many(self, urls: Iterable[str]):
+        urls = list(urls)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(urls)
+            if self._bloom is None:
+                return
+            for url in urls:
+                self._bloom.add(url)
+            overfull = self._bloom.count > self._bloom.capacity
+        if overfull:
+            # Past capacity the false-positive rate climbs; resize
+            threading.Thread(target=self.rebuild, name="url-filter-rebuild", daemon=True).start()
+
+    def load(self) -> bool:
+        """Load the persisted filter, if there is a usable one."""
+        try:
+            bloom = BloomFilter.load(self.path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.info(f"No usable URL filter at {self.path}: {e}")
+            return False
+        with self._lock:
+            self._bloom = bloom
+        logger.info(f"Loaded URL filter ({bloom.count} URLs) from {self.path}")
+        return True
+
+    def save(self):
+        with self._lock:
+            bloom = self._bloom
+            if bloom is None:
+                return
+            try:
+                bloom.save(self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist URL filter: {e}")
+
+    def rebuild(self):
+        """Rebuild from the jobs table (drops URLs of deleted jobs) and persist."""
+        from app.database import SessionLocal
+        from app.models import Job
+
+        if not self._rebuild_lock.acquire(blocking=False):
+            return  # A rebuild is already running
+        db = SessionLocal()
+        try:
+            with self._lock:
+                self._pending = []
+            total = db.query(Job.id).count()
+            bloom = BloomFilter(max(self.min_capacity, total * 2), self.error_rate)
+            for (url,) in db.query(Job.url).yield_per(5000):
+                bloom.add(url)
+            with self._lock:
+                for url in self._pending:
+                    bloom.add(url)
+                self._pending = None
+                self._bloom = bloom
+            logger.info(f"Rebuilt URL filter with {bloom.count} URLs")
+            self.save()
+        except Exception as e:
+            logger.error(f"Error rebuilding URL filter: {e}")
+            with self._lock:
+                self._pending = None
+        finally:
+            db.close()
+            self._rebuild_lock.release()
+
+    def start(self):
+        """Load the persisted filter for a fast start, then refresh it in the background."""
+        self.load()
+        threading.Thread(target=self.rebuild, name="url-filter-rebuild", daemon=True).start()
+
+
+url_filter = URLFilterService(
+    settings.URL_FILTER_PATH,
+    min_capacity=settings.URL_FILTER_CAPACITY,
+    error_rate=settings.URL_FILTER_ERROR_RATE
+)
@@ -0,0 +1,5 @@
+"""Pluggable job sources behind one async protocol."""
+from app.sources.base import JobRecord, JobSource
+from app.sources.registry import ScrapeBatch, SourceRegistry, source_registry
+
+__all__ = ["JobRecord", "JobSource", "ScrapeBatch", "SourceRegistry", "source_registry"]
@@ -0,0 +1,93 @@
+"""JobSource adapters over the existing API clients and scrapers."""
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.services.scrape_cursor import CursorState
+from app.sources.base import JobRecord
+
+
+def _records(jobs: Iterable[Dict[str, Any]], source: str) -> List[JobRecord]:
+    records = (JobRecord.from_dict(job, source) for job in jobs)
+    return [record for record in records if record is not None]
+
+
+class AdzunaSource:
+    """Adzuna search API, paged by date with early termination."""
+    name = "adzuna"
+    rate_limits = {"api.adzuna.com": 1.0}
+    page_size = 50
+    supports_incremental = True
+    timeout = 60.0
+
+    async def fetch(self, query: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[JobRecord]:
+        from app.services.adzuna import adzuna_service
+
+        max_pages = math.ceil(limit / self.page_size) if limit else None
+        jobs = await adzuna_service.search_all_pages(
+            query, region, results_per_page=self.page_size, max_pages=max_pages, cursor=cursor, limit=limit
+        )
+        return _records(jobs, "Adzuna")
+
+
+class RemoteOKSource:
+    """RemoteOK's full JSON dump, revalidated with ETags and queried via an index."""
+    name = "remoteok"
+    rate_limits = {"remoteok.com": 2.0}
+    page_size = 50
+    supports_incremental = False  # One dump; only seen ids are filtered
+    timeout = 15.0
+
+    async def fetch(self, query: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[JobRecord]:
+        from app.tools.real_job_apis import RemoteOKAPI
+
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            jobs = await RemoteOKAPI().asearch_jobs(client, search_query=query, limit=limit or self.page_size, cursor=cursor)
+        return _records(jobs, "RemoteOK")
+
+
+class IndeedRSSSource:
+    """Indeed's RSS feed, restricted by age (fromage) when a cursor is set."""
+    name = "indeed_rss"
+    rate_limits = {"www.indeed.com": 2.0}
+    page_size = 25
+    supports_incremental = True
+    timeout = 10.0
+
+    async def fetch(self, query: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[JobRecord]:
+        from app.tools.real_job_apis import IndeedRSSParser
+
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            jobs = await IndeedRSSParser().asearch_jobs(client, query=query, location=region, limit=limit or self.page_size, cursor=cursor)
+        return _records(jobs, "Indeed")
+
+
+class IndeedSource:
+    """Indeed search results page, rendered in a pooled browser tab."""
+    name = "indeed"
+    rate_limits = {"www.indeed.com": 2.0}
+    page_size = 15
+    supports_incremental = True
+    timeout = 60.0
+
+    async def fetch(self, query: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[JobRecord]:
+        from app.services.scraper import scraper_service
+
+        jobs = await scraper_service.scrape_indeed(query, region, cursor, limit=limit)
+        return _records(jobs, "indeed")
+
+
+class LinkedInSource:
+    """LinkedIn's public job search, rendered in a pooled browser tab."""
+    name = "linkedin"
+    rate_limits = {"www.linkedin.com": 2.0}
+    page_size = 25
+    supports_incremental = True
+    timeout = 60.0
+
+    async def fetch(self, query: str, region: str, cursor: Optional[CursorState] = None, limit: Optional[int] = None) -> List[JobRecord]:
+        from app.scrapers.playwright_scraper import scraper as playwright_scraper
+
+        jobs = await playwright_scraper.scrape_linkedin(query, region, limit=limit or self.page_size, cursor=cursor)
+        return _records(jobs, "linkedin")
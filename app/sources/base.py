@@ -0,0 +1,92 @@
+"""Job source protocol and the normalized record every source emits."""
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+
+from app.services.scrape_cursor import CursorState, parse_posted_date
+
+# Adapters disagree on the description key
+DESCRIPTION_KEYS = ("description", "raw_description", "raw_text")
+
+
+@dataclass
+class JobRecord:
+    """A scraped posting, normalized across sources."""
+    url: str
+    title: str
+    company: str
+    source: str
+    location: Optional[str] = None
+    description: Optional[str] = None
+    posted_date: Optional[datetime] = None
+    external_id: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    contract_type: Optional[str] = None
+    contract_time: Optional[str] = None
+    apply_url: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: str) -> Optional["JobRecord"]:
+        """Normalize an adapter's job dict. Returns None without a URL and title."""
+        if not data.get("url") or not data.get("title"):
+            return None
+        description = next((data[key] for key in DESCRIPTION_KEYS if data.get(key)), None)
+        external_id = data.get("external_id")
+        return cls(
+            url=data["url"],
+            title=data["title"],
+            company=data.get("company") or "Unknown",
+            source=data.get("source") or source,
+            location=data.get("location"),
+            description=description,
+            posted_date=parse_posted_date(data.get("posted_date")),
+            external_id=str(external_id) if external_id is not None else None,
+            salary_min=data.get("salary_min"),
+            salary_max=data.get("salary_max"),
+            salary_currency=data.get("salary_currency"),
+            salary_period=data.get("salary_period"),
+            contract_type=data.get("contract_type"),
+            contract_time=data.get("contract_time"),
+            apply_url=data.get("apply_url"),
+            tags=list(data.get("tags") or [])
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job dict for ingestion (description is stored as raw_text)."""
+        data = asdict(self)
+        data["raw_text"] = data.pop("description")
+        return data
+
+
+@runtime_checkable
+class JobSource(Protocol):
+    """
+    A place jobs come from.
+
+    Attributes:
+        name: Registry key, also used for scrape cursors
+        rate_limits: Minimum seconds between requests, per host
+        page_size: Jobs returned per request/page
+        supports_incremental: Whether the source can ask for postings since
+            the cursor's high-water mark (others only filter seen ids)
+        timeout: Seconds before the registry gives up on the source
+    """
+    name: str
+    rate_limits: Dict[str, float]
+    page_size: int
+    supports_incremental: bool
+    timeout: float
+
+    async def fetch(
+        self,
+        query: str,
+        region: str,
+        cursor: Optional[CursorState] = None,
+        limit: Optional[int] = None
+    ) -> List[JobRecord]:
+        """Fetch new postings, updating the cursor with what was returned."""
+        ...
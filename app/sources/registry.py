@@ -0,0 +1,125 @@
+"""Registry that runs job sources concurrently with per-source timeouts."""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from app.services.rate_limiter import HostRateLimiter, host_rate_limiter
+from app.services.scrape_cursor import CursorState, scrape_cursor_service
+from app.sources.adapters import AdzunaSource, IndeedRSSSource, IndeedSource, LinkedInSource, RemoteOKSource
+from app.sources.base import JobRecord, JobSource
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeBatch:
+    """Records from one scrape, plus the cursors to persist once they're stored."""
+    records: List[JobRecord] = field(default_factory=list)
+    cursors: List[CursorState] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def rows(self) -> List[Dict]:
+        return [record.to_dict() for record in self.records]
+
+    def sources(self) -> List[str]:
+        return sorted({record.source for record in self.records})
+
+    def save_cursors(self):
+        """Advance the high-water marks; call after the records are ingested."""
+        scrape_cursor_service.save(self.cursors)
+
+
+class SourceRegistry:
+    def __init__(self, sources: Iterable[JobSource] = (), rate_limiter: HostRateLimiter = None):
+        self.rate_limiter = rate_limiter or host_rate_limiter
+        self._sources: Dict[str, JobSource] = {}
+        for source in sources:
+            self.register(source)
+
+    def register(self, source: JobSource) -> JobSource:
+        """Add a source and apply its declared per-host rate limits."""
+        if not isinstance(source, JobSource):
+            raise TypeError(f"{source!r} does not implement JobSource")
+        self._sources[source.name] = source
+        for host, interval in source.rate_limits.items():
+            # Sources sharing a host get the strictest spacing
+            current = self.rate_limiter.intervals.get(host.lower(), 0.0)
+            self.rate_limiter.set_interval(host, max(current, interval))
+        return source
+
+    def get(self, name: str) -> Optional[JobSource]:
+        return self._sources.get(name.lower())
+
+    def names(self) -> List[str]:
+        return list(self._sources)
+
+    def resolve(self, names: Iterable[str]) -> List[JobSource]:
+        """Look up sources by name (case-insensitive), skipping unknown and repeated names."""
+        sources = []
+        for name in names:
+            source = self.get(name)
+            if source is None:
+                logger.warning(f"Unknown job source '{name}'; skipping")
+            elif source not in sources:
+                sources.append(source)
+        return sources
+
+    async def collect(
+        self,
+        query: str,
+        region: str,
+        names: Iterable[str],
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> ScrapeBatch:
+        """
+        Fetch new postings from the named sources concurrently.
+
+        Each source resumes from its scrape cursor (or from `since`, if given)
+        and has its own timeout, so a slow or failing source only costs its
+        own results. Only cursors of sources that completed are returned, so
+        a partial run is retried from the old mark.
+        """
+        sources = self.resolve(names)
+        timeouts = timeouts or {}
+        cursors = scrape_cursor_service.load_many([s.name for s in sources], query, region)
+        if since:
+            for cursor in cursors.values():
+                cursor.since = since
+
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    source.fetch(query, region, cursors[source.name], limit),
+                    timeouts.get(source.name, source.timeout)
+                )
+                for source in sources
+            ),
+            return_exceptions=True
+        )
+
+        batch = ScrapeBatch()
+        for source, result in zip(sources, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"{source.name} timed out; continuing with partial results")
+                batch.errors[source.name] = "timeout"
+            elif isinstance(result, Exception):
+                logger.error(f"{source.name} failed: {result}")
+                batch.errors[source.name] = str(result)
+            else:
+                logger.info(f"{source.name}: {len(result)} new jobs")
+                batch.records.extend(result)
+                batch.cursors.append(cursors[source.name])
+        return batch
+
+
+source_registry = SourceRegistry([
+    AdzunaSource(),
+    RemoteOKSource(),
+    IndeedRSSSource(),
+    IndeedSource(),
+    LinkedInSource()
+])
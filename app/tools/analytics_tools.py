@@ -4,6 +4,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models import Job, Application, Project
 from app.database import SessionLocal
+from app.services.dedup import dedup_engine
 from datetime import datetime, timedelta
 
 
@@ -25,9 +26,10 @@ def dashboard_metrics() -> Dict[str, Any]:
         # Scam jobs detected
         scams_detected = db.query(Job).filter(Job.is_scam == True).count()
         
-        # Duplicates avoided (jobs with same company+title)
-        # This is tricky to calculate, so we'll estimate
-        duplicates_avoided = total_jobs - db.query(Job.company, Job.title).distinct().count()
+        # Duplicates avoided (URL, content hash and near-duplicate hits),
+        # counted by ingestion as they happen
+        duplicates_by_kind = dedup_engine.counts(db)
+        duplicates_avoided = sum(duplicates_by_kind.values())
         
         # Average match score
         avg_match = db.query(func.avg(Job.match_score)).scalar() or 0
@@ -71,6 +73,7 @@ def dashboard_metrics() -> Dict[str, Any]:
                 "matched_jobs": matched_jobs,
                 "total_applied": total_applied,
                 "duplicates_avoided": duplicates_avoided,
+                "duplicates_by_kind": duplicates_by_kind,
                 "scams_detected": scams_detected,
                 "projects_added": total_projects
             },
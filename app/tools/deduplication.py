@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field
+from app.database import SessionLocal
+from app.services.dedup import dedup_engine
 
 class DeduplicateJobInput(BaseModel):
     job_url: str = Field(..., description="The URL of the job to check")
@@ -7,6 +9,10 @@ class DeduplicateJobInput(BaseModel):
 
 def deduplicate_job(job_url: str, company: str, title: str) -> bool:
     """
-    Check if a job has already been processed.
+    Check if a job has already been processed, by URL or by content.
     """
-    return False
+    db = SessionLocal()
+    try:
+        return dedup_engine.check(db, job_url, title, company) is not None
+    finally:
+        db.close()
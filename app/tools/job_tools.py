@@ -1,4 +1,5 @@
 """Job scraping, parsing, and validation tools."""
+import asyncio
 import requests
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -6,47 +7,33 @@ import re
 from langchain_core.tools import tool
 from app.models import Job, JobStatus
 from app.database import SessionLocal
+from app.services.ingestion import job_ingestion_service
+from app.services.parser import parser_service
+from app.sources import source_registry
 
 @tool
-def scrape_jobs(region: str, role: str, platforms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+async def scrape_jobs(region: str, role: str, platforms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Scrapes job listings for a given region and role from multiple platforms.
     Returns a list of job dictionaries.
     """
-    # In a real scenario, this would call specific scrapers or APIs
-    # For now, we simulate with realistic mock data if APIs fail
-    
     print(f"Scraping jobs for {role} in {region}...")
     
-    # Mock data generation for demonstration
-    jobs = [
-        {
-            "url": f"https://indeed.com/viewjob?jk=mock{i}",
-            "title": f"{role} {i}",
-            "company": f"Tech Company {i}",
-            "location": region,
-            "posted_date": datetime.now(),
-            "raw_text": f"We are looking for a {role} with Python and React experience...",
-            "source": "indeed"
-        }
-        for i in range(1, 4)
-    ]
+    batch = await source_registry.collect(role, region, platforms or ["adzuna"])
+    jobs = batch.rows()
     
-    # Save to DB
-    db = SessionLocal()
-    saved_jobs = []
-    try:
-        for job_data in jobs:
-            existing = db.query(Job).filter(Job.url == job_data["url"]).first()
-            if not existing:
-                job = Job(**job_data, status=JobStatus.SCRAPED.value)
-                db.add(job)
-                saved_jobs.append(job_data)
-        db.commit()
-    finally:
-        db.close()
-        
-    return saved_jobs
+    # Save to DB; ingestion blocks, so it runs in a worker thread with its own session
+    def save() -> List[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            result = job_ingestion_service.ingest(db, jobs)
+            saved_urls = set(result.inserted_urls)
+            batch.save_cursors()
+            return [job for job in jobs if job["url"] in saved_urls]
+        finally:
+            db.close()
+    
+    return await asyncio.to_thread(save)
 
 @tool
 def detect_scam(job_record: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,20 +65,13 @@ def parse_jd(job_text: str) -> Dict[str, Any]:
     """
     Parses a job description text into structured data (skills, seniority, etc).
     """
-    # Simple regex-based parsing for now
-    skills = []
-    if "python" in job_text.lower(): skills.append("Python")
-    if "react" in job_text.lower(): skills.append("React")
-    if "aws" in job_text.lower(): skills.append("AWS")
-    
-    seniority = "Mid"
-    if "senior" in job_text.lower(): seniority = "Senior"
-    if "junior" in job_text.lower(): seniority = "Junior"
+    # Shares the parse cache with scraping and the other agent tools
+    parsed = parser_service.parse_job_description(job_text)
     
     return {
-        "skills": skills,
-        "seniority": seniority,
-        "years_experience": 3 # Mock inference
+        "skills": [skill for skill in parsed["skills"] if skill != "General"],
+        "seniority": (parsed["seniority_level"] or "mid").capitalize(),
+        "years_experience": parsed["experience_min_years"] if parsed["experience_min_years"] is not None else 3 # Mock inference
     }
 
 @tool
@@ -1,13 +1,19 @@
 """Real-world job API integrations for Adzuna, RemoteOK, and Indeed RSS."""
+import asyncio
+import re
 import requests
+import httpx
 import feedparser
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
-import time
 import os
 from sqlalchemy.orm import Session
-from app.models import Job
 from app.database import SessionLocal
+from app.services.ingestion import job_ingestion_service
+from app.services.job_attributes import COUNTRY_CURRENCIES
+from app.services.http_cache import CachedResponse, HTTPResponseCache, http_response_cache
+from app.services.politeness import PolitenessGate, politeness
+from app.services.scrape_cursor import CursorState
 import logging
 
 logger = logging.getLogger(__name__)
@@ -56,27 +62,13 @@ class AdzunaAPI:
             logger.error("Cannot search Adzuna: Missing API credentials")
             return []
         
-        url = f"{self.BASE_URL}/{country}/search/{page}"
-        
-        params = {
-            "app_id": self.app_id,
-            "app_key": self.app_key,
-            "results_per_page": results_per_page,
-            "what": query,
-            "where": location,
-            "sort_by": sort_by,
-            "content-type": "application/json"
-        }
+        url, params = self._build_request(country, query, location, results_per_page, page, sort_by)
         
         try:
+            politeness.acquire_sync(url)
             response = requests.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            jobs = []
-            for result in data.get("results", []):
-                job = self._parse_adzuna_job(result)
-                jobs.append(job)
+            jobs = self._parse_response(response.json(), country)
             
             logger.info(f"Adzuna: Found {len(jobs)} jobs for '{query}' in {location}")
             return jobs
@@ -85,10 +77,74 @@ class AdzunaAPI:
             logger.error(f"Adzuna API error: {e}")
             return []
     
-    def _parse_adzuna_job(self, result: Dict[str, Any]) -> Dict[str, Any]:
+    async def asearch_jobs(
+        self,
+        client: httpx.AsyncClient,
+        country: str = "us",
+        query: str = "python developer",
+        location: str = "New York",
+        results_per_page: int = 20,
+        page: int = 1,
+        sort_by: str = "date",
+        rate_limiter: PolitenessGate = politeness,
+        cursor: Optional[CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of search_jobs using a shared httpx client.
+        
+        Errors are raised to the caller so the aggregator can decide
+        whether a slow or failing source should be dropped. With a cursor,
+        only postings newer than its high-water mark are requested/returned.
+        """
+        if not self.app_id or not self.app_key:
+            logger.error("Cannot search Adzuna: Missing API credentials")
+            return []
+        
+        url, params = self._build_request(country, query, location, results_per_page, page, sort_by)
+        if cursor and cursor.days_back():
+            params["max_days_old"] = cursor.days_back()
+        await rate_limiter.acquire(url)
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        jobs = self._parse_response(response.json(), country)
+        if cursor:
+            jobs = cursor.filter_new(jobs)
+            cursor.observe(jobs)
+        
+        logger.info(f"Adzuna: Found {len(jobs)} jobs for '{query}' in {location}")
+        return jobs
+    
+    def _build_request(
+        self,
+        country: str,
+        query: str,
+        location: str,
+        results_per_page: int,
+        page: int,
+        sort_by: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the search URL and query parameters"""
+        url = f"{self.BASE_URL}/{country}/search/{page}"
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": results_per_page,
+            "what": query,
+            "where": location,
+            "sort_by": sort_by,
+            "content-type": "application/json"
+        }
+        return url, params
+    
+    def _parse_response(self, data: Dict[str, Any], country: str = "us") -> List[Dict[str, Any]]:
+        """Parse a search response body into standardized jobs"""
+        return [self._parse_adzuna_job(result, country) for result in data.get("results", [])]
+    
+    def _parse_adzuna_job(self, result: Dict[str, Any], country: str = "us") -> Dict[str, Any]:
         """Parse Adzuna API response into standardized format"""
         return {
             "url": result.get("redirect_url"),
+            "external_id": result.get("id"),
             "title": result.get("title"),
             "company": result.get("company", {}).get("display_name", "Unknown"),
             "location": result.get("location", {}).get("display_name", "Unknown"),
@@ -96,12 +152,71 @@ class AdzunaAPI:
             "raw_description": result.get("description", ""),
             "salary_min": result.get("salary_min"),
             "salary_max": result.get("salary_max"),
+            "salary_currency": COUNTRY_CURRENCIES.get(country.lower()),
+            "salary_period": "year",  # Adzuna quotes annual salaries
             "contract_type": result.get("contract_type"),
+            "contract_time": result.get("contract_time"),
             "category": result.get("category", {}).get("label"),
             "source": "Adzuna"
         }
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lower-case word tokens; keeps terms like c++, c# and node.js intact."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class RemoteOKIndex:
+    """
+    Pre-tokenized view of one RemoteOK dump.
+    
+    Maps each position/tag token to the postings containing it, so a query is
+    a set intersection instead of a scan of the whole dump. Parsed jobs are
+    memoized per posting.
+    """
+    
+    def __init__(self, digest: str, data: Any):
+        self.digest = digest
+        # First item is metadata, skip it
+        self.entries: List[Dict[str, Any]] = [
+            item for item in (data[1:] if isinstance(data, list) else [])
+            if isinstance(item, dict)
+        ]
+        self.postings: Dict[str, Set[int]] = {}
+        for position, entry in enumerate(self.entries):
+            text = " ".join([entry.get("position") or ""] + list(entry.get("tags") or []))
+            for token in set(_tokenize(text)):
+                self.postings.setdefault(token, set()).add(position)
+        self._parsed: Dict[int, Dict[str, Any]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def search(self, query: Optional[str]) -> List[int]:
+        """Positions (in dump order, newest first) whose title/tags contain every query token"""
+        tokens = _tokenize(query or "")
+        if not tokens:
+            return list(range(len(self.entries)))
+        matches = None
+        for token in sorted(set(tokens), key=lambda t: len(self.postings.get(t, ()))):
+            found = self.postings.get(token)
+            if not found:
+                return []
+            matches = set(found) if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(matches)
+    
+    def parsed(self, position: int, parse: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        if position not in self._parsed:
+            self._parsed[position] = parse(self.entries[position])
+        # Copy so callers can't mutate the memoized job
+        return dict(self._parsed[position])
+
+
 class RemoteOKAPI:
     """
     RemoteOK Job Board Integration
@@ -110,11 +225,21 @@ class RemoteOKAPI:
     """
     
     BASE_URL = "https://remoteok.com/api"
+    HEADERS = {
+        "User-Agent": "Career-Agent-Bot/1.0 (https://github.com/yourusername/career-agent)"
+    }
+    
+    # Shared across instances: aggregators are created per call, the dump is not
+    _index: Optional[RemoteOKIndex] = None
+    
+    def __init__(self, cache: HTTPResponseCache = None):
+        self.cache = cache or http_response_cache
     
     def search_jobs(
         self,
         search_query: str = None,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[CursorState] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch remote jobs from RemoteOK
@@ -122,44 +247,79 @@ class RemoteOKAPI:
         Args:
             search_query: Optional search term (filters after fetching)
             limit: Max number of jobs to return
+            cursor: Optional incremental cursor; already-seen and older jobs are dropped
         
         Returns:
             List of job dictionaries
         """
-        headers = {
-            "User-Agent": "Career-Agent-Bot/1.0 (https://github.com/yourusername/career-agent)"
-        }
-        
         try:
             # RemoteOK requires a respectful user agent
-            response = requests.get(self.BASE_URL, headers=headers, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            # First item is metadata, skip it
-            jobs_data = data[1:] if isinstance(data, list) and len(data) > 1 else []
-            
-            jobs = []
-            for result in jobs_data[:limit]:
-                # Filter by search query if provided
-                if search_query:
-                    query_lower = search_query.lower()
-                    position = result.get("position", "").lower()
-                    tags = " ".join(result.get("tags", [])).lower()
-                    
-                    if query_lower not in position and query_lower not in tags:
-                        continue
-                
-                job = self._parse_remoteok_job(result)
-                jobs.append(job)
+            politeness.acquire_sync(self.BASE_URL)
+            response = self.cache.fetch_sync(self.BASE_URL, headers=self.HEADERS, timeout=15)
+            jobs = self._filter_jobs(response, search_query, limit, cursor)
             
             logger.info(f"RemoteOK: Found {len(jobs)} remote jobs")
             return jobs
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"RemoteOK API error: {e}")
             return []
     
+    async def asearch_jobs(
+        self,
+        client: httpx.AsyncClient,
+        search_query: str = None,
+        limit: int = 50,
+        rate_limiter: PolitenessGate = politeness,
+        cursor: Optional[CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of search_jobs using a shared httpx client."""
+        await rate_limiter.acquire(self.BASE_URL)
+        response = await self.cache.fetch(client, self.BASE_URL, headers=self.HEADERS)
+        jobs = self._filter_jobs(response, search_query, limit, cursor)
+        
+        logger.info(f"RemoteOK: Found {len(jobs)} remote jobs")
+        return jobs
+    
+    def _index_for(self, response: CachedResponse) -> RemoteOKIndex:
+        """
+        Return the index for this dump, building it only when the dump changed.
+        
+        The feed URL is the same for every query, so a 304 does not mean "no new
+        jobs" for this query; it means the in-memory index is still current.
+        """
+        index = RemoteOKAPI._index
+        if index is None or index.digest != response.digest:
+            index = RemoteOKAPI._index = RemoteOKIndex(response.digest, response.json())
+            logger.info(f"RemoteOK: Indexed {len(index)} jobs")
+        return index
+    
+    def _filter_jobs(
+        self,
+        response: CachedResponse,
+        search_query: Optional[str],
+        limit: int,
+        cursor: Optional[CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """Look up the query in the dump's index (and cursor) and parse matching jobs"""
+        index = self._index_for(response)
+        
+        jobs = []
+        for position in index.search(search_query):
+            job = index.parsed(position, self._parse_remoteok_job)
+            if cursor and not cursor.is_new(job):
+                continue
+            if len(jobs) >= limit:
+                # Cut before observing, so the jobs left over stay new
+                if cursor:
+                    cursor.hold()
+                break
+            jobs.append(job)
+        
+        if cursor:
+            cursor.observe(jobs)
+        return jobs
+    
     def _parse_remoteok_job(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Parse RemoteOK API response into standardized format"""
         try:
@@ -176,6 +336,7 @@ class RemoteOKAPI:
 
         return {
             "url": result.get("url") or f"https://remoteok.com/remote-jobs/{result.get('id')}",
+            "external_id": result.get("id"),
             "title": result.get("position"),
             "company": result.get("company"),
             "location": "Remote",
@@ -183,6 +344,8 @@ class RemoteOKAPI:
             "raw_description": result.get("description", ""),
             "salary_min": result.get("salary_min"),
             "salary_max": result.get("salary_max"),
+            "salary_currency": "USD",
+            "salary_period": "year",
             "tags": result.get("tags", []),
             "apply_url": result.get("apply_url"),
             "source": "RemoteOK"
@@ -197,12 +360,19 @@ class IndeedRSSParser:
     """
     
     BASE_URL = "https://www.indeed.com/rss"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    
+    def __init__(self, cache: HTTPResponseCache = None):
+        self.cache = cache or http_response_cache
     
     def search_jobs(
         self,
         query: str = "python developer",
         location: str = "New York",
-        limit: int = 25
+        limit: int = 25,
+        cursor: Optional[CursorState] = None
     ) -> List[Dict[str, Any]]:
         """
         Parse Indeed RSS feed for jobs
@@ -211,29 +381,18 @@ class IndeedRSSParser:
             query: Job search keywords
             location: Location name
             limit: Max results
+            cursor: Optional incremental cursor; restricts the feed by age
+                and drops already-seen entries
         
         Returns:
             List of job dictionaries
         """
-        params = {
-            "q": query,
-            "l": location
-        }
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        params = self._build_params(query, location, cursor)
         
         try:
-            response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
-            
-            jobs = []
-            for entry in feed.entries[:limit]:
-                job = self._parse_indeed_entry(entry)
-                jobs.append(job)
+            politeness.acquire_sync(self.BASE_URL)
+            response = self.cache.fetch_sync(self.BASE_URL, params=params, headers=self.HEADERS, timeout=10)
+            jobs = self._parse_feed(response, limit, cursor)
             
             logger.info(f"Indeed RSS: Found {len(jobs)} jobs for '{query}' in {location}")
             return jobs
@@ -242,6 +401,54 @@ class IndeedRSSParser:
             logger.error(f"Indeed RSS error: {e}")
             return []
     
+    async def asearch_jobs(
+        self,
+        client: httpx.AsyncClient,
+        query: str = "python developer",
+        location: str = "New York",
+        limit: int = 25,
+        rate_limiter: PolitenessGate = politeness,
+        cursor: Optional[CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of search_jobs using a shared httpx client."""
+        params = self._build_params(query, location, cursor)
+        
+        await rate_limiter.acquire(self.BASE_URL)
+        response = await self.cache.fetch(client, self.BASE_URL, params=params, headers=self.HEADERS)
+        jobs = self._parse_feed(response, limit, cursor)
+        
+        logger.info(f"Indeed RSS: Found {len(jobs)} jobs for '{query}' in {location}")
+        return jobs
+    
+    def _build_params(self, query: str, location: str, cursor: Optional[CursorState]) -> Dict[str, Any]:
+        """Build feed query parameters"""
+        params = {
+            "q": query,
+            "l": location
+        }
+        if cursor and cursor.days_back():
+            # Indeed's "fromage" limits results to postings from the last N days
+            params["fromage"] = cursor.days_back()
+        return params
+    
+    def _parse_feed(self, response: CachedResponse, limit: int, cursor: Optional[CursorState] = None) -> List[Dict[str, Any]]:
+        """Parse the RSS response into standardized jobs"""
+        if response.not_modified:
+            # Same query URL, unchanged feed: nothing new to parse
+            return []
+        feed = feedparser.parse(response.content)
+        jobs = [self._parse_indeed_entry(entry) for entry in feed.entries]
+        if cursor:
+            jobs = cursor.filter_new(jobs)
+        if len(jobs) > limit:
+            # Cut before observing, so the jobs left over stay new
+            jobs = jobs[:limit]
+            if cursor:
+                cursor.hold()
+        if cursor:
+            cursor.observe(jobs)
+        return jobs
+    
     def _parse_indeed_entry(self, entry) -> Dict[str, Any]:
         """Parse RSS entry into standardized format"""
         # Extract company from title (format: "Job Title - Company Name")
@@ -251,6 +458,7 @@ class IndeedRSSParser:
         
         return {
             "url": entry.link,
+            "external_id": entry.get("id"),
             "title": job_title,
             "company": company,
             "location": entry.get("summary", "Unknown"),
@@ -263,12 +471,26 @@ class IndeedRSSParser:
 class JobAPIAggregator:
     """
     Aggregates jobs from multiple sources
+    
+    Sources are queried concurrently over one shared httpx client. Each
+    source has its own timeout, so a slow platform only costs its own
+    results instead of stalling the whole search.
     """
     
-    def __init__(self):
+    PLATFORMS = ["adzuna", "remoteok", "indeed"]
+    
+    # Per-source timeouts in seconds
+    SOURCE_TIMEOUTS = {
+        "adzuna": 10.0,
+        "remoteok": 15.0,
+        "indeed": 10.0
+    }
+    
+    def __init__(self, rate_limiter: PolitenessGate = None):
         self.adzuna = AdzunaAPI()
         self.remoteok = RemoteOKAPI()
         self.indeed_rss = IndeedRSSParser()
+        self.rate_limiter = rate_limiter or politeness
     
     def search_all_platforms(
         self,
@@ -280,6 +502,9 @@ class JobAPIAggregator:
         """
         Search across all available platforms
         
+        Blocking wrapper around asearch_all_platforms for scripts and
+        other sync callers. Use the async method from inside an event loop.
+        
         Args:
             query: Job search keywords
             location: Location name
@@ -289,52 +514,103 @@ class JobAPIAggregator:
         Returns:
             Combined list of jobs from all platforms
         """
-        all_jobs = []
+        return asyncio.run(
+            self.asearch_all_platforms(query, location, platforms, limit_per_platform)
+        )
+    
+    async def asearch_all_platforms(
+        self,
+        query: str = "python developer",
+        location: str = "New York",
+        platforms: List[str] = None,
+        limit_per_platform: int = 20,
+        timeouts: Dict[str, float] = None,
+        client: httpx.AsyncClient = None,
+        cursors: Dict[str, CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search all requested platforms concurrently
+        
+        Args:
+            query: Job search keywords
+            location: Location name
+            platforms: List of platforms to search (None = all)
+            limit_per_platform: Max results from each platform
+            timeouts: Per-source timeout overrides in seconds
+            client: Optional shared client (one is created if omitted)
+            cursors: Incremental scrape cursors keyed by platform name
         
+        Returns:
+            Combined list of jobs from every source that answered in time
+        """
         if platforms is None:
-            platforms = ["adzuna", "remoteok", "indeed"]
-        
-        # Adzuna
-        if "adzuna" in [p.lower() for p in platforms]:
-            try:
-                adzuna_jobs = self.adzuna.search_jobs(
-                    query=query,
-                    location=location,
-                    results_per_page=limit_per_platform
-                )
-                all_jobs.extend(adzuna_jobs)
-                time.sleep(1)  # Rate limiting
-            except Exception as e:
-                logger.error(f"Adzuna search failed: {e}")
-        
-        # RemoteOK
-        if "remoteok" in [p.lower() for p in platforms]:
-            try:
-                remote_jobs = self.remoteok.search_jobs(
-                    search_query=query,
-                    limit=limit_per_platform
-                )
-                all_jobs.extend(remote_jobs)
-                time.sleep(1)  # Rate limiting
-            except Exception as e:
-                logger.error(f"RemoteOK search failed: {e}")
-        
-        # Indeed RSS
-        if "indeed" in [p.lower() for p in platforms]:
-            try:
-                indeed_jobs = self.indeed_rss.search_jobs(
-                    query=query,
-                    location=location,
-                    limit=limit_per_platform
-                )
-                all_jobs.extend(indeed_jobs)
-                time.sleep(1)  # Rate limiting
-            except Exception as e:
-                logger.error(f"Indeed RSS search failed: {e}")
+            platforms = self.PLATFORMS
+        requested = [p.lower() for p in platforms if p.lower() in self.PLATFORMS]
+        source_timeouts = {**self.SOURCE_TIMEOUTS, **(timeouts or {})}
+        
+        if client is None:
+            # Client-level timeout is a backstop; per-source deadlines below are tighter
+            async with httpx.AsyncClient(timeout=max(source_timeouts.values()), follow_redirects=True) as shared:
+                return await self._gather_sources(shared, requested, query, location, limit_per_platform, source_timeouts, cursors or {})
+        return await self._gather_sources(client, requested, query, location, limit_per_platform, source_timeouts, cursors or {})
+    
+    async def _gather_sources(
+        self,
+        client: httpx.AsyncClient,
+        platforms: List[str],
+        query: str,
+        location: str,
+        limit: int,
+        timeouts: Dict[str, float],
+        cursors: Dict[str, CursorState]
+    ) -> List[Dict[str, Any]]:
+        """Run every source concurrently and keep whatever finishes in time"""
+        coros = [
+            asyncio.wait_for(
+                self._search_source(client, name, query, location, limit, cursors.get(name)),
+                timeouts[name]
+            )
+            for name in platforms
+        ]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        
+        all_jobs = []
+        for name, result in zip(platforms, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"{name} search timed out after {timeouts[name]}s; continuing with partial results")
+            elif isinstance(result, Exception):
+                logger.error(f"{name} search failed: {result}")
+            else:
+                all_jobs.extend(result)
         
         logger.info(f"Total jobs found across all platforms: {len(all_jobs)}")
         return all_jobs
     
+    async def _search_source(
+        self,
+        client: httpx.AsyncClient,
+        name: str,
+        query: str,
+        location: str,
+        limit: int,
+        cursor: Optional[CursorState] = None
+    ) -> List[Dict[str, Any]]:
+        """Dispatch a search to a single source"""
+        if name == "adzuna":
+            return await self.adzuna.asearch_jobs(
+                client, query=query, location=location, results_per_page=limit,
+                rate_limiter=self.rate_limiter, cursor=cursor
+            )
+        if name == "remoteok":
+            return await self.remoteok.asearch_jobs(
+                client, search_query=query, limit=limit,
+                rate_limiter=self.rate_limiter, cursor=cursor
+            )
+        return await self.indeed_rss.asearch_jobs(
+            client, query=query, location=location, limit=limit,
+            rate_limiter=self.rate_limiter, cursor=cursor
+        )
+    
     def save_jobs_to_db(self, jobs: List[Dict[str, Any]], db: Session = None) -> int:
         """
         Save jobs to database, avoiding duplicates
@@ -351,25 +627,11 @@ class JobAPIAggregator:
         saved_count = 0
         
         try:
-            for job_data in jobs:
-                # Check for duplicates
-                existing = db.query(Job).filter(Job.url == job_data["url"]).first()
-                
-                if not existing:
-                    # Create new job entry
-                    job = Job(
-                        **job_data,
-                        status="scraped"
-                    )
-                    db.add(job)
-                    saved_count += 1
-            
-            db.commit()
+            saved_count = job_ingestion_service.ingest(db, jobs).inserted
             logger.info(f"Saved {saved_count} new jobs to database")
             
         except Exception as e:
             logger.error(f"Database save error: {e}")
-            db.rollback()
         
         finally:
             if close_db:
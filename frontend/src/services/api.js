@@ -52,6 +52,7 @@ const api = {
         const params = new URLSearchParams();
         if (filters.keyword) params.append('keyword', filters.keyword);
         if (filters.location) params.append('location', filters.location);
+        if (filters.cursor) params.append('cursor', filters.cursor);
         if (filters.skip) params.append('skip', filters.skip);
         if (filters.limit) params.append('limit', filters.limit);
 
@@ -0,0 +1,122 @@
+"""Add the job attribute, dedup and enrichment columns and the pipeline tables
+
+This migration script brings an existing database up to the current SQLAlchemy
+models:
+
+    - jobs: salary_min, salary_max, salary_currency, salary_period,
+      experience_min_years, experience_max_years, seniority_level, work_mode,
+      employment_type, content_hash, minhash, enrich_attempts (plus their indexes)
+    - tables: match_scores, job_embeddings, scrape_cursors, job_lsh_bands,
+      dedup_decisions, dedup_counters, parse_cache
+    - the keyset pagination indexes on jobs and resumes, and the full-text
+      search structures
+
+Every step checks what is already there, so the script is safe to re-run.
+It goes through the app's SQLAlchemy engine, so it works against the
+PostgreSQL database in DATABASE_URL as well as a local SQLite file.
+
+Usage:
+    1. Run this script directly to apply migration to your production database
+    2. Then fill the attribute columns of existing jobs with
+       parser_service.backfill(only_missing=False)
+
+Revision ID: add_pipeline_tables
+Create Date: 2026-10-18
+"""
+
+from dotenv import load_dotenv
+from sqlalchemy import inspect, text
+
+# Load environment variables before app.database reads DATABASE_URL
+load_dotenv()
+
+from app.database import engine as app_engine
+from app.models import (
+    DedupCounter, DedupDecision, Job, JobEmbedding, JobLSHBand,
+    MatchScore, ParseCacheEntry, Resume, ScrapeCursor
+)
+from app.services.search import search_index
+
+JOB_COLUMNS = [
+    "salary_min", "salary_max", "salary_currency", "salary_period",
+    "experience_min_years", "experience_max_years", "seniority_level",
+    "work_mode", "employment_type", "content_hash", "minhash", "enrich_attempts",
+]
+
+NEW_TABLES = [
+    MatchScore, JobEmbedding, ScrapeCursor, JobLSHBand,
+    DedupDecision, DedupCounter, ParseCacheEntry,
+]
+
+
+def _add_job_columns(conn):
+    """Add the jobs columns that are missing, then any missing indexes on them."""
+    existing = {column["name"] for column in inspect(conn).get_columns("jobs")}
+    table = Job.__table__
+
+    for name in JOB_COLUMNS:
+        if name in existing:
+            print(f"[OK] jobs.{name} column already exists")
+            continue
+        column = table.c[name]
+        column_type = column.type.compile(dialect=conn.dialect)
+        print(f"Adding jobs.{name} column...")
+        conn.execute(text(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}"))
+        print(f"[OK] jobs.{name} column added successfully")
+
+    # Indexes declared with index=True or in __table_args__
+    for model in (Job, Resume):
+        indexed = {index["name"] for index in inspect(conn).get_indexes(model.__tablename__)}
+        for index in model.__table__.indexes:
+            if index.name not in indexed:
+                print(f"Creating index {index.name}...")
+                index.create(conn)
+                print(f"[OK] index {index.name} created")
+
+
+def _create_tables(conn):
+    """Create the pipeline tables that do not exist yet."""
+    inspector = inspect(conn)
+    for model in NEW_TABLES:
+        name = model.__tablename__
+        if inspector.has_table(name):
+            print(f"[OK] {name} table already exists")
+            continue
+        print(f"Creating {name} table...")
+        model.__table__.create(conn)
+        print(f"[OK] {name} table created successfully")
+
+
+def run_migration(engine=None):
+    """Apply migration to add the pipeline columns and tables."""
+    engine = engine or app_engine
+
+    try:
+        print("Connecting to database...")
+        with engine.begin() as conn:
+            print("Checking if migration is needed...")
+            _add_job_columns(conn)
+            _create_tables(conn)
+
+        # Manages its own transaction; a no-op when the index already exists
+        print("Ensuring the job search index...")
+        search_index.ensure(engine)
+        print("[OK] job search index ready")
+
+        print("\n[SUCCESS] Migration completed successfully!")
+
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Add job pipeline columns and tables")
+    print("=" * 60)
+    print()
+
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\nError: {str(e)}")
+        exit(1)
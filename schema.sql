@@ -11,11 +11,17 @@ DROP TABLE IF EXISTS
     audit_logs, 
     skill_demand, 
     daily_metrics, 
+    scrape_cursors, 
+    job_lsh_bands, 
+    dedup_decisions, 
+    dedup_counters, 
+    parse_cache, 
     monitoring_configs, 
     applications, 
     cover_letters, 
     projects, 
     match_scores, 
+    job_embeddings, 
     jobs, 
     resumes, 
     users 
@@ -104,6 +110,7 @@ CREATE TABLE resumes (
 CREATE INDEX idx_resumes_user ON resumes(user_id);
 CREATE INDEX idx_resumes_is_base ON resumes(is_base);
 CREATE INDEX idx_resumes_parent ON resumes(parent_resume_id);
+CREATE INDEX idx_resumes_created_at_id ON resumes(created_at DESC, id DESC);  -- keyset pagination
 
 -- =====================================================
 -- JOBS
@@ -124,8 +131,17 @@ CREATE TABLE jobs (
     company_url VARCHAR(500),
     location VARCHAR(255),
     is_remote BOOLEAN DEFAULT false,
-    employment_type VARCHAR(50),  -- full-time, contract, part-time
-    seniority_level VARCHAR(50),  -- entry, mid, senior, lead, principal
+    work_mode VARCHAR(10),        -- remote, hybrid, onsite
+    employment_type VARCHAR(50),  -- full_time, part_time, contract, temporary, internship, freelance
+    seniority_level VARCHAR(50),  -- intern, junior, mid, senior, lead, principal, executive
+    
+    -- Compensation and requirements (extracted; see app/services/job_attributes.py)
+    salary_min NUMERIC(12, 2),
+    salary_max NUMERIC(12, 2),
+    salary_currency CHAR(3),      -- ISO 4217
+    salary_period VARCHAR(10),    -- hour, day, week, month, year
+    experience_min_years INTEGER,
+    experience_max_years INTEGER,
     
     -- Dates
     posted_date TIMESTAMP,
@@ -135,6 +151,7 @@ CREATE TABLE jobs (
     
     -- Content
     raw_text TEXT,
+    enrich_attempts INTEGER DEFAULT 0,  -- Failed detail-page fetches
     description TEXT,
     requirements TEXT,
     responsibilities TEXT,
@@ -167,6 +184,14 @@ CREATE TABLE jobs (
     -- Content hashing for deduplication
     content_hash VARCHAR(64),  -- SHA256 of normalized content
     fingerprint VARCHAR(64),   -- Perceptual hash
+    minhash JSONB,             -- MinHash signature (64 ints) for near-duplicates
+    
+    -- Full-text search (app/services/search.py); title > company > description
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(raw_text, '')), 'C')
+    ) STORED,
     
     -- Status
     status VARCHAR(50) DEFAULT 'scraped',
@@ -186,10 +211,21 @@ CREATE INDEX idx_jobs_status ON jobs(status);
 CREATE INDEX idx_jobs_is_scam ON jobs(is_scam);
 CREATE INDEX idx_jobs_content_hash ON jobs(content_hash);
 CREATE INDEX idx_jobs_scraped_at ON jobs(scraped_at DESC);
+CREATE INDEX idx_jobs_scraped_at_id ON jobs(scraped_at DESC, id DESC);  -- keyset pagination
+CREATE INDEX idx_jobs_salary_min ON jobs(salary_min);
+CREATE INDEX idx_jobs_salary_max ON jobs(salary_max);
+CREATE INDEX idx_jobs_salary_currency ON jobs(salary_currency);
+CREATE INDEX idx_jobs_experience_min_years ON jobs(experience_min_years);
+CREATE INDEX idx_jobs_seniority_level ON jobs(seniority_level);
+CREATE INDEX idx_jobs_work_mode ON jobs(work_mode);
+CREATE INDEX idx_jobs_employment_type ON jobs(employment_type);
 
 -- GIN index for JSONB queries
 CREATE INDEX idx_jobs_parsed_json ON jobs USING GIN (parsed_json);
 
+-- GIN index for full-text search
+CREATE INDEX idx_jobs_search_vector ON jobs USING GIN (search_vector);
+
 -- =====================================================
 -- MATCH SCORES
 -- =====================================================
@@ -201,7 +237,7 @@ CREATE TABLE match_scores (
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     
     -- Overall score
-    total_score INTEGER NOT NULL CHECK (total_score >= 0 AND total_score <= 100),
+    total_score REAL NOT NULL CHECK (total_score >= 0 AND total_score <= 100),
     
     -- Breakdown
     required_skills_score INTEGER CHECK (required_skills_score >= 0 AND required_skills_score <= 100),
@@ -217,6 +253,10 @@ CREATE TABLE match_scores (
     missing_skills JSONB DEFAULT '[]'::jsonb,
     match_breakdown JSONB DEFAULT '{}'::jsonb,
     
+    -- Staleness: rows are recomputed when either no longer matches
+    scorer_version VARCHAR(20) NOT NULL,
+    resume_hash CHAR(64) NOT NULL,  -- SHA256 of the scored resume content
+    
     -- Timestamps
     calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
@@ -224,9 +264,21 @@ CREATE TABLE match_scores (
 );
 
 CREATE INDEX idx_match_scores_job ON match_scores(job_id);
-CREATE INDEX idx_match_scores_resume ON match_scores(resume_id);
-CREATE INDEX idx_match_scores_user ON match_scores(user_id);
-CREATE INDEX idx_match_scores_total ON match_scores(total_score DESC);
+CREATE INDEX idx_match_scores_resume_score ON match_scores(resume_id, total_score DESC);
+CREATE INDEX idx_match_scores_user_score ON match_scores(user_id, total_score DESC);
+
+-- =====================================================
+-- EMBEDDINGS
+-- =====================================================
+
+-- float32 vectors served from an in-process IVF index (app/services/embeddings.py)
+CREATE TABLE job_embeddings (
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL UNIQUE REFERENCES jobs(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,  -- hashed-256-v1 or a sentence-transformers model name
+    vector BYTEA NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
 
 -- =====================================================
 -- PROJECTS
@@ -431,6 +483,76 @@ CREATE TABLE monitoring_configs (
 CREATE INDEX idx_monitoring_configs_user ON monitoring_configs(user_id);
 CREATE INDEX idx_monitoring_configs_active ON monitoring_configs(is_active);
 
+-- =====================================================
+-- INCREMENTAL SCRAPING CURSORS
+-- =====================================================
+
+CREATE TABLE scrape_cursors (
+    id SERIAL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL,   -- adzuna, remoteok, indeed, linkedin
+    query VARCHAR(255) NOT NULL,   -- normalized (lower-cased) role
+    region VARCHAR(255) NOT NULL,  -- normalized (lower-cased) region
+    
+    -- High-water mark
+    last_posted_date TIMESTAMP,
+    seen_ids JSONB DEFAULT '[]'::jsonb,  -- recent external ids / URLs
+    
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT uq_scrape_cursors_source_query_region UNIQUE (source, query, region)
+);
+
+-- =====================================================
+-- NEAR-DUPLICATE DETECTION (MinHash LSH)
+-- =====================================================
+
+CREATE TABLE job_lsh_bands (
+    id SERIAL PRIMARY KEY,
+    bucket VARCHAR(40) NOT NULL,  -- "<band>:<hash of band rows>"
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_job_lsh_bands_bucket ON job_lsh_bands(bucket);
+CREATE INDEX idx_job_lsh_bands_job_id ON job_lsh_bands(job_id);
+
+-- Append-only log of scraped jobs collapsed into a known job
+CREATE TABLE dedup_decisions (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,  -- url, content_hash, fuzzy
+    url TEXT NOT NULL,          -- the duplicate that was not stored
+    source VARCHAR(50),
+    canonical_job_id INTEGER,   -- no FK: the log outlives cleaned-up jobs
+    canonical_url TEXT,
+    confidence FLOAT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_dedup_decisions_canonical_job_id ON dedup_decisions(canonical_job_id);
+CREATE INDEX idx_dedup_decisions_created_at ON dedup_decisions(created_at);
+CREATE INDEX idx_dedup_decisions_url ON dedup_decisions(url);  -- first decision per (url, kind) counts
+
+-- Running totals per kind (dashboard reads these instead of scanning)
+CREATE TABLE dedup_counters (
+    kind VARCHAR(20) PRIMARY KEY,
+    count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =====================================================
+-- PARSE CACHE
+-- =====================================================
+
+-- Job description parses keyed by sha256(parser, version, normalized text)
+CREATE TABLE parse_cache (
+    key CHAR(64) PRIMARY KEY,
+    parser VARCHAR(50) NOT NULL,     -- job_parser, llm_jd
+    version VARCHAR(100) NOT NULL,   -- bumping it invalidates old entries
+    result JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_parse_cache_parser ON parse_cache(parser);
+
 -- =====================================================
 -- ANALYTICS & METRICS
 -- =====================================================
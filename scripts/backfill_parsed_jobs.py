@@ -0,0 +1,38 @@
+"""
+Script to (re-)parse stored job descriptions into parsed_json and the
+structured salary/experience/seniority columns.
+
+Parsing is spread over a process pool, so tens of thousands of rows use all
+cores; run it alongside the API rather than through it.
+
+Usage:
+    python scripts/backfill_parsed_jobs.py          # jobs without parsed_json
+    python scripts/backfill_parsed_jobs.py --all    # re-parse every job
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.parser import parser_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill parsed_json for stored jobs")
+    parser.add_argument("--all", action="store_true", help="Re-parse jobs that already have parsed_json")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Jobs per read/parse/write round")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        count = parser_service.backfill(only_missing=not args.all, batch_size=args.batch_size)
+    finally:
+        parser_service.shutdown()
+    print(f"Parsed {count} jobs")
+
+
+if __name__ == "__main__":
+    main()
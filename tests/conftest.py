@@ -0,0 +1,67 @@
+"""
+Shared fixtures. Each test that touches the database gets its own SQLite
+file, bound to both the sync and the async session factories, and the
+in-process service singletons start empty.
+"""
+import os
+import sys
+
+# Before app.database builds its engines from the settings
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")  # LLM clients are built at import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.database as database
+import app.models  # noqa: F401 (registers the tables)
+
+
+def _reset_services():
+    from app.services.embeddings import embedding_service
+    from app.services.matcher import matcher_service
+    from app.services.parse_cache import parse_cache
+    from app.services.url_filter import url_filter
+
+    url_filter._bloom = None
+    parse_cache._lru.clear()
+    matcher_service.reset()
+    embedding_service.reset()
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    from app.services.search import search_index
+
+    path = tmp_path / "test.db"
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(database, "engine", sync_engine)
+    monkeypatch.setattr(database, "async_engine", async_engine)
+    database.SessionLocal.configure(bind=sync_engine)
+    database.AsyncSessionLocal.configure(bind=async_engine)
+    database.Base.metadata.create_all(sync_engine)
+    search_index.ensure(sync_engine)
+    _reset_services()
+    yield sync_engine
+    _reset_services()
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # No context manager: the lifespan would start the scheduler and browser pool
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(engine):
+    session = database.SessionLocal()
+    yield session
+    session.close()
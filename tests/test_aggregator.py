@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from app.tools.real_job_apis import JobAPIAggregator
+
+
+def test_sources_run_concurrently_and_slow_or_broken_ones_are_dropped(monkeypatch):
+    aggregator = JobAPIAggregator()
+
+    async def search_source(client, name, query, location, limit, cursor=None):
+        if name == "remoteok":
+            await asyncio.sleep(5)
+        await asyncio.sleep(0.2)
+        if name == "indeed":
+            raise RuntimeError("feed down")
+        return [{"url": f"https://{name}.example/1", "source": name}]
+
+    monkeypatch.setattr(aggregator, "_search_source", search_source)
+
+    started = time.monotonic()
+    jobs = asyncio.run(aggregator.asearch_all_platforms(
+        "python", "London", timeouts={"remoteok": 0.3}, client=object()
+    ))
+
+    assert [job["source"] for job in jobs] == ["adzuna"]
+    # Sequential calls would take at least 0.2 + 0.3 + 0.2 seconds
+    assert time.monotonic() - started < 0.6
+
+
+def test_unknown_platforms_are_ignored(monkeypatch):
+    aggregator = JobAPIAggregator()
+    searched = []
+
+    async def search_source(client, name, *args, **kwargs):
+        searched.append(name)
+        return []
+
+    monkeypatch.setattr(aggregator, "_search_source", search_source)
+
+    asyncio.run(aggregator.asearch_all_platforms(platforms=["Indeed", "monster"], client=object()))
+
+    assert searched == ["indeed"]
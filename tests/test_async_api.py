@@ -0,0 +1,39 @@
+from app.api.endpoints import auth
+from app.core.config import settings
+from app.models import Application, Job
+
+API = settings.API_V1_STR
+
+
+def test_dashboard_counts_and_score_buckets(client, db):
+    db.add_all([
+        Job(url=f"https://jobs.example/{i}", title="Engineer", company="Acme", match_score=score, is_scam=i == 0)
+        for i, score in enumerate([10.0, 55.0, 60.0, 95.0])
+    ])
+    db.add(Application(job_id=2, status="submitted"))
+    db.commit()
+
+    stats = client.get(f"{API}/dashboard/stats").json()
+    distribution = client.get(f"{API}/dashboard/match-distribution").json()
+
+    assert stats == {"jobs_scraped": 4, "applications_sent": 1, "interviews": 0, "scams_blocked": 1}
+    assert distribution == {"0-20": 1, "21-40": 0, "41-60": 2, "61-80": 0, "81-100": 1}
+
+
+def test_register_login_and_update_profile(client, monkeypatch):
+    # Only the session handling is under test; skip bcrypt's deliberate slowness
+    monkeypatch.setattr(auth, "get_password_hash", lambda password: f"plain:{password}")
+    monkeypatch.setattr(auth, "verify_password", lambda password, hashed: hashed == f"plain:{password}")
+    user = {"email": "ada@example.com", "password": "correct horse", "full_name": "Ada"}
+
+    assert client.post(f"{API}/auth/register", json=user).status_code == 201
+    assert client.post(f"{API}/auth/register", json=user).status_code == 400
+    assert client.post(f"{API}/auth/login", data={"username": user["email"], "password": "wrong"}).status_code == 401
+
+    token = client.post(f"{API}/auth/login", data={"username": user["email"], "password": user["password"]}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    updated = client.put(f"{API}/auth/me", params={"full_name": "Ada Lovelace"}, headers=headers)
+
+    assert updated.json()["full_name"] == "Ada Lovelace"
+    # Written through the request's session, so a later request sees it
+    assert client.get(f"{API}/auth/me", headers=headers).json()["full_name"] == "Ada Lovelace"
@@ -0,0 +1,254 @@
+import asyncio
+import threading
+
+import pytest
+
+import app.services.browser_pool as browser_pool_module
+from app.services.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, headless=True):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_pool_module, "async_playwright", lambda: fake)
+    return fake
+
+
+def test_checkouts_reuse_one_browser_and_context(playwright):
+    pool = BrowserPool(max_contexts=2)
+
+    async def run():
+        async with pool.page() as first:
+            pass
+        async with pool.page() as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert len(playwright.browsers) == 1
+    assert len(playwright.browsers[0].contexts) == 1
+
+
+def test_concurrent_checkouts_are_bounded(playwright):
+    pool = BrowserPool(max_contexts=2)
+    peak = 0
+
+    async def use():
+        nonlocal peak
+        async with pool.page():
+            peak = max(peak, pool.health()["in_use"])
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(use() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert len(playwright.browsers[0].contexts) == 2
+
+
+def test_contexts_are_recycled_after_max_uses(playwright):
+    pool = BrowserPool(max_contexts=1, max_uses=2)
+
+    async def run():
+        for _ in range(3):
+            async with pool.page():
+                pass
+
+    asyncio.run(run())
+
+    first, second = playwright.browsers[0].contexts
+    assert first.closed and not second.closed
+
+
+def test_a_disconnected_browser_is_relaunched(playwright):
+    pool = BrowserPool()
+
+    async def run():
+        async with pool.page():
+            pass
+        playwright.browsers[0].connected = False
+        async with pool.page():
+            pass
+
+    asyncio.run(run())
+
+    assert pool.health()["launches"] == 2
+    assert len(playwright.browsers[1].contexts) == 1
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = type("Request", (), {"resource_type": resource_type, "url": url})()
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+@pytest.mark.parametrize("resource_type, url, outcome", [
+    ("document", "https://jobs.example/list", "continue"),
+    ("script", "https://jobs.example/app.js", "continue"),
+    ("image", "https://jobs.example/logo.png", "abort"),
+    ("stylesheet", "https://jobs.example/site.css", "abort"),
+    ("font", "https://fonts.example/inter.woff2", "abort"),
+    ("script", "https://www.googletagmanager.com/gtm.js", "abort"),
+])
+def test_lean_pages_block_heavy_and_tracking_requests(resource_type, url, outcome):
+    route = FakeRoute(resource_type, url)
+
+    asyncio.run(browser_pool_module._block_heavy_requests(route))
+
+    assert route.outcome == outcome
+
+
+def test_lean_and_full_contexts_are_pooled_separately(playwright):
+    pool = BrowserPool(max_contexts=2)
+
+    async def run():
+        async with pool.page(lean=True):
+            pass
+        async with pool.page():
+            pass
+        async with pool.page(lean=True):
+            pass
+
+    asyncio.run(run())
+
+    lean, full = playwright.browsers[0].contexts
+    assert lean.routes == ["**/*"] and full.routes == []
+
+
+@pytest.fixture
+def other_loop():
+    """An event loop running on its own thread, like the API's."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_moving_to_a_new_loop_closes_the_old_browser(playwright, other_loop):
+    pool = BrowserPool()
+
+    async def use():
+        async with pool.page():
+            pass
+
+    asyncio.run_coroutine_threadsafe(use(), other_loop).result()
+    asyncio.run(use())
+    # The close was handed to the old loop; give it a moment to run
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop).result()
+
+    first, second = playwright.browsers
+    assert not first.connected and first.contexts[0].closed
+    assert second.connected
+
+
+def test_a_pool_busy_on_another_loop_is_not_taken_over(playwright, other_loop):
+    pool = BrowserPool()
+    checked_out, release = threading.Event(), threading.Event()
+
+    async def hold():
+        async with pool.page():
+            checked_out.set()
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+
+    held = asyncio.run_coroutine_threadsafe(hold(), other_loop)
+    checked_out.wait()
+
+    async def use():
+        async with pool.page():
+            pass
+
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(use())
+    finally:
+        release.set()
+        held.result(timeout=5)
+    assert playwright.browsers[0].connected
+
+
+def test_scheduled_scrapes_run_on_the_api_loop(other_loop):
+    from app.scheduler import JobMonitor
+
+    monitor = JobMonitor()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    monitor.loop = other_loop
+    assert monitor._run(current_loop()) is other_loop
+
+    # Without an API loop, one private loop is reused across runs
+    monitor.loop = None
+    assert monitor._run(current_loop()) is monitor._run(current_loop())
+    monitor._own_loop.close()
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, _async_url
+from app.models import Job
+
+
+@pytest.mark.parametrize("url, async_url, connect_args", [
+    ("sqlite:///./career_agent.db", "sqlite+aiosqlite:///./career_agent.db", {"check_same_thread": False}),
+    ("sqlite://", "sqlite+aiosqlite://", {"check_same_thread": False}),
+    (
+        "postgresql://u:p@db:5432/jobs",
+        "postgresql+asyncpg://u:p@db:5432/jobs?prepared_statement_cache_size=0",
+        {"statement_cache_size": 0}
+    ),
+    (
+        "postgresql+psycopg2://u:p@db/jobs",
+        "postgresql+asyncpg://u:p@db/jobs?prepared_statement_cache_size=0",
+        {"statement_cache_size": 0}
+    ),
+    (
+        "postgresql://u:p@db:6543/jobs?sslmode=require",
+        "postgresql+asyncpg://u:p@db:6543/jobs?prepared_statement_cache_size=0",
+        {"statement_cache_size": 0, "ssl": "require"}
+    ),
+    (
+        "postgresql://u:p@db/jobs?sslmode=verify-full&application_name=api",
+        "postgresql+asyncpg://u:p@db/jobs?application_name=api&prepared_statement_cache_size=0",
+        {"statement_cache_size": 0, "ssl": "verify-full"}
+    ),
+    (
+        "postgresql://u:p@db/jobs?prepared_statement_cache_size=100",
+        "postgresql+asyncpg://u:p@db/jobs?prepared_statement_cache_size=100",
+        {"statement_cache_size": 0}
+    ),
+    ("mysql://u:p@db/jobs", "mysql://u:p@db/jobs", {}),
+])
+def test_async_url_maps_to_the_asyncio_driver(url, async_url, connect_args):
+    mapped, args = _async_url(url)
+
+    assert mapped.render_as_string(hide_password=False) == async_url
+    assert args == connect_args
+
+
+def test_async_sessions_see_sync_writes_and_keep_objects_after_commit(db):
+    db.add(Job(url="https://jobs.example/1", title="Engineer", company="Acme"))
+    db.commit()
+
+    async def run():
+        async with AsyncSessionLocal() as session:
+            job = await session.scalar(select(Job))
+            job.title = "Staff Engineer"
+            await session.commit()
+            # No expiry on commit: reading needs no lazy load
+            return job.title
+
+    assert asyncio.run(run()) == "Staff Engineer"
+    db.expire_all()
+    assert db.query(Job.title).scalar() == "Staff Engineer"
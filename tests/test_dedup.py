@@ -0,0 +1,88 @@
+from app.models import DedupDecision, Job
+from app.services.dedup import SIMILARITY_THRESHOLD, dedup_engine, minhash, similarity
+from app.services.ingestion import job_ingestion_service
+from app.services.url_filter import BloomFilter, url_filter
+
+DESCRIPTION = (
+    "We are hiring a senior backend engineer to design and operate the payment platform. "
+    "You will build Python services on PostgreSQL, own reliability and mentor engineers."
+)
+
+
+def _job(url, description=DESCRIPTION, title="Senior Backend Engineer", company="Acme"):
+    return {"url": url, "title": title, "company": company, "description": description}
+
+
+def test_repeated_duplicates_are_counted_once(db):
+    job_ingestion_service.ingest(db, [_job("https://a.example/1")])
+
+    for _ in range(3):
+        job_ingestion_service.ingest(db, [_job("https://a.example/1"), _job("https://b.example/syndicated")])
+
+    assert dedup_engine.counts(db) == {"url": 1, "content_hash": 1}
+    assert db.query(DedupDecision).count() == 2
+
+
+def test_stored_url_missed_by_the_filter_is_a_url_repeat(db):
+    job_ingestion_service.ingest(db, [_job("https://a.example/1")])
+    # Loaded filter that hasn't seen the stored URL (e.g. inserted by another process)
+    url_filter._bloom = BloomFilter(1000)
+
+    result = job_ingestion_service.ingest(db, [_job("https://a.example/1")])
+
+    assert result.inserted == 0
+    assert result.duplicates == 0
+    assert [kind for (kind,) in db.query(DedupDecision.kind)] == ["url"]
+    assert db.query(Job).count() == 1
+
+
+def test_reworded_repost_is_a_fuzzy_duplicate(db):
+    job_ingestion_service.ingest(db, [_job("https://a.example/1")])
+    reworded = DESCRIPTION.replace("mentor engineers", "mentor other engineers") + " Apply today."
+
+    match = dedup_engine.check(db, "https://b.example/2", "Senior Backend Engineer", "Acme", reworded)
+
+    assert match.kind == "fuzzy"
+    assert match.job_id == db.query(Job.id).filter(Job.url == "https://a.example/1").scalar()
+    assert match.confidence >= SIMILARITY_THRESHOLD
+
+
+def test_near_duplicates_within_one_batch_are_dropped(db):
+    reworded = DESCRIPTION + " Hybrid in London."
+
+    result = job_ingestion_service.ingest(db, [_job("https://a.example/1"), _job("https://b.example/2", reworded)])
+
+    assert result.inserted == 1
+    assert result.duplicates == 1
+    assert dedup_engine.counts(db) == {"fuzzy": 1}
+
+
+def test_different_postings_are_not_duplicates(db):
+    job_ingestion_service.ingest(db, [_job("https://a.example/1")])
+    other = (
+        "Join our clinical research team as a data analyst. You will clean trial datasets in R, "
+        "write statistical reports and work with hospital partners across the region."
+    )
+
+    assert dedup_engine.check(db, "https://b.example/2", "Data Analyst", "Medico", other) is None
+
+
+def test_minhash_similarity_tracks_text_overlap():
+    signature = minhash("Engineer", "Acme", DESCRIPTION)
+
+    assert similarity(signature, minhash("Engineer", "Acme", DESCRIPTION)) == 1.0
+    assert similarity(signature, minhash("Engineer", "Acme", "Completely unrelated text about cooking pasta at home tonight")) < 0.2
+    # Too short to fingerprint reliably
+    assert minhash("Engineer", "Acme", "") is None
+
+
+def test_list_view_jobs_without_descriptions_are_not_collapsed(db):
+    openings = [
+        {"url": f"https://a.example/{i}", "title": "Software Engineer", "company": "Acme", "location": "London"}
+        for i in range(3)
+    ]
+
+    result = job_ingestion_service.ingest(db, openings)
+
+    assert result.inserted == 3
+    assert db.query(Job.content_hash).distinct().all() == [(None,)]
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from app.models import Job
+from app.services.embeddings import EmbeddingService, HashedEmbedder, IVFIndex
+
+
+def _clustered_vectors(count, dim, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.5 * rng.normal(size=(count, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def test_ivf_search_recalls_the_brute_force_neighbours():
+    vectors = _clustered_vectors(6000, 32)
+    ids = np.arange(1, len(vectors) + 1)
+    index = IVFIndex(32, nprobe=16, min_train=2000)
+    index.build(ids, vectors)
+    queries = _clustered_vectors(50, 32, seed=1)
+
+    hits = 0
+    for query in queries:
+        found, scores = index.search(query, 10)
+        exact = ids[np.argsort(-(vectors @ query))[:10]]
+        hits += len(set(found.tolist()) & set(exact.tolist()))
+        assert np.all(np.diff(scores) <= 0)
+
+    assert index._centroids is not None
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_upserts_replace_indexed_vectors():
+    vectors = _clustered_vectors(100, 16)
+    index = IVFIndex(16)
+    index.build(np.arange(100), vectors)
+
+    index.upsert(np.array([7]), vectors[[42]])
+    found, _ = index.search(vectors[42], 2)
+
+    assert set(found.tolist()) == {7, 42}
+    assert len(index) == 100
+
+
+def test_hashed_embeddings_keep_related_text_closer():
+    embedder = HashedEmbedder(256)
+
+    python, django, nursing = embedder.encode([
+        "Senior Python developer building Django REST APIs on PostgreSQL",
+        "Django and Python engineer for our REST API team",
+        "Registered nurse for night shifts on the cardiology ward",
+    ])
+
+    assert np.linalg.norm(python) == pytest.approx(1.0)
+    assert python @ django > python @ nursing
+
+
+def test_similar_jobs_matches_any_resume_section(engine, db):
+    db.add_all([
+        Job(url="https://jobs.example/1", title="Python Developer", company="A", raw_text="Django REST APIs on PostgreSQL"),
+        Job(url="https://jobs.example/2", title="Staff Nurse", company="B", raw_text="Cardiology ward night shifts"),
+        Job(url="https://jobs.example/3", title="Pastry Chef", company="C", raw_text="Croissants and laminated dough"),
+    ])
+    db.commit()
+    service = EmbeddingService(dim=256)
+
+    assert service.embed_pending() == 3
+    resume = "Python developer building Django REST APIs.\n\nPreviously a staff nurse on a cardiology ward."
+    ranked = service.similar_jobs(db, resume, limit=2)
+
+    assert {job_id for job_id, _ in ranked} == {1, 2}
+    assert service.embed_pending() == 0
@@ -0,0 +1,87 @@
+import asyncio
+
+from app.models import Job, ParseCacheEntry
+from app.services.enrichment import JobEnrichmentService, extract_description
+from app.services.parser import parser_service
+
+DESCRIPTION = (
+    "We are hiring a senior Python engineer to build data pipelines with FastAPI, "
+    "PostgreSQL and AWS. Remote within the UK, 5+ years of experience required."
+)
+
+
+def _store(db, i, raw_text=None, enrich_attempts=0):
+    job = Job(
+        url=f"https://jobs.example/{i}",
+        title=f"Python Engineer {i}",
+        company="Example Ltd",
+        raw_text=raw_text,
+        enrich_attempts=enrich_attempts
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_extract_description_prefers_the_host_selector():
+    html = (
+        "<main><p>Cookie banner and navigation that is long enough to pass the length check, "
+        "but it is not the posting.</p></main>"
+        f"<div id='jobDescriptionText'>{DESCRIPTION}</div>"
+    )
+
+    assert extract_description(html, "www.indeed.com") == DESCRIPTION
+    assert extract_description("<main>Too short</main>", "jobs.example") is None
+
+
+def test_pending_skips_described_and_exhausted_jobs(db):
+    waiting = _store(db, 1)
+    placeholder = _store(db, 2, raw_text="Description not fetched in list view")
+    _store(db, 3, raw_text=DESCRIPTION)
+    _store(db, 4, enrich_attempts=3)
+
+    service = JobEnrichmentService(max_attempts=3)
+
+    assert {job_id for job_id, _ in service.pending(10)} == {waiting, placeholder}
+
+
+def test_enrich_pending_writes_descriptions_and_counts_failures(db, monkeypatch):
+    found = _store(db, 1)
+    missing = _store(db, 2)
+    service = JobEnrichmentService(concurrency=2, batch_size=1)
+
+    async def fetch_description(client, url):
+        return DESCRIPTION if url.endswith("/1") else None
+
+    monkeypatch.setattr(service, "_fetch_description", fetch_description)
+
+    counts = asyncio.run(service.enrich_pending())
+
+    assert counts == {"enriched": 1, "failed": 1}
+    db.expire_all()
+    enriched, failed = db.get(Job, found), db.get(Job, missing)
+    assert enriched.raw_text == DESCRIPTION
+    assert "Python" in enriched.parsed_json["skills"]
+    assert enriched.work_mode == "remote"
+    assert enriched.content_hash
+    assert failed.raw_text is None and failed.enrich_attempts == 1
+
+
+def test_a_batch_is_parsed_in_one_call_on_the_writing_session(db, monkeypatch):
+    ids = [_store(db, i) for i in range(3)]
+    calls = []
+    parse_many = parser_service.parse_many
+
+    def record(raw_texts, db=None):
+        calls.append((len(raw_texts), db is not None))
+        return parse_many(raw_texts, db=db)
+
+    monkeypatch.setattr(parser_service, "parse_many", record)
+    service = JobEnrichmentService()
+
+    assert service._write_batch({job_id: f"{DESCRIPTION} Team {job_id}." for job_id in ids}) == 3
+
+    assert calls == [(3, True)]
+    assert db.query(ParseCacheEntry).count() == 3
+    db.expire_all()
+    assert all("Python" in db.get(Job, job_id).parsed_json["skills"] for job_id in ids)
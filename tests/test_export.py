@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import app.api.export as export_module
+from app.core.config import settings
+from app.models import Application, Job, MatchScore, Resume
+
+API = settings.API_V1_STR
+
+
+def _store_jobs(db, count):
+    db.add_all([
+        Job(url=f"https://jobs.example/{i}", title="Python Engineer" if i % 2 else "Nurse", company="Acme",
+            raw_text=f"Posting {i}", parsed_json={"skills": ["Python"]})
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def test_rows_are_written_in_batches(monkeypatch):
+    monkeypatch.setattr(export_module, "EXPORT_BATCH_SIZE", 2)
+    rows = [{"id": i, "tags": ["a"]} for i in range(5)]
+
+    ndjson = list(export_module._ndjson(iter(rows), ["id", "tags"]))
+    csv_chunks = list(export_module._csv(iter(rows), ["id", "tags"]))
+
+    assert [chunk.count("\n") for chunk in ndjson] == [2, 2, 1]
+    # The header rides with the first batch
+    assert [chunk.count("\n") for chunk in csv_chunks] == [3, 2, 1]
+
+
+def test_job_export_streams_ndjson(client, db):
+    _store_jobs(db, 5)
+
+    response = client.get(f"{API}/jobs/export", params={"fields": "title,raw_text"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="jobs.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0] == {"id": 1, "title": "Nurse", "raw_text": "Posting 0"}
+
+
+def test_job_export_csv_with_search_and_json_cells(client, db):
+    _store_jobs(db, 4)
+
+    response = client.get(f"{API}/jobs/export", params={"format": "csv", "q": "python", "fields": "title,parsed_json"})
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [
+        ["id", "title", "parsed_json"],
+        ["2", "Python Engineer", '{"skills": ["Python"]}'],
+        ["4", "Python Engineer", '{"skills": ["Python"]}'],
+    ]
+
+
+def test_job_export_rejects_unknown_fields(client):
+    assert client.get(f"{API}/jobs/export", params={"fields": "password"}).status_code == 400
+
+
+def test_application_export_includes_the_job(client, db):
+    _store_jobs(db, 1)
+    db.add_all([Application(job_id=1, status="submitted"), Application(job_id=1, status="rejected")])
+    db.commit()
+
+    rows = client.get(f"{API}/applications/export", params={"status": "submitted"}).text.splitlines()
+
+    assert [json.loads(row)["url"] for row in rows] == ["https://jobs.example/0"]
+
+
+def test_score_export_is_best_first_and_404s_for_unknown_resumes(client, db):
+    _store_jobs(db, 3)
+    db.add(Resume(content="Python", is_base=True))
+    db.add_all([
+        MatchScore(job_id=i, resume_id=1, total_score=score, scorer_version="1", resume_hash="test")
+        for i, score in ((1, 40.0), (2, 90.0), (3, 70.0))
+    ])
+    db.commit()
+
+    response = client.get(f"{API}/resumes/1/scores/export", params={"min_score": 50})
+
+    assert [json.loads(row)["job_id"] for row in response.text.splitlines()] == [2, 3]
+    assert client.get(f"{API}/resumes/2/scores/export").status_code == 404
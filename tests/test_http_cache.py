@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_cache import HTTPResponseCache
+
+FEED = b'[{"id": 1, "position": "Python Developer"}]'
+
+
+def _server(requests_seen, etag='"v1"'):
+    def handle(request):
+        requests_seen.append(request)
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag} if etag else {}
+        return httpx.Response(200, content=FEED, headers=headers)
+    return httpx.MockTransport(handle)
+
+
+def _fetch(cache, transport, params=None):
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await cache.fetch(client, "https://feed.example/api", params=params)
+    return asyncio.run(run())
+
+
+def test_unchanged_feed_is_served_from_disk(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path))
+    seen = []
+
+    first = _fetch(cache, _server(seen))
+    second = _fetch(cache, _server(seen))
+
+    assert not first.not_modified and second.not_modified
+    assert seen[1].headers["If-None-Match"] == '"v1"'
+    assert second.digest == first.digest
+    assert second.json() == [{"id": 1, "position": "Python Developer"}]
+
+
+def test_responses_without_validators_are_not_stored(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path))
+    seen = []
+
+    _fetch(cache, _server(seen, etag=None))
+    _fetch(cache, _server(seen, etag=None))
+
+    assert "If-None-Match" not in seen[1].headers
+    assert not list(tmp_path.iterdir())
+
+
+def test_query_parameters_are_part_of_the_key(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path))
+    seen = []
+
+    _fetch(cache, _server(seen), params={"q": "python"})
+    _fetch(cache, _server(seen), params={"q": "rust"})
+
+    assert "If-None-Match" not in seen[1].headers
+
+
+def test_http_errors_raise(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _fetch(cache, httpx.MockTransport(lambda request: httpx.Response(503)))
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from app.models import Job
+from app.services.ingestion import job_ingestion_service
+
+
+def _job(i, **extra):
+    return {
+        "url": f"https://example.com/jobs/{i}",
+        "title": f"Backend Engineer {i}",
+        "company": f"Company {i}",
+        "description": f"Posting number {i} with its own distinct description text {i * 7919}",
+        **extra
+    }
+
+
+def test_ingest_is_idempotent(db):
+    jobs = [_job(i) for i in range(3)]
+
+    first = job_ingestion_service.ingest(db, jobs)
+    second = job_ingestion_service.ingest(db, jobs)
+
+    assert first.inserted == 3
+    assert second.inserted == 0
+    assert second.skipped == 3
+    assert db.query(Job).count() == 3
+
+
+def test_ingest_skips_repeats_and_incomplete_jobs(db):
+    jobs = [_job(1), _job(1), {"url": "https://example.com/no-title", "company": "X"}]
+
+    result = job_ingestion_service.ingest(db, jobs)
+
+    assert result.inserted == 1
+    assert result.skipped == 2
+
+
+def test_ingest_update_existing_refreshes_rows(db):
+    job_ingestion_service.ingest(db, [_job(1)])
+
+    result = job_ingestion_service.ingest(db, [_job(1, title="Staff Engineer")], update_existing=True)
+
+    assert result.updated == 1
+    assert db.query(Job.title).filter(Job.url == _job(1)["url"]).scalar() == "Staff Engineer"
+
+
+def test_ingest_parses_posted_date_strings(db):
+    job_ingestion_service.ingest(db, [_job(1, posted_date="2026-03-01T12:30:00Z"), _job(2, posted_date="not a date")])
+
+    dates = dict(db.query(Job.url, Job.posted_date).all())
+    assert dates[_job(1)["url"]] == datetime(2026, 3, 1, 12, 30)
+    assert dates[_job(2)["url"]] is None
+
+
+def test_ingest_prepare_sees_only_new_rows(db):
+    job_ingestion_service.ingest(db, [_job(1)])
+    seen = []
+
+    def prepare(rows):
+        seen.extend(row["url"] for row in rows)
+        return rows
+
+    job_ingestion_service.ingest(db, [_job(1), _job(2)], prepare=prepare)
+
+    assert seen == [_job(2)["url"]]
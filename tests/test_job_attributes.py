@@ -0,0 +1,64 @@
+import pytest
+
+from app.services.job_attributes import extract_experience, extract_job_attributes, extract_salary
+
+
+def _salary(low, high, currency, period):
+    return {"salary_min": low, "salary_max": high, "salary_currency": currency, "salary_period": period}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120,000 - $150,000 per year", _salary(120000, 150000, "USD", "year")),
+    ("Competitive base of $80-100k", _salary(80000, 100000, "USD", "year")),
+    ("£30 per hour", _salary(30, 30, "GBP", "hour")),
+    ("€4,500 monthly", _salary(4500, 4500, "EUR", "month")),
+    ("90,000 EUR", _salary(90000, 90000, "EUR", "year")),
+    ("CTC 12-18 LPA", _salary(1200000, 1800000, "INR", "year")),
+    ("We raised $20M in Series B funding. Pay: $100,000", _salary(100000, 100000, "USD", "year")),
+    ("Backed by $5,000,000 in funding; salary $90k-$120k per year", _salary(90000, 120000, "USD", "year")),
+    ("Revenue of $3,000,000 last year. We pay $45/hr", _salary(45, 45, "USD", "hour")),
+    ("A team with $2.5m ARR", {}),
+    ("No figures here", {}),
+])
+def test_extract_salary(text, expected):
+    assert extract_salary(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5+ years of experience", (5, None)),
+    ("2-4 years of experience in Python", (2, 4)),
+    ("At least three years of backend work", (3, None)),
+    ("3+ years of Python, 5+ years overall", (5, None)),
+    ("Founded 20 years ago", (None, None)),
+    ("", (None, None)),
+])
+def test_extract_experience(text, expected):
+    assert extract_experience(text) == expected
+
+
+@pytest.mark.parametrize("location, text, expected", [
+    ("Remote", None, "remote"),
+    ("London (Hybrid)", None, "hybrid"),
+    (None, "No remote work. Must be on-site.", "onsite"),
+    (None, "Remote Sensing lab, onsite only", "onsite"),
+    (None, "This is not a remote role", "onsite"),
+    (None, "Fully remote, with occasional on-site visits", "remote"),
+    (None, "Work from home two days a week", "remote"),
+    (None, "Join our Remote Sensing group", None),
+])
+def test_work_mode(location, text, expected):
+    assert extract_job_attributes(text, title="Engineer", location=location)["work_mode"] == expected
+
+
+@pytest.mark.parametrize("title, text, expected", [
+    ("Product Manager", None, None),
+    ("Senior Product Manager", None, "senior"),
+    ("Account Manager", "5+ years of experience", "senior"),
+    ("Engineering Manager", None, "lead"),
+    ("Tech Lead", None, "lead"),
+    ("Staff Engineer", None, "principal"),
+    ("VP of Engineering", None, "executive"),
+    ("Software Engineer", "an entry-level role", "junior"),
+])
+def test_seniority(title, text, expected):
+    assert extract_job_attributes(text, title=title)["seniority_level"] == expected
@@ -0,0 +1,120 @@
+from datetime import datetime
+
+import pytest
+
+from app.api.endpoints.jobs import LIST_FIELDS
+from app.core.config import settings
+from app.models import Job
+from app.sources.base import JobRecord
+from app.sources.registry import ScrapeBatch, source_registry
+
+
+def _collect(records):
+    async def collect(query, region, names, **kwargs):
+        return ScrapeBatch(records=records)
+    return collect
+
+
+def test_scrape_saves_jobs_from_a_worker_session(client, db, monkeypatch):
+    records = [
+        JobRecord(url=f"https://example.com/{i}", title="Engineer", company="Acme", source="fake",
+                  description=f"Python and SQL role number {i}")
+        for i in range(2)
+    ]
+    monkeypatch.setattr(source_registry, "collect", _collect(records))
+
+    response = client.post(f"{settings.API_V1_STR}/jobs/scrape", params={"region": "remote", "role": "python"})
+
+    assert response.status_code == 200
+    assert response.json()["jobs_found"] == 2
+    assert db.query(Job).count() == 2
+
+
+def test_scrape_reports_save_failures_as_errors(client, monkeypatch):
+    from app.services.ingestion import job_ingestion_service
+
+    def ingest(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    records = [JobRecord(url="https://example.com/1", title="Engineer", company="Acme", source="fake")]
+    monkeypatch.setattr(source_registry, "collect", _collect(records))
+    monkeypatch.setattr(job_ingestion_service, "ingest", ingest)
+
+    response = client.post(f"{settings.API_V1_STR}/jobs/scrape", params={"region": "remote", "role": "python"})
+
+    assert response.status_code == 500
+    assert "disk full" not in response.text
+
+
+def test_search_filters_and_pages_by_rank(client, db):
+    db.add_all([
+        Job(url=f"https://example.com/{i}", title="Python Engineer" if i % 2 else "Engineer", company="Acme",
+            raw_text="Python services", work_mode="remote" if i < 5 else "onsite")
+        for i in range(8)
+    ])
+    db.commit()
+    url = f"{settings.API_V1_STR}/jobs/search"
+
+    first = client.get(url, params={"q": "python", "work_mode": "remote", "limit": 3, "fields": "title"})
+    second = client.get(url, params={
+        "q": "python", "work_mode": "remote", "limit": 3, "fields": "title", "cursor": first.headers["X-Next-Cursor"]
+    })
+
+    page = first.json() + second.json()
+    assert [job["id"] for job in page] == [2, 4, 1, 3, 5]
+    # Title matches rank first; the rest are tied and fall back to id order
+    assert [job["title"] for job in page[:2]] == ["Python Engineer"] * 2
+    assert "X-Next-Cursor" not in second.headers
+    assert client.get(url, params={"q": "   "}).json() == []
+
+
+def test_job_list_walks_pages_with_the_cursor(client, db):
+    db.add_all([
+        Job(url=f"https://example.com/{i}", title="Engineer", company="Acme", scraped_at=datetime(2026, 5, 1 + i // 2))
+        for i in range(5)
+    ])
+    db.commit()
+    url = f"{settings.API_V1_STR}/jobs/"
+
+    ids, params = [], {"limit": 2, "fields": "id"}
+    while True:
+        response = client.get(url, params=params)
+        ids += [job["id"] for job in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert ids == [5, 4, 3, 2, 1]
+    assert client.get(url, params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_job_list_returns_only_requested_fields(client, db):
+    db.add(Job(url="https://example.com/1", title="Engineer", company="Acme", raw_text="Long description",
+               posted_date=datetime(2026, 5, 1)))
+    db.commit()
+    url = f"{settings.API_V1_STR}/jobs/"
+
+    projected = client.get(url, params={"fields": "company, posted_date,title"}).json()
+    default = client.get(url).json()
+
+    # id always comes along; keys follow LIST_FIELDS order
+    assert projected == [{"id": 1, "title": "Engineer", "company": "Acme", "posted_date": "2026-05-01T00:00:00"}]
+    assert list(default[0]) == list(LIST_FIELDS)
+
+
+@pytest.mark.parametrize("fields", ["title,salary", "raw_text"])
+def test_unknown_list_fields_are_a_400(client, fields):
+    response = client.get(f"{settings.API_V1_STR}/jobs/", params={"fields": fields})
+
+    assert response.status_code == 400
+    assert fields.split(",")[-1] in response.json()["detail"]
+
+
+def test_job_detail_includes_the_description(client, db):
+    db.add(Job(url="https://example.com/1", title="Engineer", company="Acme", raw_text="Long description"))
+    db.commit()
+
+    job = client.get(f"{settings.API_V1_STR}/jobs/1").json()
+
+    assert job["raw_text"] == "Long description"
+    assert client.get(f"{settings.API_V1_STR}/jobs/2").status_code == 404
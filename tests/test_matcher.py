@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+import pytest
+
+import app.services.matcher as matcher_module
+from app.models import Job, MatchScore, Resume
+from app.services.matcher import NEUTRAL_SCORE, Matcher, SkillMatrix
+
+
+def _store(db, i, skills):
+    db.add(Job(
+        url=f"https://jobs.example/{i}",
+        title=f"Engineer {i}",
+        company="Acme",
+        parsed_json={"skills": skills}
+    ))
+    db.commit()
+
+
+def test_score_is_the_share_of_job_skills_the_resume_covers():
+    matcher = Matcher()
+    jobs = [
+        {"parsed_json": {"skills": ["Python", "Docker"]}},
+        {"parsed_json": {"skills": ["Python"]}},
+        {"parsed_json": {"skills": ["General"]}},
+    ]
+
+    assert matcher.score_jobs("Five years of Python", jobs) == [50.0, 100.0, NEUTRAL_SCORE]
+
+
+def test_unparsed_jobs_are_scored_from_their_text():
+    matcher = Matcher()
+
+    assert matcher.compute_match_score("Python and Docker", {"title": "Python Developer", "raw_text": "We use Kubernetes"}) == 50
+
+
+def _dense(matrix):
+    dense = np.zeros((len(matrix), matrix.width))
+    for i in range(len(matrix)):
+        dense[i, matrix.row(i)] = 1
+    return dense
+
+
+def test_sparse_skill_matrix_matches_its_dense_counterpart():
+    matrix = SkillMatrix.from_rows(6, [[0, 2], [], [1, 2, 5]]).vstack(SkillMatrix.from_rows(6, [[3], [0, 4]]))
+    dense = _dense(matrix)
+    vector = np.arange(1, 7, dtype=np.float32)
+
+    assert matrix.dot(vector) == pytest.approx(dense @ vector)
+    assert matrix.column_counts().tolist() == dense.sum(axis=0).tolist()
+    assert _dense(matrix.take([4, 1, 0])).tolist() == dense[[4, 1, 0]].tolist()
+
+    updated = matrix.with_rows({1: [3, 5], 2: []})
+    dense[1, [3, 5]] = 1
+    dense[2] = 0
+    assert _dense(updated).tolist() == dense.tolist()
+    assert updated.row(1).tolist() == [3, 5]
+    # The original is left as it was
+    assert matrix.row(2).tolist() == [1, 2, 5]
+
+
+def test_rank_weighs_rare_skills_more(db):
+    for i in range(3):
+        _store(db, i, ["Python"])
+    _store(db, 3, ["Python", "Rust"])
+    matcher = Matcher()
+
+    ranked = dict(matcher.rank(db, "Rust"))
+
+    # Python is in all four jobs (weight 1), Rust in one: covering Rust is worth more
+    rust = math.log(5 / 2) + 1
+    assert ranked[4] == pytest.approx(100 * rust / (1 + rust), abs=0.1)
+    assert [ranked[i] for i in (1, 2, 3)] == [0.0, 0.0, 0.0]
+
+
+def test_rank_orders_best_first_and_picks_up_new_and_re_parsed_jobs(db):
+    _store(db, 1, ["Java"])
+    _store(db, 2, ["Python"])
+    matcher = Matcher()
+
+    assert matcher.rank(db, "Python", limit=1) == [(2, 100.0)]
+
+    _store(db, 3, ["Python", "Java"])
+    matcher.update_jobs({1: ["Python"]})
+
+    assert [job_id for job_id, _ in matcher.rank(db, "Python")] == [1, 2, 3]
+
+
+def test_sync_scores_only_scores_what_changed(db, monkeypatch):
+    _store(db, 1, ["Python", "Docker"])
+    _store(db, 2, ["Java"])
+    resume = Resume(content="Python developer", is_base=True)
+    db.add(resume)
+    db.commit()
+    matcher = Matcher()
+
+    assert matcher.sync_scores() == 2
+    assert matcher.sync_scores() == 0
+
+    _store(db, 3, ["Python"])
+    assert matcher.sync_scores() == 1
+
+    resume.content = "Python and Docker developer"
+    db.commit()
+    assert matcher.sync_scores() == 3
+
+    monkeypatch.setattr(matcher_module, "MATCH_SCORER_VERSION", "test")
+    assert matcher.sync_scores() == 3
+
+    db.expire_all()
+    score = db.query(MatchScore).filter(MatchScore.job_id == 1).one()
+    assert score.total_score == 100.0
+    assert score.matched_skills == ["Docker", "Python"] and score.missing_skills == []
+    assert db.query(MatchScore).count() == 3
+
+
+def test_sync_scores_skips_other_resumes_unless_asked(db):
+    _store(db, 1, ["Python"])
+    db.add_all([Resume(content="Python", is_base=True), Resume(content="Java", is_base=False)])
+    db.commit()
+    matcher = Matcher()
+
+    assert matcher.sync_scores() == 1
+    assert matcher.sync_scores(resume_ids=[2]) == 1
+    assert dict(db.query(MatchScore.resume_id, MatchScore.total_score)) == {1: 100.0, 2: 0.0}
+
+
+def test_stored_scores_do_not_depend_on_the_rest_of_the_corpus(db):
+    _store(db, 1, ["Python", "Rust"])
+    db.add(Resume(content="Rust", is_base=True))
+    db.commit()
+    matcher = Matcher()
+    matcher.sync_scores()
+
+    # New Python-only jobs make Rust rarer, so live ranking now favours job 1...
+    for i in range(2, 5):
+        _store(db, i, ["Python"])
+    assert dict(matcher.rank(db, "Rust"))[1] > 50.0
+    assert matcher.sync_scores() == 3
+
+    # ...while its stored score and a fresh one computed now still agree
+    stored = dict(db.query(MatchScore.job_id, MatchScore.total_score))
+    assert stored == {1: 50.0, 2: 0.0, 3: 0.0, 4: 0.0}
+    assert matcher.compute_match_score("Rust", {"skills": ["Python", "Rust"]}) == 50
@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine, inspect, text
+
+from migrate_add_pipeline_tables import JOB_COLUMNS, NEW_TABLES, run_migration
+
+
+def _old_schema(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL)"))
+        conn.execute(text("CREATE TABLE resumes (id INTEGER PRIMARY KEY, content TEXT NOT NULL, created_at DATETIME)"))
+        conn.execute(text(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY, url VARCHAR NOT NULL, title VARCHAR NOT NULL, "
+            "company VARCHAR NOT NULL, raw_text TEXT, scraped_at DATETIME)"
+        ))
+        conn.execute(text("INSERT INTO jobs (url, title, company) VALUES ('https://jobs.example/1', 'Engineer', 'Acme')"))
+    return engine
+
+
+def test_migration_brings_an_old_schema_up_to_date_and_re_runs(tmp_path):
+    engine = _old_schema(tmp_path / "old.db")
+
+    run_migration(engine)
+    run_migration(engine)
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("jobs")}
+    assert set(JOB_COLUMNS) <= columns
+    assert all(inspector.has_table(model.__tablename__) for model in NEW_TABLES)
+    indexes = {index["name"] for index in inspector.get_indexes("jobs")}
+    assert {"ix_jobs_scraped_at_id", "ix_jobs_content_hash", "ix_jobs_salary_min"} <= indexes
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'engineer'")).scalars().all() == [1]
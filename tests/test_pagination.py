@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor, paginate
+from app.models import Job
+
+SCRAPED_AT = datetime(2026, 5, 1, 12)
+
+
+def _store(db, count, start=0, **extra):
+    db.add_all([
+        Job(url=f"https://jobs.example/{i}", title="Engineer", company="Acme", **{"scraped_at": SCRAPED_AT, **extra})
+        for i in range(start, start + count)
+    ])
+    db.commit()
+
+
+def _walk(db, order, key, limit=3):
+    pages, cursor = [], None
+    while True:
+        rows, next_key = paginate(db.query(Job.id, Job.scraped_at, Job.match_score), order, key, cursor, limit)
+        pages.append([row.id for row in rows])
+        if next_key is None:
+            return pages
+        cursor = encode_cursor(next_key)
+
+
+def test_cursor_round_trip():
+    values = [SCRAPED_AT, 87.5, None, "Acme"]
+
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 4) == [SCRAPED_AT.isoformat(), 87.5, None, "Acme"]
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor([1]), "eyJhIjogMX0"])
+def test_malformed_cursors_are_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+
+    assert error.value.status_code == 400
+
+
+def test_ties_on_the_sort_key_are_broken_by_id(db):
+    _store(db, 8)
+
+    pages = _walk(db, [(Job.scraped_at, True), (Job.id, True)], lambda row: [row.scraped_at, row.id])
+
+    assert pages == [[8, 7, 6], [5, 4, 3], [2, 1]]
+
+
+def test_mixed_directions_page_without_gaps_or_repeats(db):
+    _store(db, 4, match_score=90.0)
+    _store(db, 3, start=4, match_score=50.0)
+
+    pages = _walk(db, [(Job.match_score, True), (Job.id, False)], lambda row: [row.match_score, row.id])
+
+    assert pages == [[1, 2, 3], [4, 5, 6], [7]]
+
+
+def test_rows_inserted_mid_walk_do_not_shift_later_pages(db):
+    _store(db, 6)
+    order = [(Job.scraped_at, True), (Job.id, True)]
+    key = lambda row: [row.scraped_at, row.id]
+
+    first, next_key = paginate(db.query(Job.id, Job.scraped_at), order, key, None, 3)
+    _store(db, 2, start=6, scraped_at=SCRAPED_AT + timedelta(hours=1))
+    second, _ = paginate(db.query(Job.id, Job.scraped_at), order, key, encode_cursor(next_key), 3)
+
+    assert [row.id for row in first] == [6, 5, 4]
+    assert [row.id for row in second] == [3, 2, 1]
@@ -0,0 +1,52 @@
+import time
+
+from app.models import Job, ParseCacheEntry
+from app.services.ingestion import job_ingestion_service
+from app.services.parse_cache import parse_cache
+from app.services.parser import parser_service
+
+
+def _job(i):
+    return {
+        "url": f"https://example.com/jobs/{i}",
+        "title": f"Engineer {i}",
+        "company": "Acme",
+        "raw_text": f"Posting {i}: Python and SQL, 3+ years of experience",
+    }
+
+
+def test_parses_cached_mid_ingest_share_the_ingest_transaction(db, monkeypatch):
+    # Inline parsing; the process pool is not what this is about
+    monkeypatch.setattr(parser_service, "workers", 1)
+    jobs = [_job(i) for i in range(job_ingestion_service.CHUNK_SIZE * 2 + 200)]
+
+    def prepare(rows):
+        parsed = parser_service.parse_many([row["raw_text"] for row in rows], db=db)
+        for row, result in zip(rows, parsed):
+            row["parsed_json"] = result
+        return rows
+
+    started = time.monotonic()
+    result = job_ingestion_service.ingest(db, jobs, prepare=prepare)
+
+    # A second writer session would wait out SQLite's busy timeout per chunk
+    assert time.monotonic() - started < 5
+    assert result.inserted == len(jobs)
+    assert db.query(ParseCacheEntry).count() == len(jobs)
+    assert db.query(Job).filter(Job.parsed_json.is_(None)).count() == 0
+
+
+def test_get_or_parse_round_trips_through_the_table(engine):
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return {"skills": ["Python"]}
+
+    first = parse_cache.get_or_parse("test", "1", "Python  developer\n\n", parse)
+    parse_cache._lru.clear()
+    second = parse_cache.get_or_parse("test", "1", "Python developer", parse)
+
+    assert first == second == {"skills": ["Python"]}
+    assert calls == ["Python  developer\n\n"]
+    assert parse_cache.get_many("test", "2", ["Python developer"]) == {}
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services.politeness import PolitenessGate, RobotsCache, RobotsDisallowedError
+from app.services.rate_limiter import HostRateLimiter
+
+ROBOTS = """
+User-agent: *
+Disallow: /private/
+Crawl-delay: 2
+"""
+
+
+def _gate(robots=None):
+    return PolitenessGate(HostRateLimiter(default_interval=0), robots or RobotsCache("*"), user_agent="*")
+
+
+@pytest.mark.parametrize("status, private, public", [
+    (200, False, True),  # Parsed: only /private/ is disallowed
+    (404, True, True),  # No robots.txt means no restrictions
+    (503, False, False),  # Server errors mean assume full disallow
+    (None, False, False),  # Unreachable host, likewise
+])
+def test_rules_follow_rfc_9309_status_handling(status, private, public):
+    rules = RobotsCache("*")._store("https://jobs.example", status, ROBOTS)
+
+    assert rules.can_fetch("*", "https://jobs.example/private/1") is private
+    assert rules.can_fetch("*", "https://jobs.example/jobs/1") is public
+
+
+def test_robots_are_fetched_once_per_origin(monkeypatch):
+    robots = RobotsCache("*")
+    fetched = []
+
+    async def fetch(origin):
+        fetched.append(origin)
+        await asyncio.sleep(0.01)
+        return robots._store(origin, 200, ROBOTS)
+
+    monkeypatch.setattr(robots, "_fetch", fetch)
+
+    async def run():
+        await asyncio.gather(*(robots.get(f"https://Jobs.example/jobs/{i}") for i in range(5)))
+        await robots.get("https://jobs.example/other")
+
+    asyncio.run(run())
+
+    assert fetched == ["https://jobs.example"]
+
+
+def test_gate_enforces_disallow_and_crawl_delay():
+    robots = RobotsCache("*")
+    robots._store("https://jobs.example", 200, ROBOTS)
+    gate = _gate(robots)
+
+    with pytest.raises(RobotsDisallowedError):
+        asyncio.run(gate.acquire("https://jobs.example/private/1"))
+
+    gate.acquire_sync("https://jobs.example/jobs/1")
+    assert gate.limiter.interval_for("jobs.example") == 2
+
+
+def test_documented_apis_skip_robots(monkeypatch):
+    robots = RobotsCache("*")
+
+    async def fetch(origin):
+        raise AssertionError("robots.txt should not be fetched")
+
+    monkeypatch.setattr(robots, "_fetch", fetch)
+
+    asyncio.run(_gate(robots).acquire("https://api.adzuna.com/v1/api/jobs/gb/search/1"))
+
+
+def test_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(default_interval=1.0)
+
+    waits = [limiter.reserve("https://a.example/x") for _ in range(3)]
+    other = limiter.reserve("https://b.example/x")
+
+    assert waits[0] == 0 and waits[1] == pytest.approx(1, abs=0.05) and waits[2] == pytest.approx(2, abs=0.05)
+    assert other == 0
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.scrape_cursor import CursorState, days_since, parse_posted_date, scrape_cursor_service
+
+MARK = datetime(2026, 5, 1, 12)
+
+
+def _job(external_id, posted):
+    return {"external_id": external_id, "url": f"https://example.com/{external_id}", "posted_date": posted}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-05-01T12:00:00Z", MARK),
+    ("2026-05-01T14:00:00+02:00", MARK),
+    (1777636800, MARK),
+    (MARK, MARK),
+    ("yesterday", None),
+    ("", None),
+])
+def test_parse_posted_date(value, expected):
+    assert parse_posted_date(value) == expected
+
+
+def test_days_since_rounds_up_to_whole_days():
+    assert days_since(datetime(2026, 4, 29, 18), now=MARK) == 2
+    assert days_since(None) is None
+
+
+def test_filter_new_drops_seen_ids_and_postings_before_the_mark():
+    cursor = CursorState("adzuna", "python", "london", since=MARK, seen_ids={"seen"})
+    jobs = [
+        _job("seen", "2026-05-02T00:00:00"),
+        _job("older", "2026-04-30T00:00:00"),
+        # Same timestamp as the mark but not seen: still new
+        _job("tied", MARK.isoformat()),
+        _job("undated", None),
+        _job("newer", "2026-05-02T00:00:00"),
+    ]
+
+    assert [job["external_id"] for job in cursor.filter_new(jobs)] == ["tied", "undated", "newer"]
+
+
+def test_observe_advances_the_mark_unless_held():
+    cursor = CursorState("adzuna", "python", "london", since=MARK, newest=MARK)
+    cursor.observe([_job("a", "2026-05-02T00:00:00"), _job("b", "2026-05-01T18:00:00")])
+    assert cursor.newest == datetime(2026, 5, 2)
+    assert cursor.seen_order == ["a", "b"]
+
+    cursor.hold()
+    cursor.observe([_job("c", "2026-05-03T00:00:00")])
+    assert cursor.newest == MARK
+    assert "c" in cursor.seen_ids
+
+
+def test_cursors_round_trip_through_the_table(engine, monkeypatch):
+    monkeypatch.setattr(scrape_cursor_service, "MAX_SEEN_IDS", 2)
+    cursor = scrape_cursor_service.load("Adzuna", " Python ", "London")
+    assert cursor.since is None and not cursor.seen_ids
+
+    cursor.observe([_job(str(i), f"2026-05-0{i}T00:00:00") for i in range(1, 4)])
+    scrape_cursor_service.save([cursor])
+
+    loaded = scrape_cursor_service.load("adzuna", "python", "london")
+    assert loaded.since == datetime(2026, 5, 3)
+    # Only the most recently observed ids are kept
+    assert loaded.seen_order == ["2", "3"]
@@ -0,0 +1,50 @@
+from app.models import Job
+from app.services.search import search_index
+
+
+def _store(db, i, title, raw_text, **extra):
+    job = Job(url=f"https://jobs.example/{i}", title=title, company="Acme", raw_text=raw_text, **extra)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _ranked(db, query):
+    matches = search_index.matches(db, query)
+    return [job_id for job_id, _ in db.query(matches.c.job_id, matches.c.rank).order_by(matches.c.rank.desc())]
+
+
+def test_title_hits_outrank_description_hits(db):
+    in_description = _store(db, 1, "Backend Engineer", "Our services are written in Python and Go.")
+    in_title = _store(db, 2, "Python Engineer", "Build backend services.")
+    _store(db, 3, "Nurse", "Night shifts on the ward.")
+
+    assert _ranked(db, "python") == [in_title, in_description]
+
+
+def test_every_term_must_match_and_stems_are_folded(db):
+    both = _store(db, 1, "Data Engineer", "Building pipelines with Spark.")
+    _store(db, 2, "Data Analyst", "Dashboards and reporting.")
+
+    assert _ranked(db, "data pipeline") == [both]
+
+
+def test_query_syntax_is_not_interpreted(db):
+    _store(db, 1, "C++ Developer", "Low latency trading systems.")
+
+    # Bare FTS5 operators and quotes would be a syntax error if passed through
+    assert _ranked(db, 'C++ OR "NEAR(') == []
+    assert _ranked(db, "C++ developer") == [1]
+
+
+def test_updates_and_deletes_keep_the_index_in_sync(db):
+    job_id = _store(db, 1, "Python Engineer", "Django.")
+
+    db.get(Job, job_id).title = "Rust Engineer"
+    db.commit()
+    assert _ranked(db, "python") == []
+    assert _ranked(db, "rust") == [job_id]
+
+    db.delete(db.get(Job, job_id))
+    db.commit()
+    assert _ranked(db, "rust") == []
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.skills import skill_taxonomy
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Report to the C-suite", []),
+    ("We closed our Series C last year", []),
+    ("Series B, C funding", []),
+    ("Grade: C", []),
+    ("Modern C++ and C# services", ["C++", "C#"]),
+    ("Objective-C and Swift", ["Objective-C", "Swift"]),
+    ("Skills: Python, C, Go", ["Python", "C", "Go"]),
+    ("Languages: C, Python", ["C", "Python"]),
+    ("Written in C/C++", ["C", "C++"]),
+    ("Strong ANSI C skills", ["C"]),
+    ("Python, Go or C.", ["Python", "Go", "C"]),
+    ("Python, R and SQL", ["Python", "R", "SQL"]),
+    ("Grow our R&D team", []),
+])
+def test_single_letter_languages_need_a_list_or_an_alias(text, expected):
+    assert skill_taxonomy.extract(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("JavaScript and TypeScript", ["JavaScript", "TypeScript"]),
+    ("a javascript developer", ["JavaScript"]),
+    ("Go and golang", ["Go"]),
+    ("Let's go to the office", []),
+    ("Make sure the build is green", []),
+    ("Reporting to the CTO", []),
+    ("Experience with SAFe; a safe environment", ["SAFe"]),
+    ("Kubernetes, Terraform and Apache Airflow", ["Kubernetes", "Terraform", "Apache Airflow"]),
+])
+def test_extract_respects_word_boundaries_and_case(text, expected):
+    assert skill_taxonomy.extract(text) == expected
+
+
+def test_taxonomy_covers_non_engineering_roles():
+    assert len(skill_taxonomy) > 3000
+    text = "Own month-end close and variance analysis in NetSuite; SHRM-CP preferred; fluent Spanish"
+    assert skill_taxonomy.extract(text) == ["Month-End Close", "Variance Analysis", "NetSuite", "SHRM-CP", "Spanish"]
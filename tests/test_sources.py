@@ -0,0 +1,284 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import Job
+from app.services.adzuna import AdzunaService
+from app.services.scrape_cursor import CursorState
+from app.sources.base import JobRecord
+from app.sources.registry import SourceRegistry
+from app.services.rate_limiter import HostRateLimiter
+
+
+class FakeSource:
+    rate_limits = {}
+    page_size = 10
+    supports_incremental = True
+    timeout = 1.0
+
+    def __init__(self, name, result=None, error=None, delay=0.0):
+        self.name = name
+        self.result = result or []
+        self.error = error
+        self.delay = delay
+
+    async def fetch(self, query, region, cursor=None, limit=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def _record(i):
+    return JobRecord(url=f"https://example.com/{i}", title="Engineer", company="Acme", source="fake")
+
+
+def test_collect_keeps_only_completed_sources(engine):
+    registry = SourceRegistry(
+        [
+            FakeSource("ok", result=[_record(1), _record(2)]),
+            FakeSource("broken", error=RuntimeError("boom")),
+            FakeSource("slow", delay=5.0)
+        ],
+        rate_limiter=HostRateLimiter()
+    )
+
+    batch = asyncio.run(registry.collect("python", "remote", ["ok", "broken", "slow", "unknown"], timeouts={"slow": 0.05}))
+
+    assert [row["url"] for row in batch.rows()] == ["https://example.com/1", "https://example.com/2"]
+    assert [cursor.source for cursor in batch.cursors] == ["ok"]
+    assert batch.errors == {"broken": "boom", "slow": "timeout"}
+
+
+def _adzuna(pages, monkeypatch):
+    """An AdzunaService answering from canned result pages, newest first."""
+    service = AdzunaService()
+    service.app_id, service.app_key = "id", "key"
+
+    async def fetch_page(client, role, location, country, results_per_page, page, max_days_old=None):
+        results = pages[page - 1] if page <= len(pages) else []
+        return {"results": results, "count": sum(len(p) for p in pages)}
+
+    monkeypatch.setattr(service, "_fetch_page", fetch_page)
+    return service
+
+
+def _results(start, count, newest=datetime(2026, 5, 1)):
+    return [
+        {
+            "id": str(i),
+            "title": "Engineer",
+            "company": {"display_name": "Acme"},
+            "redirect_url": f"https://adzuna.example/{i}",
+            "created": (newest - timedelta(hours=i)).isoformat() + "Z"
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_adzuna_limit_does_not_skip_dropped_jobs(monkeypatch):
+    service = _adzuna([_results(0, 5), _results(5, 5)], monkeypatch)
+    cursor = CursorState("adzuna", "python", "london")
+    nothing_stored = lambda urls: set()
+
+    first = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, window=1, cursor=cursor, limit=3, known_urls=nothing_stored
+    ))
+    assert [job["external_id"] for job in first] == ["0", "1", "2"]
+    # The mark stays put, so the dropped, older jobs are still new next run
+    assert cursor.held and cursor.newest is None
+
+    resumed = CursorState("adzuna", "python", "london", since=cursor.newest, seen_ids=set(cursor.seen_ids))
+    rest = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, window=1, cursor=resumed, known_urls=nothing_stored
+    ))
+    assert [job["external_id"] for job in rest] == [str(i) for i in range(3, 10)]
+    assert resumed.newest == datetime(2026, 4, 30, 21)
+
+
+def test_adzuna_limit_covering_everything_advances_the_mark(monkeypatch):
+    service = _adzuna([_results(0, 3)], monkeypatch)
+    cursor = CursorState("adzuna", "python", "london")
+
+    jobs = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, cursor=cursor, limit=3, known_urls=lambda urls: set()
+    ))
+
+    assert len(jobs) == 3
+    assert not cursor.held
+    assert cursor.newest == datetime(2026, 5, 1)
+
+
+def test_adzuna_pages_finishing_with_the_limit_page_do_not_hold_the_mark(monkeypatch):
+    # Pages 2 and 3 may land in the same asyncio.wait batch as page 1, in any order
+    for _ in range(50):
+        service = _adzuna([_results(0, 3)], monkeypatch)
+        cursor = CursorState("adzuna", "python", "london")
+
+        asyncio.run(service.search_all_pages(
+            "python", "london", results_per_page=5, window=3, cursor=cursor, limit=3, known_urls=lambda urls: set()
+        ))
+
+        assert not cursor.held
+
+
+def test_scrape_jobs_tool_runs_inside_an_event_loop(engine, monkeypatch):
+    from app.sources.registry import ScrapeBatch, source_registry
+    from app.tools.job_tools import scrape_jobs
+
+    async def collect(query, region, names, **kwargs):
+        return ScrapeBatch(records=[_record(1)])
+
+    monkeypatch.setattr(source_registry, "collect", collect)
+
+    saved = asyncio.run(scrape_jobs.ainvoke({"region": "remote", "role": "python"}))
+
+    assert [job["url"] for job in saved] == ["https://example.com/1"]
+    from app.database import SessionLocal
+    db = SessionLocal()
+    assert db.query(Job).count() == 1
+    db.close()
+
+
+def test_adzuna_stops_at_the_first_page_with_nothing_new(monkeypatch):
+    service = _adzuna([_results(i * 5, 5) for i in range(5)], monkeypatch)
+    fetched = []
+    fetch_page = service._fetch_page
+
+    async def recording_fetch_page(client, role, location, country, results_per_page, page, max_days_old=None):
+        fetched.append(page)
+        return await fetch_page(client, role, location, country, results_per_page, page, max_days_old)
+
+    monkeypatch.setattr(service, "_fetch_page", recording_fetch_page)
+    stored = {f"https://adzuna.example/{i}" for i in range(7, 25)}
+
+    jobs = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, window=1, known_urls=lambda urls: stored & set(urls)
+    ))
+
+    assert [job["external_id"] for job in jobs] == [str(i) for i in range(7)]
+    assert fetched == [1, 2, 3]
+
+
+def test_adzuna_drops_and_stops_at_postings_older_than_the_cutoff(monkeypatch):
+    service = _adzuna([_results(i * 5, 5) for i in range(5)], monkeypatch)
+    fetched = []
+    fetch_page = service._fetch_page
+
+    async def recording_fetch_page(client, role, location, country, results_per_page, page, max_days_old=None):
+        fetched.append(page)
+        return await fetch_page(client, role, location, country, results_per_page, page, max_days_old)
+
+    monkeypatch.setattr(service, "_fetch_page", recording_fetch_page)
+
+    jobs = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, window=1,
+        since_timestamp=datetime(2026, 4, 30, 18), known_urls=lambda urls: set()
+    ))
+
+    assert [job["external_id"] for job in jobs] == [str(i) for i in range(7)]
+    assert fetched == [1, 2, 3]
+
+
+def _cached(body, digest):
+    from app.services.http_cache import CachedResponse
+
+    return CachedResponse("key", 200, False, digest, None, _content=body.encode("utf-8"))
+
+
+def _remoteok_dump(count, newest=datetime(2026, 5, 1)):
+    import json
+
+    return json.dumps([{"legal": "metadata"}] + [
+        {
+            "id": str(i),
+            "position": "Python Engineer",
+            "company": "Acme",
+            "url": f"https://remoteok.example/{i}",
+            "date": (newest - timedelta(hours=i)).isoformat()
+        }
+        for i in range(count)
+    ])
+
+
+def _indeed_feed(count, newest=datetime(2026, 5, 1)):
+    items = "".join(
+        f"<item><title>Python Engineer - Acme</title><link>https://indeed.example/{i}</link>"
+        f"<guid>{i}</guid><pubDate>{(newest - timedelta(hours=i)).strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Indeed</title>{items}</channel></rss>'
+
+
+def test_remoteok_limit_holds_the_mark_for_jobs_left_over():
+    from app.tools.real_job_apis import RemoteOKAPI
+
+    api = RemoteOKAPI()
+    response = _cached(_remoteok_dump(10), "dump-1")
+    cursor = CursorState("remoteok", "python", "remote")
+
+    first = api._filter_jobs(response, "python", 3, cursor)
+    assert [job["external_id"] for job in first] == ["0", "1", "2"]
+    assert cursor.held and cursor.newest is None
+
+    resumed = CursorState("remoteok", "python", "remote", since=cursor.newest, seen_ids=set(cursor.seen_ids))
+    rest = api._filter_jobs(response, "python", 50, resumed)
+    assert [job["external_id"] for job in rest] == [str(i) for i in range(3, 10)]
+    assert not resumed.held and resumed.newest == datetime(2026, 4, 30, 21)
+
+
+def test_indeed_limit_applies_after_filtering_and_holds_the_mark():
+    from app.tools.real_job_apis import IndeedRSSParser
+
+    parser = IndeedRSSParser()
+    response = _cached(_indeed_feed(6), "feed-1")
+    cursor = CursorState("indeed", "python", "london", seen_ids={"0", "1"})
+
+    first = parser._parse_feed(response, 2, cursor)
+    # Already-seen entries don't use up the limit
+    assert [job["external_id"] for job in first] == ["2", "3"]
+    assert cursor.held
+
+    resumed = CursorState("indeed", "python", "london", since=cursor.newest, seen_ids=set(cursor.seen_ids))
+    rest = parser._parse_feed(response, 25, resumed)
+    assert [job["external_id"] for job in rest] == ["4", "5"]
+    assert not resumed.held and resumed.newest == datetime(2026, 4, 30, 20)
+
+
+def test_adzuna_page_errors_hold_the_mark(monkeypatch):
+    service = _adzuna([_results(0, 5), _results(5, 5), _results(10, 5)], monkeypatch)
+    fetch_page = service._fetch_page
+
+    async def flaky(client, role, location, country, results_per_page, page, max_days_old=None):
+        if page == 2:
+            raise RuntimeError("502 Bad Gateway")
+        return await fetch_page(client, role, location, country, results_per_page, page, max_days_old)
+
+    monkeypatch.setattr(service, "_fetch_page", flaky)
+    cursor = CursorState("adzuna", "python", "london")
+
+    jobs = asyncio.run(service.search_all_pages(
+        "python", "london", results_per_page=5, window=1, cursor=cursor, known_urls=lambda urls: set()
+    ))
+
+    assert len(jobs) == 5
+    assert cursor.held and cursor.newest is None
+
+
+def test_adzuna_failures_reach_the_registry_without_saving_the_cursor(engine, monkeypatch):
+    from app.services.adzuna import adzuna_service
+    from app.sources.adapters import AdzunaSource
+
+    def lookup_fails(urls):
+        raise RuntimeError("database is locked")
+
+    service = _adzuna([_results(0, 5)], monkeypatch)
+    monkeypatch.setattr(adzuna_service, "_fetch_page", service._fetch_page)
+    monkeypatch.setattr(adzuna_service, "app_id", "id")
+    monkeypatch.setattr(adzuna_service, "app_key", "key")
+    monkeypatch.setattr("app.services.adzuna._stored_urls", lookup_fails)
+    registry = SourceRegistry([AdzunaSource()], rate_limiter=HostRateLimiter())
+
+    batch = asyncio.run(registry.collect("python", "london", ["adzuna"]))
+
+    assert batch.errors == {"adzuna": "database is locked"}
+    assert batch.cursors == []
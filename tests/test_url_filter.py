@@ -0,0 +1,52 @@
+import pytest
+
+from app.services.ingestion import job_ingestion_service
+from app.services.url_filter import BloomFilter, URLFilterService
+
+URLS = [f"https://jobs.example/posting/{i}" for i in range(5000)]
+OTHER_URLS = [f"https://elsewhere.example/posting/{i}" for i in range(5000)]
+
+
+def test_no_false_negatives_across_save_and_load(tmp_path):
+    bloom = BloomFilter(len(URLS))
+    for url in URLS:
+        bloom.add(url)
+    path = str(tmp_path / "filters" / "urls.bloom")
+
+    bloom.save(path)
+    loaded = BloomFilter.load(path)
+
+    assert all(url in loaded for url in URLS)
+    assert loaded.count == len(URLS)
+    assert loaded.capacity == pytest.approx(len(URLS), rel=0.01)
+    # Sized for 0.1%; leave plenty of slack against flakiness
+    assert sum(url in loaded for url in OTHER_URLS) < len(OTHER_URLS) * 0.01
+
+
+def test_a_corrupt_file_is_not_loaded(tmp_path):
+    path = tmp_path / "urls.bloom"
+    path.write_bytes(b"not a filter")
+
+    service = URLFilterService(str(path))
+
+    assert not service.load()
+    assert not service.ready
+    # Without a filter everything has to be checked against the database
+    assert service.possible_hits(["https://jobs.example/1"]) == {"https://jobs.example/1"}
+
+
+def test_rebuild_covers_stored_urls_and_later_inserts(db, tmp_path):
+    job_ingestion_service.ingest(db, [
+        {"url": url, "title": "Engineer", "company": "Acme", "description": f"Posting {url}"}
+        for url in URLS[:50]
+    ])
+    service = URLFilterService(str(tmp_path / "urls.bloom"), min_capacity=1000)
+
+    service.rebuild()
+    service.add_many(URLS[50:60])
+    restarted = URLFilterService(service.path)
+
+    assert restarted.load()
+    assert service.possible_hits(URLS[:60]) == set(URLS[:60])
+    assert restarted.possible_hits(URLS[:50]) == set(URLS[:50])
+    assert len(service.possible_hits(OTHER_URLS[:1000])) < 10